@@ -1,8 +1,12 @@
 import sys
 import os
+import logging
+import argparse
+import threading
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import List, Optional
 import uvicorn
 
 # --------------------------
@@ -15,11 +19,29 @@ if project_root not in sys.path:
 # --------------------------
 # Import utils
 # --------------------------
-from utils.summarizer import summarize_article
-from utils.credibility import score_credibility
-from utils.keywords import extract_keywords
+from utils.summarizer import (
+    summarize_articles,
+    summary_cache_stats,
+    summarize_with_hf_cached,
+    invalidate_summaries,
+    SummarizationError,
+    uses_local_model,
+    HF_BATCH_SIZE,
+)
+from utils.keywords import KEYWORD_MODE, KEYWORD_MODES, extract_keywords, extract_keywords_batch
 from utils.save_data import load_articles
-from utils.auth import verify_api_key
+from utils.model_registry import registry
+from utils.micro_batcher import MicroBatcher, MICROBATCH_ENABLED
+from utils.analysis_pool import get_analysis_pool
+from utils.openai_client import get_openai_client
+from utils.summary_router import DeadlineExceeded, SummaryUnavailable, breaker_status, route_summary
+from api.auth import verify_api_key
+
+logger = logging.getLogger("serve")
+
+# Models to load at startup: "all", or a comma-separated list of registry
+# names (summarizer, keybert, sentence_model). Empty = load lazily on first use.
+WARMUP_MODELS = os.getenv("TECHSCOPE_WARMUP", "")
 
 # --------------------------
 # FastAPI app
@@ -45,6 +67,76 @@ app.add_middleware(
 class ArticleInput(BaseModel):
     text: str
 
+class SummarizeInput(BaseModel):
+    text: str
+    deadline_ms: Optional[float] = None  # latency budget; default SUMMARY_DEADLINE_MS
+
+class BatchArticleInput(BaseModel):
+    texts: List[str]
+    batch_size: Optional[int] = None
+
+class CacheInvalidation(BaseModel):
+    text: Optional[str] = None
+    backend: Optional[str] = None  # "openai" or "hf"
+
+class KeywordsInput(BaseModel):
+    text: str
+    mode: Optional[str] = None  # "fast", "semantic" or "auto"; default KEYWORD_MODE
+
+class WarmupInput(BaseModel):
+    models: Optional[List[str]] = None  # default: every registered model
+
+MAX_BATCH_TEXTS = 64
+
+def parse_model_list(value: str) -> Optional[List[str]]:
+    """ "all" -> None (every model), "a,b" -> ["a", "b"] """
+    value = value.strip()
+    if value.lower() == "all":
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+# --------------------------
+# Micro-batching: concurrent /summarize and /keywords calls share one forward pass
+# --------------------------
+summarize_batcher = MicroBatcher("summarize", summarize_articles)
+keywords_batcher = MicroBatcher("keywords", extract_keywords_batch)
+
+@app.on_event("shutdown")
+def stop_batchers():
+    summarize_batcher.close()
+    keywords_batcher.close()
+
+# --------------------------
+# Analysis pool: pure-Python scorers run in worker processes, off the GIL
+# --------------------------
+@app.on_event("startup")
+def start_analysis_pool():
+    """Spawn the workers without waiting; single texts are scored inline until they are warm"""
+    get_analysis_pool().start()
+
+@app.on_event("shutdown")
+def stop_analysis_pool():
+    get_analysis_pool().shutdown()
+
+@app.on_event("shutdown")
+def stop_openai_client():
+    get_openai_client().close()
+
+# --------------------------
+# Startup warmup
+# --------------------------
+@app.on_event("startup")
+def warmup_on_startup():
+    """Load the TECHSCOPE_WARMUP models in the background so startup isn't blocked"""
+    if not WARMUP_MODELS.strip():
+        return
+    names = parse_model_list(WARMUP_MODELS)
+    threading.Thread(
+        target=lambda: logger.info(f"Startup warmup: {registry.warmup(names)}"),
+        name="model-warmup",
+        daemon=True,
+    ).start()
+
 # --------------------------
 # Routes
 # --------------------------
@@ -63,28 +155,90 @@ def get_articles():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/summarize", dependencies=[Depends(verify_api_key)])
-def summarize_text(input: ArticleInput):
-    """Summarize text (API key protected)"""
+async def summarize_text(input: SummarizeInput):
+    """Summarize text within a deadline, falling back between backends (API key protected)"""
+    # OpenAI calls are independent requests, so only the local model is batched
+    local = summarize_batcher.submit if MICROBATCH_ENABLED and uses_local_model() else summarize_with_hf_cached
+    try:
+        return await route_summary(input.text, input.deadline_ms, local=local)
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except SummaryUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/summarize/health", dependencies=[Depends(verify_api_key)])
+def get_summarizer_health():
+    """Circuit breaker state of each summarization backend (API key protected)"""
+    return breaker_status()
+
+@app.post("/summarize/batch", dependencies=[Depends(verify_api_key)])
+def summarize_batch(input: BatchArticleInput):
+    """Summarize many texts in one call, batched through the model (API key protected)"""
+    if len(input.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_TEXTS} texts per request")
     try:
-        summary = summarize_article(input.text)
-        return {"summary": summary}
+        results = summarize_articles(input.texts, batch_size=input.batch_size or HF_BATCH_SIZE)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    # Texts the model failed on get null and an entry in "errors"
+    errors = [{"index": i, **result.as_dict()} for i, result in enumerate(results) if isinstance(result, SummarizationError)]
+    summaries = [None if isinstance(result, SummarizationError) else result for result in results]
+    return {"summaries": summaries, "errors": errors}
+
+@app.get("/summarize/cache", dependencies=[Depends(verify_api_key)])
+def get_summary_cache_stats():
+    """Summary cache hit/miss counters (API key protected)"""
+    return summary_cache_stats()
+
+@app.post("/summarize/cache/invalidate", dependencies=[Depends(verify_api_key)])
+def invalidate_summary_cache(input: CacheInvalidation):
+    """Drop cached summaries: all, or for one text and/or backend (API key protected)"""
+    try:
+        return {"removed": invalidate_summaries(input.text, input.backend)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/batching", dependencies=[Depends(verify_api_key)])
+def get_batching_stats():
+    """Micro-batch counters for /summarize and /keywords (API key protected)"""
+    return {"enabled": MICROBATCH_ENABLED, "summarize": summarize_batcher.stats(), "keywords": keywords_batcher.stats()}
+
+@app.get("/models", dependencies=[Depends(verify_api_key)])
+def get_models():
+    """Which models are loaded, their load time and any load error (API key protected)"""
+    return registry.status()
+
+@app.post("/warmup", dependencies=[Depends(verify_api_key)])
+def warmup_models(input: Optional[WarmupInput] = None):
+    """Load models now instead of on first request (API key protected)"""
+    names = input.models if input else None
+    unknown = sorted(set(names or []) - set(registry.names()))
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown models: {', '.join(unknown)}")
+    return registry.warmup(names)
 
 @app.post("/credibility", dependencies=[Depends(verify_api_key)])
 def get_credibility(input: ArticleInput):
     """Get credibility score (API key protected)"""
     try:
-        score = score_credibility(input.text)
+        score = get_analysis_pool().run("credibility", input.text)
         return {"credibility_score": score}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/keywords", dependencies=[Depends(verify_api_key)])
-def get_keywords(input: ArticleInput):
+def get_keywords(input: KeywordsInput):
     """Extract keywords (API key protected)"""
+    if input.mode is not None and input.mode not in KEYWORD_MODES:
+        raise HTTPException(status_code=422, detail=f"mode must be one of {', '.join(KEYWORD_MODES)}")
     try:
-        keywords = extract_keywords(input.text)
+        # Only the default mode is batched; the TF-IDF tier gains nothing from it
+        if MICROBATCH_ENABLED and input.mode in (None, KEYWORD_MODE):
+            keywords = keywords_batcher.submit(input.text)
+        else:
+            keywords = extract_keywords(input.text, mode=input.mode)
         return {"keywords": keywords}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -93,4 +247,10 @@ def get_keywords(input: ArticleInput):
 # Run server (dev mode)
 # --------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TechScope AI API server")
+    parser.add_argument("--warmup", default=WARMUP_MODELS,
+                        help='models to load at startup: "all" or a comma-separated list')
+    args = parser.parse_args()
+    # Passed through the environment so the reloader's worker process sees it too
+    os.environ["TECHSCOPE_WARMUP"] = args.warmup
     uvicorn.run("api.serve:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,156 @@
+"""
+Offline crawl throughput benchmark.
+
+Starts the replay server (benchmarks/replay_server.py), points the sources/*
+scrapers, the async crawler and utils/scheduler.fetch_feeds at it, and
+reports pages/sec plus p50/p99 per-page latency for each path. Nothing
+leaves the machine.
+
+    sync   - get_article_links() + parse_article() per source, one page at a time
+    async  - sources/crawler.scrape_all() across all sources
+    feeds  - utils/scheduler.fetch_feeds() over the five recorded RSS feeds
+
+Usage:
+    python -m benchmarks.bench_crawl [--mode all] [--limit 20] [--latency-ms 50]
+                                     [--jitter-ms 20] [--error-rate 0.02] [--rate 50]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import List
+from urllib.parse import urljoin
+
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from benchmarks.replay_server import ReplayServer
+from sources import crawler
+from sources.robots import robots_cache
+from utils.http_cache import http_cache
+
+
+# --------------------------
+# Reporting
+# --------------------------
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label: str, pages: int, seconds: float, latencies: List[float]) -> None:
+    rate = pages / seconds if seconds else 0.0
+    print(
+        f"{label:<8}{pages:>7}{seconds:>10.2f}{rate:>12.1f}"
+        f"{percentile(latencies, 50) * 1000:>12.1f}{percentile(latencies, 99) * 1000:>12.1f}"
+    )
+
+
+# --------------------------
+# Setup
+# --------------------------
+def point_sources_at(replay: ReplayServer) -> None:
+    for name, module in crawler.SOURCES.items():
+        module.BASE_URL = replay.base_url(name)
+        module.ROBOTS_URL = urljoin(module.BASE_URL, "robots.txt")
+
+
+def reset_caches(cache_dir: str) -> None:
+    http_cache.cache_dir = cache_dir
+    robots_cache.invalidate()
+
+
+# --------------------------
+# Benchmarked paths
+# --------------------------
+def bench_sync(limit: int):
+    latencies = []
+    started = time.perf_counter()
+    for module in crawler.SOURCES.values():
+        t0 = time.perf_counter()
+        links = module.get_article_links()[:limit]
+        latencies.append(time.perf_counter() - t0)
+        for link in links:
+            t0 = time.perf_counter()
+            module.parse_article(link)
+            latencies.append(time.perf_counter() - t0)
+    return len(latencies), time.perf_counter() - started, latencies
+
+
+def bench_async(limit: int, rate: float):
+    latencies = []
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["bench_started"] = time.perf_counter()
+
+    async def on_response(response: httpx.Response) -> None:
+        await response.aread()
+        latencies.append(time.perf_counter() - response.request.extensions["bench_started"])
+
+    async def run() -> None:
+        limits = httpx.Limits(max_connections=crawler.MAX_CONNECTIONS, max_keepalive_connections=crawler.MAX_CONNECTIONS)
+        async with httpx.AsyncClient(
+            headers=crawler.HEADERS,
+            timeout=crawler.REQUEST_TIMEOUT,
+            limits=limits,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        ) as client:
+            async for _ in crawler.scrape_all(limit=limit, rate=rate, burst=4, skip_seen=False, client=client):
+                pass
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    return len(latencies), time.perf_counter() - started, latencies
+
+
+def bench_feeds(replay: ReplayServer, rounds: int):
+    from utils.scheduler import fetch_feeds
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        _, stats = fetch_feeds(replay.feed_urls(), skip_seen=False)
+        latencies.extend(stat["seconds"] for stat in stats.values())
+    return len(latencies), time.perf_counter() - started, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["sync", "async", "feeds", "all"], default="all")
+    parser.add_argument("--limit", type=int, default=20, help="articles per source")
+    parser.add_argument("--rate", type=float, default=50.0, help="async crawler requests/sec per host")
+    parser.add_argument("--feed-rounds", type=int, default=5, help="times to fetch the feed set")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--conditional", action="store_true", help="server sends ETags (exercises the 304 path)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    modes = ["sync", "async", "feeds"] if args.mode == "all" else [args.mode]
+    with ReplayServer(args.latency_ms, args.jitter_ms, args.error_rate, args.conditional, seed=args.seed) as replay, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        point_sources_at(replay)
+        print(f"{'mode':<8}{'pages':>7}{'seconds':>10}{'pages/sec':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+        print("-" * 61)
+        for mode in modes:
+            reset_caches(cache_dir)
+            if mode == "sync":
+                report(mode, *bench_sync(args.limit))
+            elif mode == "async":
+                report(mode, *bench_async(args.limit, args.rate))
+            else:
+                report(mode, *bench_feeds(replay, args.feed_rounds))
+        print(f"\nserver: {replay.requests} requests, status counts {replay.status_counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Per-page parse time of the source extractors over saved HTML fixtures.
+
+"before" is the original full-page BeautifulSoup(html.parser) extraction with
+repeated soup.find() calls; every installed backend of sources/parsing.py is
+timed against it on the same pages, and its output is checked for equality.
+
+Usage:
+    python -m benchmarks.bench_parsing [--repeat 20]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+from bs4 import BeautifulSoup
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from sources import arstechnica, techcrunch, theverge, wired
+from sources.parsing import BACKENDS, ArticleParser, LinkExtractor, resolve_backend
+
+FIXTURES_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "fixtures", "html")
+SOURCES = {"techcrunch": techcrunch, "theverge": theverge, "arstechnica": arstechnica, "wired": wired}
+
+
+# --------------------------
+# Original extraction ("before")
+# --------------------------
+def legacy_extract(name: str, url: str, html: str) -> dict:
+    soup = BeautifulSoup(html, "html.parser")
+    if name == "techcrunch":
+        title = soup.find("h1").get_text(strip=True) if soup.find("h1") else "No title"
+        author = soup.find("a", rel="author").get_text(strip=True) if soup.find("a", rel="author") else "Unknown"
+        published = soup.find("time")["datetime"] if soup.find("time") else None
+        body = soup.find("div", class_="article-content")
+        paragraphs = body.find_all("p") if body else []
+    elif name == "theverge":
+        title = soup.find("h1").get_text(strip=True) if soup.find("h1") else "No title"
+        author_tag = soup.find("span", class_="byline__name")
+        author = author_tag.get_text(strip=True) if author_tag else "Unknown"
+        time_tag = soup.find("time")
+        published = time_tag["datetime"] if time_tag and time_tag.has_attr("datetime") else None
+        body = soup.find("div", class_="duet--article--article-body-components-container")
+        paragraphs = body.find_all("p") if body else []
+    else:
+        title_tag = soup.find("h1")
+        title = title_tag.get_text(strip=True) if title_tag else "No Title"
+        if name == "arstechnica":
+            author_tag = soup.find("a", rel="author")
+            body = soup.find("div", class_="article-content")
+        else:
+            author_tag = soup.find("a", class_="byline-component__link")
+            body = soup.find("article")
+        author = author_tag.get_text(strip=True) if author_tag else "Unknown"
+        time_tag = soup.find("time")
+        published = time_tag["datetime"] if time_tag and time_tag.has_attr("datetime") else None
+        paragraphs = body.select("p") if body else []
+
+    content = "\n".join(p.get_text(strip=True) for p in paragraphs)
+    return {"url": url, "title": title, "author": author, "published": published, "content": content}
+
+
+def legacy_links(html: str) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    return [a.get("href") for a in soup.find_all("a", href=True)]
+
+
+# --------------------------
+# Timing helpers
+# --------------------------
+def time_per_page(fn, repeat: int) -> float:
+    """Median wall time of one call, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def available_backends() -> list:
+    backends = []
+    for backend in BACKENDS:
+        try:
+            resolve_backend(backend)
+            backends.append(backend)
+        except ImportError:
+            pass
+    return backends
+
+
+def clone_parser(parser: ArticleParser, backend: str) -> ArticleParser:
+    sel = parser.selectors.selectors
+    return ArticleParser(
+        title=sel.get("title"),
+        author=sel.get("author"),
+        published=sel.get("published"),
+        body=sel.get("body"),
+        paragraphs=sel.get("paragraphs", "p"),
+        missing_title=parser.missing_title,
+        missing_author=parser.missing_author,
+        backend=backend,
+    )
+
+
+def run(repeat: int) -> None:
+    backends = available_backends()
+    header = f"{'page':<24}{'before (ms)':>12}" + "".join(f"{b + ' (ms)':>18}" for b in backends)
+    print(header)
+    print("-" * len(header))
+
+    for name, module in SOURCES.items():
+        url = f"{module.BASE_URL}fixture"
+        with open(os.path.join(FIXTURES_DIR, f"{name}_article.html"), encoding="utf-8") as f:
+            article_html = f.read()
+        with open(os.path.join(FIXTURES_DIR, f"{name}_home.html"), encoding="utf-8") as f:
+            home_html = f.read()
+
+        expected = legacy_extract(name, url, article_html)
+        row = f"{name + ' article':<24}{time_per_page(lambda: legacy_extract(name, url, article_html), repeat):>12.2f}"
+        for backend in backends:
+            parser = clone_parser(module.ARTICLE_PARSER, backend)
+            mark = "" if parser.parse(url, article_html) == expected else " !"
+            row += f"{time_per_page(lambda: parser.parse(url, article_html), repeat):>16.2f}{mark:2}"
+        print(row)
+
+        link_selector = module.LINK_EXTRACTOR.selectors.selectors["links"]
+        row = f"{name + ' homepage':<24}{time_per_page(lambda: legacy_links(home_html), repeat):>12.2f}"
+        for backend in backends:
+            extractor = LinkExtractor(link_selector, backend=backend)
+            row += f"{time_per_page(lambda: extractor.hrefs(home_html), repeat):>16.2f}  "
+        print(row)
+
+    print("\n'!' marks a backend whose article output differs from the original extraction.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per page (median is reported)")
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,83 @@
+"""
+Lexicon sentiment engine vs. TextBlob: agreement and throughput.
+
+Scores the summarizer benchmark's fixture set (the four recorded article
+pages plus the recorded RSS descriptions) and a handful of sentences that
+exercise the scoring rules (modifiers, negation, "!", emoticons,
+contractions) with both engines of utils/lexicon_sentiment.py, then reports
+polarity error, sentiment label agreement and texts per second.
+
+Usage:
+    python -m benchmarks.bench_sentiment [--feed-items 1000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+from typing import Callable, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np
+
+from benchmarks.bench_summarizer import load_fixture_texts
+from utils.lexicon_sentiment import polarity_batch
+
+RULE_SENTENCES = [
+    "This is not good.",
+    "Not bad at all!",
+    "Very very good!!",
+    "It is really not good",
+    "never a good sign",
+    "I don't think it's a great idea, and it won't be cheap.",
+    "A truly terrible, horribly bad product...",
+    "What a great (!) idea",
+    "I love it :) but the battery :(",
+    "The well-known U.S. firm posted amazing results",
+    "Awesome!!! Best launch ever",
+]
+
+
+def label(polarity: float) -> str:
+    # Same thresholds as utils.sentiment
+    if polarity < -0.2:
+        return "Negative"
+    if polarity > 0.2:
+        return "Positive"
+    return "Neutral"
+
+
+def throughput(score: Callable[[List[str]], np.ndarray], texts: List[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        score(texts)
+    return len(texts) * repeat / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feed-items", type=int, default=1000, help="descriptions per recorded feed")
+    parser.add_argument("--repeat", type=int, default=5, help="timing passes over the fixture set")
+    args = parser.parse_args()
+
+    texts = load_fixture_texts(args.feed_items) + RULE_SENTENCES
+    reference = polarity_batch(texts, engine="textblob")
+    lexicon = polarity_batch(texts, engine="lexicon")
+    error = np.abs(reference - lexicon)
+    labels_agree = sum(label(a) == label(b) for a, b in zip(reference, lexicon))
+
+    print(f"{len(texts)} texts ({len(RULE_SENTENCES)} rule sentences)")
+    print(f"polarity MAE {error.mean():.6f}  max {error.max():.6f}  differing {int((error > 1e-9).sum())}")
+    print(f"label agreement {labels_agree}/{len(texts)} ({labels_agree / len(texts):.1%})")
+
+    textblob_rate = throughput(lambda batch: polarity_batch(batch, engine="textblob"), texts, args.repeat)
+    lexicon_rate = throughput(lambda batch: polarity_batch(batch, engine="lexicon"), texts, args.repeat)
+    print(f"{'engine':<10}{'texts/s':>10}")
+    print(f"{'textblob':<10}{textblob_rate:>10.0f}")
+    print(f"{'lexicon':<10}{lexicon_rate:>10.0f}  ({lexicon_rate / textblob_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
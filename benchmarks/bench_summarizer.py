@@ -0,0 +1,163 @@
+"""
+CPU summarizer engine benchmark: latency, memory and ROUGE drift.
+
+Each engine of utils/summarizer_engines.py runs in its own subprocess (so
+peak RSS is per engine) over a fixed fixture set: the four recorded article
+pages in fixtures/html plus the first --feed-items descriptions of each
+recorded RSS feed. Summaries from the fp32 "torch" engine are the reference
+for ROUGE-1/2/L F1 of the others.
+
+Usage:
+    python -m benchmarks.bench_summarizer [--engines torch,torch-int8,onnx] [--threads 4]
+                                          [--feed-items 4] [--repeat 1]
+"""
+import os
+import sys
+import json
+import time
+import glob
+import argparse
+import resource
+import subprocess
+from collections import Counter
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+FIXTURES_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "fixtures")
+
+
+# --------------------------
+# Fixtures
+# --------------------------
+def load_fixture_texts(feed_items: int) -> List[str]:
+    import feedparser
+    from sources import arstechnica, techcrunch, theverge, wired
+    from utils.clean_text import clean_article_text
+
+    texts = []
+    for name, module in (("techcrunch", techcrunch), ("theverge", theverge), ("arstechnica", arstechnica), ("wired", wired)):
+        with open(os.path.join(FIXTURES_DIR, "html", f"{name}_article.html"), encoding="utf-8") as f:
+            texts.append(module.extract_article(f"https://example.com/{name}", f.read())["content"])
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "feeds", "*.xml"))):
+        with open(path, encoding="utf-8") as f:
+            feed = feedparser.parse(f.read())
+        texts.extend(clean_article_text(entry.get("summary", "")) for entry in feed.entries[:feed_items])
+    return texts
+
+
+# --------------------------
+# ROUGE (F1), no extra dependency
+# --------------------------
+def _ngrams(tokens: List[str], n: int) -> Counter:
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _f1(overlap: int, candidate: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate: str, reference: str, n: int) -> float:
+    c, r = _ngrams(candidate.lower().split(), n), _ngrams(reference.lower().split(), n)
+    return _f1(sum((c & r).values()), sum(c.values()), sum(r.values()))
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    c, r = candidate.lower().split(), reference.lower().split()
+    previous = [0] * (len(r) + 1)
+    for token in c:
+        current = [0]
+        for j, ref_token in enumerate(r):
+            current.append(previous[j] + 1 if token == ref_token else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(c), len(r))
+
+
+# --------------------------
+# One engine (runs in a child process)
+# --------------------------
+def run_engine(engine: str, threads: int, feed_items: int, repeat: int) -> Dict:
+    from utils.summarizer import HF_GENERATION, HF_MODEL, truncate_for_bart
+    from utils.summarizer_engines import load_summarization_pipeline
+
+    texts = [truncate_for_bart(text) for text in load_fixture_texts(feed_items)]
+    started = time.perf_counter()
+    summarizer = load_summarization_pipeline(HF_MODEL, engine, threads or None)
+    load_seconds = time.perf_counter() - started
+
+    summarizer(texts[0], **HF_GENERATION, truncation=True)  # warm-up pass, not timed
+    latencies, summaries = [], []
+    for _ in range(repeat):
+        summaries = []
+        for text in texts:
+            t0 = time.perf_counter()
+            summaries.append(summarizer(text, **HF_GENERATION, truncation=True)[0]["summary_text"])
+            latencies.append(time.perf_counter() - t0)
+
+    latencies.sort()
+    return {
+        "engine": engine,
+        "load_seconds": load_seconds,
+        "mean": sum(latencies) / len(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "summaries": summaries,
+    }
+
+
+def spawn_engine(engine: str, args) -> Dict:
+    command = [
+        sys.executable, "-m", "benchmarks.bench_summarizer", "--child", engine,
+        "--threads", str(args.threads), "--feed-items", str(args.feed_items), "--repeat", str(args.repeat),
+    ]
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"engine": engine, "error": (result.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", default="torch,torch-int8,onnx", help="comma-separated; the first is the ROUGE reference")
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads (0 = library default)")
+    parser.add_argument("--feed-items", type=int, default=4, help="descriptions taken from each recorded feed")
+    parser.add_argument("--repeat", type=int, default=1, help="timed passes over the fixture set")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_engine(args.child, args.threads, args.feed_items, args.repeat)))
+        return
+
+    results = [spawn_engine(engine.strip(), args) for engine in args.engines.split(",") if engine.strip()]
+    reference = next((r for r in results if "error" not in r), None)
+
+    print(f"{'engine':<12}{'load (s)':>10}{'mean (ms)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}{'speedup':>9}"
+          f"{'RSS (MB)':>10}{'R-1':>7}{'R-2':>7}{'R-L':>7}")
+    print("-" * 93)
+    for result in results:
+        if "error" in result:
+            print(f"{result['engine']:<12}  skipped: {result['error']}")
+            continue
+        pairs = list(zip(result["summaries"], reference["summaries"]))
+        scores = [
+            sum(metric(c, r) for c, r in pairs) / len(pairs)
+            for metric in (lambda c, r: rouge_n(c, r, 1), lambda c, r: rouge_n(c, r, 2), rouge_l)
+        ]
+        print(
+            f"{result['engine']:<12}{result['load_seconds']:>10.1f}{result['mean'] * 1000:>11.0f}"
+            f"{result['p50'] * 1000:>10.0f}{result['p95'] * 1000:>10.0f}{reference['mean'] / result['mean']:>8.2f}x"
+            f"{result['peak_rss_mb']:>10.0f}{scores[0]:>7.3f}{scores[1]:>7.3f}{scores[2]:>7.3f}"
+        )
+    if reference is not None:
+        print(f"\nROUGE F1 is measured against '{reference['engine']}' summaries over {len(reference['summaries'])} fixture texts.")
+
+
+if __name__ == "__main__":
+    main()
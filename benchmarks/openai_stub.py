@@ -0,0 +1,211 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+POST /v1/chat/completions answers with the first sentences of the last user
+message, in the response shape of the real API, so utils/openai_client.py
+and the summarizer can be exercised without a key or network access:
+
+    OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 OPENAI_API_KEY=test ...
+
+Latency (fixed + uniform jitter) and failures can be injected: a share of
+requests answers 429 (with Retry-After) or 500, and requests without an
+Authorization header get 401. The server also records the highest number
+of requests it was handling at once, to check client-side concurrency caps.
+
+Usage:
+    python -m benchmarks.openai_stub [--port 8765] [--latency-ms 200] [--jitter-ms 50]
+                                     [--rate-limit-rate 0.1] [--error-rate 0.05]
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+SUMMARY_SENTENCES = 2
+
+
+def _summarize(text: str) -> str:
+    # The prompt is "Summarize the following news article:\n\n<text>"
+    article = text.split("\n\n", 1)[-1]
+    sentences = re.split(r"(?<=[.!?])\s+", article.strip())
+    return " ".join(sentences[:SUMMARY_SENTENCES])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    server: "_StubServer"
+
+    def do_POST(self):
+        stub = self.server.stub
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        stub.enter()
+        try:
+            if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+                self._send(404, {"error": {"message": "not found"}})
+                return
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self._send(401, {"error": {"message": "missing API key", "type": "invalid_request_error"}})
+                return
+            stub.sleep()
+            failure = stub.failure()
+            if failure == 429:
+                self._send(429, {"error": {"message": "rate limited", "type": "rate_limit_error"}},
+                           {"Retry-After": str(stub.retry_after)})
+                return
+            if failure == 500:
+                self._send(500, {"error": {"message": "injected failure", "type": "server_error"}})
+                return
+
+            try:
+                request = json.loads(body)
+                prompt = [m for m in request["messages"] if m.get("role") == "user"][-1]["content"]
+            except (ValueError, KeyError, IndexError, TypeError):
+                self._send(400, {"error": {"message": "invalid request", "type": "invalid_request_error"}})
+                return
+            summary = _summarize(prompt)
+            self._send(200, {
+                "id": f"chatcmpl-stub-{stub.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": summary}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(summary.split()),
+                          "total_tokens": len(prompt.split()) + len(summary.split())},
+            })
+        finally:
+            stub.leave()
+
+    def _send(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        try:
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout, hedged request that lost)
+        self.server.stub.count(status)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, stub: "OpenAIStub", port: int):
+        super().__init__((stub.host, port), _Handler)
+        self.stub = stub
+
+
+class OpenAIStub:
+    """Runs the stand-in API on a local port (0 = any free port)."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after  # seconds, sent with 429s
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.status_counts: Dict[int, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_StubServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # --- injected behaviour ---
+    def sleep(self) -> None:
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def failure(self) -> Optional[int]:
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def count(self, status: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    # --- lifecycle ---
+    def start(self) -> "OpenAIStub":
+        self._server = _StubServer(self, self.port)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self._server = self._thread = None
+
+    def __enter__(self) -> "OpenAIStub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """Value for OPENAI_BASE_URL"""
+        return f"http://{self.host}:{self._server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=0, help="Retry-After seconds sent with 429s")
+    args = parser.parse_args()
+
+    with OpenAIStub(args.latency_ms, args.jitter_ms, args.rate_limit_rate, args.error_rate,
+                    args.retry_after, port=args.port) as stub:
+        print(f"OPENAI_BASE_URL={stub.base_url}")
+        print("\nServing. Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,202 @@
+"""
+Local stand-in for the scraped sites and RSS feeds, served from the recorded
+corpus in benchmarks/fixtures.
+
+Every source gets its own port so relative links and per-host rate limiting
+behave as on the real sites:
+    /             -> fixtures/html/<source>_home.html
+    /robots.txt   -> fixtures/robots/<source>.txt
+    anything else -> fixtures/html/<source>_article.html
+A separate feeds port serves fixtures/feeds/<name>.xml at /<name>.xml.
+Absolute links to the real hosts are rewritten to the local ports.
+
+Latency (fixed + uniform jitter) and HTTP 500s can be injected; robots.txt
+is never failed, since a failed robots.txt disables a whole source.
+
+Usage:
+    python -m benchmarks.replay_server [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.05]
+"""
+import os
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SITES = {
+    "techcrunch": "https://techcrunch.com/",
+    "theverge": "https://www.theverge.com/",
+    "arstechnica": "https://arstechnica.com/",
+    "wired": "https://www.wired.com/",
+}
+FEEDS = ["techcrunch", "theverge", "arstechnica", "wired", "zdnet"]
+
+
+def _read(*parts: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, *parts), "rb") as f:
+        return f.read()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real sites
+    server: "_SiteServer"
+
+    def do_GET(self):
+        replay = self.server.replay
+        path = self.path.split("?")[0]
+        body, content_type = self.server.route(path)
+        is_robots = path == "/robots.txt"
+
+        replay.sleep()
+        if not is_robots and replay.should_fail():
+            self._send(500, b"injected failure", "text/plain")
+            return
+
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if replay.conditional and self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", content_type, etag)
+            return
+        self._send(200, body, content_type, etag if replay.conditional else None)
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.server.replay.count(status)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, replay: "ReplayServer", name: Optional[str]):
+        super().__init__((replay.host, 0), _Handler)
+        self.replay = replay
+        self.name = name  # None for the feeds server
+        self.pages: Dict[str, bytes] = {}
+
+    def route(self, path: str):
+        if self.name is None:
+            return self.pages.get(path, b""), "application/rss+xml; charset=utf-8"
+        if path == "/robots.txt":
+            return self.pages["robots"], "text/plain; charset=utf-8"
+        if path == "/":
+            return self.pages["home"], "text/html; charset=utf-8"
+        return self.pages["article"], "text/html; charset=utf-8"
+
+
+class ReplayServer:
+    """Runs one local HTTP server per source plus one for the RSS feeds."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        conditional: bool = False,
+        host: str = "127.0.0.1",
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.conditional = conditional  # send ETags and answer If-None-Match with 304
+        self.host = host
+        self.requests = 0
+        self.status_counts: Dict[int, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers: Dict[str, _SiteServer] = {}
+        self._threads: List[threading.Thread] = []
+
+    # --- injected behaviour ---
+    def sleep(self) -> None:
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def count(self, status: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    # --- lifecycle ---
+    def start(self) -> "ReplayServer":
+        for name in SITES:
+            self._servers[name] = _SiteServer(self, name)
+        self._servers["feeds"] = _SiteServer(self, None)
+
+        def localize(body: bytes) -> bytes:
+            for name, real_base in SITES.items():
+                body = body.replace(real_base.encode(), self.base_url(name).encode())
+            return body
+
+        for name in SITES:
+            self._servers[name].pages = {
+                "home": localize(_read("html", f"{name}_home.html")),
+                "article": localize(_read("html", f"{name}_article.html")),
+                "robots": _read("robots", f"{name}.txt"),
+            }
+        self._servers["feeds"].pages = {f"/{feed}.xml": _read("feeds", f"{feed}.xml") for feed in FEEDS}
+
+        for server in self._servers.values():
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+        self._threads.clear()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- addresses ---
+    def base_url(self, name: str) -> str:
+        return f"http://{self.host}:{self._servers[name].server_address[1]}/"
+
+    def feed_urls(self) -> List[str]:
+        return [f"{self.base_url('feeds')}{feed}.xml" for feed in FEEDS]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--conditional", action="store_true", help="send ETags and honour If-None-Match")
+    args = parser.parse_args()
+
+    with ReplayServer(args.latency_ms, args.jitter_ms, args.error_rate, args.conditional) as replay:
+        for name in SITES:
+            print(f"{name:<12} {replay.base_url(name)}")
+        for url in replay.feed_urls():
+            print(f"{'feed':<12} {url}")
+        print("\nServing. Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
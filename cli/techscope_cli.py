@@ -7,6 +7,14 @@ import os
 from datetime import datetime
 from uuid import uuid4
 import re
+import sys
+
+# Ensure project root is in sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils.phrase_matcher import get_matcher, register_phrases
 
 app = typer.Typer()
 
@@ -16,6 +24,11 @@ DB_PATH = os.path.join(STORAGE_DIR, "techscope.db")
 JSON_PATH = os.path.join(STORAGE_DIR, "techscope.json")
 TEXT_PATH = os.path.join(STORAGE_DIR, "techscope.txt")
 
+BAD_INDICATORS = ['rumor', 'unverified', 'alleged', 'reportedly', 'according to sources']
+
+# Compiled once; the list can be overridden via PHRASE_LISTS_PATH (see utils/phrase_matcher.py)
+register_phrases("cli_credibility", {"bad_indicators": BAD_INDICATORS})
+
 # === Ensure storage directory exists ===
 os.makedirs(STORAGE_DIR, exist_ok=True)
 
@@ -55,8 +68,7 @@ def summarize_text(text: str, max_sentences=5) -> str:
 
 def calculate_credibility(text: str) -> float:
     credibility = 100.0
-    bad_indicators = ['rumor', 'unverified', 'alleged', 'reportedly', 'according to sources']
-    penalty = sum(text.lower().count(word) for word in bad_indicators)
+    penalty = get_matcher("cli_credibility").counts(text)["bad_indicators"]
     credibility -= penalty * 10
     return max(credibility, 0.0)
 
@@ -2,12 +2,15 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
+import time
 import logging
+import httpx
 
-from utils.scraper import scrape_website
-from utils.summarizer import summarize_text
+from sources.crawler import fetch_article
+from utils.analysis_pool import get_analysis_pool
 from utils.keywords import extract_keywords
-from utils.credibility import calculate_credibility
+from utils.pipeline import Stage, StageFailed, in_pool, in_thread, run_pipeline
+from utils.summary_router import DeadlineExceeded, route_summary
 
 from storage.json_writer import write_to_json
 from storage.csv_writer import write_to_csv
@@ -30,6 +33,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Analysis pool: credibility, bias and sentiment run in worker processes ---
+@app.on_event("startup")
+def start_analysis_pool():
+    """Spawn the workers without waiting; single texts are scored inline until they are warm"""
+    get_analysis_pool().start()
+
+@app.on_event("shutdown")
+def stop_analysis_pool():
+    get_analysis_pool().shutdown()
+
 # --- Request Schema ---
 class URLInput(BaseModel):
     url: str
@@ -41,48 +54,81 @@ class URLInput(BaseModel):
 def read_root():
     return {"TechScope": "Summarization and Credibility API", "status": "Running"}
 
-@app.post("/analyze/")
-def analyze_url(input: URLInput):
-    try:
-        logging.info(f"Received request for URL: {input.url}")
+def store_result(result: dict, mode: str) -> None:
+    """Store based on mode"""
+    if mode == "json":
+        write_to_json(result)
+    elif mode == "csv":
+        write_to_csv(result)
+    elif mode == "db":
+        write_to_db(result["summary"], result["credibility"], result["keywords"])
+    elif mode == "mongo":
+        write_to_mongo(result)
+    else:
+        logging.warning(f"Unknown storage mode: {mode}")
 
-        # Step 1: Scrape content
-        content = scrape_website(input.url)
+@app.post("/analyze/")
+async def analyze_url(input: URLInput):
+    """
+    Scrape the URL, then run summary, keywords, credibility, bias and sentiment
+    concurrently (model stages in threads, scorers in the analysis pool) and
+    store the result. The response includes each stage's time in ms.
+    """
+    started = time.perf_counter()
+    logging.info(f"Received request for URL: {input.url}")
+
+    # Step 1: Scrape content
+    async def scrape() -> str:
+        try:
+            article = await fetch_article(input.url)
+        except httpx.HTTPError as e:
+            # Error statuses and network failures mean the page can't be scraped, not a server fault
+            logging.warning(f"Fetching {input.url} failed: {e}")
+            article = None
+        content = (article or {}).get("content")
         if not content:
             raise HTTPException(status_code=404, detail="Content could not be scraped.")
+        return content
 
-        # Step 2: Summarize
-        summary = summarize_text(content)
+    async def summarize(scrape: str) -> str:
+        return (await route_summary(scrape))["summary"]
 
-        # Step 3: Keywords
-        keywords = extract_keywords(content)
-
-        # Step 4: Credibility
-        score = calculate_credibility(content)
-
-        # Step 5: Result
+    async def store(summary: str, keywords: List[str], credibility: float) -> dict:
         result = {
             "url": input.url,
             "summary": summary,
             "keywords": keywords,
-            "credibility": round(score, 2)
+            "credibility": round(credibility, 2)
         }
-
-        # Step 6: Store based on mode
-        if input.mode == "json":
-            write_to_json(result)
-        elif input.mode == "csv":
-            write_to_csv(result)
-        elif input.mode == "db":
-            write_to_db(summary, score, keywords)
-        elif input.mode == "mongo":
-            write_to_mongo(result)
-        else:
-            logging.warning(f"Unknown storage mode: {input.mode}")
-
-        logging.info(f"Processed URL successfully: {input.url}")
+        await in_thread(store_result)(dict(result), input.mode)
         return result
 
-    except Exception as e:
+    try:
+        results, timings = await run_pipeline([
+            Stage("scrape", scrape),
+            # Everything that only needs the content runs at once
+            Stage("summary", summarize, after=("scrape",)),
+            Stage("keywords", lambda scrape: in_thread(extract_keywords)(scrape), after=("scrape",)),
+            Stage("credibility", lambda scrape: in_pool("credibility")(scrape), after=("scrape",)),
+            Stage("bias", lambda scrape: in_pool("bias")(scrape), after=("scrape",)),
+            Stage("sentiment", lambda scrape: in_pool("sentiment")(scrape), after=("scrape",)),
+            # Stored once summary, keywords and credibility are in
+            Stage("storage", lambda summary, keywords, credibility: store(summary, keywords, credibility),
+                  after=("summary", "keywords", "credibility")),
+        ])
+    except StageFailed as e:
+        cause = e.__cause__
+        if isinstance(cause, HTTPException):
+            raise cause
+        status = 504 if isinstance(cause, DeadlineExceeded) else 500
         logging.error(f"Error processing URL: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=status, detail=str(e))
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    logging.info(f"Processed URL successfully: {input.url} in {timings['total']} ms")
+    return {
+        **results["storage"],
+        "bias": results["bias"],
+        "sentiment": results["sentiment"],
+        "timings_ms": timings,
+    }
@@ -1,10 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
 import logging
 import time
 
+from sources.parsing import PARSER_VERSION, ArticleParser, LinkExtractor
+from sources.robots import robots_cache
+from utils.http_cache import http_cache
+from utils.seen_index import get_seen_index
+
 # --------------------------
 # Configuration
 # --------------------------
@@ -22,18 +24,37 @@ REQUEST_DELAY = 2  # seconds
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
+# --------------------------
+# Selectors (compiled once, see sources/parsing.py)
+# --------------------------
+LINK_EXTRACTOR = LinkExtractor("a[href]")
+ARTICLE_PARSER = ArticleParser(
+    title="h1",
+    author="a[rel~=author]",
+    published="time",
+    body="div.article-content",
+)
+
+
 # --------------------------
 # robots.txt Permission Check
 # --------------------------
 def is_scraping_allowed(path: str = "/") -> bool:
-    try:
-        rp = RobotFileParser()
-        rp.set_url(ROBOTS_URL)
-        rp.read()
-        return rp.can_fetch(HEADERS["User-Agent"], urljoin(BASE_URL, path))
-    except Exception as e:
-        logging.warning(f"Failed to read robots.txt: {e}")
-        return False
+    # robots.txt is fetched once per host and shared by every source (see sources/robots.py)
+    return robots_cache.can_fetch(urljoin(BASE_URL, path), HEADERS["User-Agent"])
+
+
+# --------------------------
+# Extract Article Links from Homepage HTML
+# --------------------------
+def extract_article_links(html: str) -> list:
+    links = []
+    for href in LINK_EXTRACTOR.hrefs(html):
+        if "/202" in href and href.startswith("/"):  # likely article
+            full_url = urljoin(BASE_URL, href)
+            links.append(full_url)
+
+    return list(set(links))
 
 
 # --------------------------
@@ -45,24 +66,23 @@ def get_article_links() -> list:
         return []
 
     try:
-        res = requests.get(BASE_URL, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        links = []
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if "/202" in href and href.startswith("/"):  # likely article
-                full_url = urljoin(BASE_URL, href)
-                links.append(full_url)
-
-        return list(set(links))
+        # Unchanged homepages come back as 304 and reuse the stored link list
+        res = http_cache.fetch(BASE_URL, headers=HEADERS, timeout=10, parse=extract_article_links,
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to fetch homepage: {e}")
         return []
 
 
+# --------------------------
+# Extract Article Fields from HTML
+# --------------------------
+def extract_article(url: str, html: str) -> dict:
+    return ARTICLE_PARSER.parse(url, html)
+
+
 # --------------------------
 # Parse Single Article
 # --------------------------
@@ -73,30 +93,9 @@ def parse_article(url: str) -> dict:
         return None
 
     try:
-        res = requests.get(url, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        title_tag = soup.find("h1")
-        title = title_tag.get_text(strip=True) if title_tag else "No Title"
-
-        author_tag = soup.find("a", rel="author")
-        author = author_tag.get_text(strip=True) if author_tag else "Unknown"
-
-        date_tag = soup.find("time")
-        published = date_tag["datetime"] if date_tag and date_tag.has_attr("datetime") else None
-
-        content_div = soup.find("div", class_="article-content")
-        paragraphs = content_div.find_all("p") if content_div else []
-        content = "\n".join(p.get_text(strip=True) for p in paragraphs)
-
-        return {
-            "url": url,
-            "title": title,
-            "author": author,
-            "published": published,
-            "content": content
-        }
+        res = http_cache.fetch(url, headers=HEADERS, timeout=10, parse=lambda html: extract_article(url, html),
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to parse article: {url} | {e}")
@@ -106,16 +105,22 @@ def parse_article(url: str) -> dict:
 # --------------------------
 # Main Scraper
 # --------------------------
-def scrape_arstechnica(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY) -> list:
+def scrape_arstechnica(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY, skip_seen: bool = True) -> list:
     logging.info(" Scraping Ars Technica for recent articles...")
     articles = []
-    links = get_article_links()[:limit]
+    links = get_article_links()
+    if skip_seen:
+        # Already-ingested articles are dropped before any request is made
+        links = get_seen_index().filter_new(links)
+    links = links[:limit]
 
     for i, link in enumerate(links):
         logging.info(f"[{i+1}/{len(links)}] Scraping: {link}")
         article = parse_article(link)
         if article:
             articles.append(article)
+            if skip_seen:
+                get_seen_index().mark([link], source="arstechnica")
         time.sleep(delay)
 
     logging.info(f" Completed. Scraped {len(articles)} articles.")
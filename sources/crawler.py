@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from sources import arstechnica, techcrunch, theverge, wired
+from sources.parsing import PARSER_VERSION
+from sources.robots import robots_cache
+from utils.clean_text import clean_article_text
+from utils.http_cache import http_cache
+from utils.seen_index import get_seen_index
+
+# --------------------------
+# Configuration
+# --------------------------
+SOURCES = {
+    "techcrunch": techcrunch,
+    "theverge": theverge,
+    "arstechnica": arstechnica,
+    "wired": wired,
+}
+HEADERS = techcrunch.HEADERS
+ARTICLE_LIMIT = 5
+REQUESTS_PER_SECOND = 0.5  # per host, same pace as the old 2 s REQUEST_DELAY
+BURST = 1                  # requests a host may receive back-to-back
+MAX_CONNECTIONS = 20
+REQUEST_TIMEOUT = 10  # seconds
+
+# --------------------------
+# Setup Logging
+# --------------------------
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+# --------------------------
+# Per-host politeness limiter
+# --------------------------
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: int = BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use."""
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        host = urlparse(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+
+# --------------------------
+# HTTP helpers
+# --------------------------
+async def fetch_parsed(client: httpx.AsyncClient, limiter: HostRateLimiter, url: str, parse: Callable[[str], Any]) -> Any:
+    """Conditional GET through the shared HTTP cache; `parse` runs off the event loop and is skipped on 304."""
+    await limiter.acquire(url)
+    res = await http_cache.afetch(client, url, parse=parse, parse_version=PARSER_VERSION)
+    return res.parsed
+
+
+async def load_robots(client: httpx.AsyncClient, limiter: HostRateLimiter, robots_url: str) -> Optional[RobotFileParser]:
+    found, rp = robots_cache.lookup(robots_url)
+    if found:
+        return rp
+
+    try:
+        await limiter.acquire(robots_url)
+        res = await client.get(robots_url)
+    except Exception as e:
+        logging.warning(f"Failed to read robots.txt: {robots_url} | {e}")
+        return robots_cache.store_failure(robots_url)
+    return robots_cache.store(robots_url, res.status_code, res.text)
+
+
+# --------------------------
+# Fetch one article by URL
+# --------------------------
+def source_for(url: str) -> Optional[str]:
+    """Name of the known source serving `url`, if any."""
+    host = urlparse(url).netloc
+    for name, module in SOURCES.items():
+        if urlparse(module.BASE_URL).netloc == host:
+            return name
+    return None
+
+
+def _extract_page(url: str, html: str) -> dict:
+    # Pages from unknown sites: the whole page's text, no field selectors
+    return {"url": url, "title": None, "author": None, "published": None, "content": clean_article_text(html)}
+
+
+async def fetch_article(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[dict]:
+    """
+    Fetch and parse a single article through the HTTP cache. Known sources use
+    their own parser, other sites get the page's cleaned text. Returns None
+    if robots.txt disallows the URL. A caller-supplied `client` is left open.
+    """
+    name = source_for(url)
+    allowed = await asyncio.to_thread(robots_cache.can_fetch, url, HEADERS["User-Agent"])
+    if not allowed:
+        logging.warning(f"Skipping (not allowed by robots.txt): {url}")
+        return None
+
+    parse = (lambda html: SOURCES[name].extract_article(url, html)) if name else (lambda html: _extract_page(url, html))
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(headers=HEADERS, timeout=REQUEST_TIMEOUT, follow_redirects=True)
+    try:
+        article = dict((await http_cache.afetch(client, url, parse=parse, parse_version=PARSER_VERSION)).parsed)
+    finally:
+        if own_client:
+            await client.aclose()
+    article["source"] = name or urlparse(url).netloc
+    return article
+
+
+# --------------------------
+# Crawl a single source
+# --------------------------
+async def crawl_source(
+    name: str,
+    client: httpx.AsyncClient,
+    limiter: HostRateLimiter,
+    queue: asyncio.Queue,
+    limit: int = ARTICLE_LIMIT,
+    skip_seen: bool = True,
+) -> None:
+    module = SOURCES[name]
+    user_agent = HEADERS["User-Agent"]
+
+    rp = await load_robots(client, limiter, module.ROBOTS_URL)
+    if rp is None or not rp.can_fetch(user_agent, module.BASE_URL):
+        logging.warning(f"[{name}] Scraping disallowed by robots.txt")
+        return
+
+    try:
+        links = await fetch_parsed(client, limiter, module.BASE_URL, module.extract_article_links)
+        if skip_seen:
+            links = get_seen_index().filter_new(links)
+        links = links[:limit]
+    except Exception as e:
+        logging.error(f"[{name}] Failed to fetch homepage: {e}")
+        return
+
+    async def scrape(url: str) -> None:
+        if not rp.can_fetch(user_agent, url):
+            logging.warning(f"[{name}] Skipping (robots.txt): {url}")
+            return
+        try:
+            article = dict(await fetch_parsed(client, limiter, url, lambda html: module.extract_article(url, html)))
+        except Exception as e:
+            logging.error(f"[{name}] Failed to parse article: {url} | {e}")
+            return
+        article["source"] = name
+        if skip_seen:
+            get_seen_index().mark([url], source=name)
+        await queue.put(article)
+
+    logging.info(f"[{name}] Scraping {len(links)} articles...")
+    await asyncio.gather(*(scrape(url) for url in links))
+
+
+# --------------------------
+# Crawl all sources concurrently
+# --------------------------
+_DONE = object()
+
+
+async def scrape_all(
+    sources: Optional[List[str]] = None,
+    limit: int = ARTICLE_LIMIT,
+    rate: float = REQUESTS_PER_SECOND,
+    burst: int = BURST,
+    skip_seen: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[dict]:
+    """
+    Crawl every source concurrently over one pooled client and yield
+    articles as soon as they are parsed. Each article carries a "source" key.
+    With `skip_seen`, links already in the seen-URL index are never fetched.
+    A caller-supplied `client` is used as-is and left open.
+
+    Usage:
+        async for article in scrape_all():
+            ...
+    """
+    names = sources or list(SOURCES)
+    limiter = HostRateLimiter(rate, burst)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    own_client = client is None
+    if own_client:
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+        client = httpx.AsyncClient(headers=HEADERS, timeout=REQUEST_TIMEOUT, limits=limits, follow_redirects=True)
+
+    async def run_all() -> None:
+        try:
+            await asyncio.gather(
+                *(crawl_source(name, client, limiter, queue, limit, skip_seen) for name in names),
+                return_exceptions=True,
+            )
+        finally:
+            await queue.put(_DONE)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            article = await queue.get()
+            if article is _DONE:
+                break
+            yield article
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        if own_client:
+            await client.aclose()
+
+
+def crawl(sources: Optional[List[str]] = None, limit: int = ARTICLE_LIMIT, rate: float = REQUESTS_PER_SECOND) -> list:
+    """Blocking wrapper around scrape_all() that collects every article."""
+    async def collect() -> list:
+        return [article async for article in scrape_all(sources, limit, rate)]
+
+    started = time.perf_counter()
+    articles = asyncio.run(collect())
+    logging.info(f" Crawl finished. {len(articles)} articles in {time.perf_counter() - started:.1f}s.")
+    return articles
+
+
+# --------------------------
+# Run as standalone
+# --------------------------
+if __name__ == "__main__":
+    for art in crawl():
+        print(f"\n [{art['source']}] {art['title']}\n {art['url']}\n {art['published']}\n {art['author']}\n---\n{art['content'][:300]}...\n")
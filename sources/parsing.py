@@ -0,0 +1,192 @@
+import os
+from typing import List, Optional
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from lxml.cssselect import CSSSelector
+    HAS_CSSSELECT = HAS_LXML
+except ImportError:
+    HAS_CSSSELECT = False
+
+# --------------------------
+# Configuration
+# --------------------------
+# "lxml"        - lxml.html tree + compiled CSS selectors (fastest, needs lxml + cssselect)
+# "bs4-lxml"    - BeautifulSoup on the lxml tree builder, strained to the needed tags
+# "html.parser" - BeautifulSoup on the stdlib parser, strained to the needed tags
+# "auto"        - best of the above that is installed
+PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto")
+BACKENDS = ("lxml", "bs4-lxml", "html.parser")
+# Stored with parsed pages in the HTTP cache; bump it whenever selectors or
+# extraction change so cached results from the old extractor are re-parsed
+PARSER_VERSION = "1"
+
+
+def resolve_backend(name: str = PARSER_BACKEND) -> str:
+    if name == "auto":
+        if HAS_CSSSELECT:
+            return "lxml"
+        return "bs4-lxml" if HAS_LXML else "html.parser"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name} (choose from {', '.join(BACKENDS)})")
+    if name == "lxml" and not HAS_CSSSELECT:
+        raise ImportError("The lxml backend needs `pip install lxml cssselect`")
+    if name == "bs4-lxml" and not HAS_LXML:
+        raise ImportError("The bs4-lxml backend needs `pip install lxml`")
+    return name
+
+
+def _strain_names(selectors: List[str]) -> List[str]:
+    """Tag names of the outermost compound in each selector ("div.a p" -> "div")."""
+    names = set()
+    for selector in selectors:
+        for part in selector.split(","):
+            head = part.strip().split()[0]
+            name = head.split(".")[0].split("[")[0].split("#")[0].split(":")[0]
+            if not name or name == "*":
+                return []  # can't strain on a universal selector
+            names.add(name)
+    return sorted(names)
+
+
+if HAS_LXML:
+    # Text nodes below an element, ignoring script/style like BeautifulSoup.get_text()
+    _TEXT_NODES = etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+
+def _lxml_text(el) -> str:
+    return "".join(s.strip() for s in _TEXT_NODES(el))
+
+
+def _lxml_tree(html: str):
+    return lxml.html.fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+
+# --------------------------
+# Compiled selector sets
+# --------------------------
+class SelectorSet:
+    """
+    A group of CSS selectors compiled once for the chosen backend.
+    BeautifulSoup backends only build the tags the selectors can reach.
+    """
+
+    def __init__(self, backend: str = PARSER_BACKEND, **selectors: Optional[str]):
+        self.backend = resolve_backend(backend)
+        self.selectors = {key: sel for key, sel in selectors.items() if sel}
+
+        if self.backend == "lxml":
+            self._compiled = {key: CSSSelector(sel) for key, sel in self.selectors.items()}
+        else:
+            self._compiled = {key: soupsieve.compile(sel) for key, sel in self.selectors.items()}
+            names = _strain_names(list(self.selectors.values()))
+            self._strainer = SoupStrainer(names) if names else None
+
+    def parse(self, html: str):
+        if self.backend == "lxml":
+            return _lxml_tree(html)
+        builder = "lxml" if self.backend == "bs4-lxml" else "html.parser"
+        return BeautifulSoup(html, builder, parse_only=self._strainer)
+
+    def select_one(self, tree, key: str):
+        if key not in self._compiled:
+            return None
+        if self.backend == "lxml":
+            found = self._compiled[key](tree)
+            return found[0] if found else None
+        return self._compiled[key].select_one(tree)
+
+    def select(self, tree, key: str) -> list:
+        if key not in self._compiled:
+            return []
+        if self.backend == "lxml":
+            return self._compiled[key](tree)
+        return self._compiled[key].select(tree)
+
+    def text(self, el) -> str:
+        if self.backend == "lxml":
+            return _lxml_text(el)
+        return el.get_text(strip=True)
+
+    @staticmethod
+    def attr(el, name: str) -> Optional[str]:
+        return el.get(name)
+
+
+# --------------------------
+# Homepage link extraction
+# --------------------------
+class LinkExtractor:
+    """Collect hrefs of the anchors matching `selector`."""
+
+    def __init__(self, selector: str, backend: str = PARSER_BACKEND):
+        self.selectors = SelectorSet(backend, links=selector)
+
+    def hrefs(self, html: str) -> List[str]:
+        tree = self.selectors.parse(html)
+        return [
+            href
+            for href in (self.selectors.attr(a, "href") for a in self.selectors.select(tree, "links"))
+            if href
+        ]
+
+
+# --------------------------
+# Article field extraction
+# --------------------------
+class ArticleParser:
+    """
+    Extract title / author / published / content from an article page
+    with one parse and one lookup per field.
+
+    `paragraphs` is matched inside the element found by `body`.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        author: Optional[str],
+        published: Optional[str],
+        body: str,
+        paragraphs: str = "p",
+        missing_title: str = "No Title",
+        missing_author: str = "Unknown",
+        backend: str = PARSER_BACKEND,
+    ):
+        self.missing_title = missing_title
+        self.missing_author = missing_author
+        self.selectors = SelectorSet(
+            backend, title=title, author=author, published=published, body=body, paragraphs=paragraphs
+        )
+
+    @property
+    def backend(self) -> str:
+        return self.selectors.backend
+
+    def parse(self, url: str, html: str) -> dict:
+        sel = self.selectors
+        tree = sel.parse(html)
+
+        title_tag = sel.select_one(tree, "title")
+        author_tag = sel.select_one(tree, "author")
+        time_tag = sel.select_one(tree, "published")
+        body = sel.select_one(tree, "body")
+        paragraphs = sel.select(body, "paragraphs") if body is not None else []
+
+        return {
+            "url": url,
+            "title": sel.text(title_tag) if title_tag is not None else self.missing_title,
+            "author": sel.text(author_tag) if author_tag is not None else self.missing_author,
+            "published": sel.attr(time_tag, "datetime") if time_tag is not None else None,
+            "content": "\n".join(sel.text(p) for p in paragraphs),
+        }
+
@@ -0,0 +1,130 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+# --------------------------
+# Configuration
+# --------------------------
+ROBOTS_TTL = int(os.getenv("ROBOTS_CACHE_TTL", "3600"))               # seconds
+ROBOTS_NEGATIVE_TTL = int(os.getenv("ROBOTS_CACHE_NEGATIVE_TTL", "300"))  # seconds, after a failed fetch
+ROBOTS_TIMEOUT = 10  # seconds
+
+
+def robots_url_for(url: str) -> str:
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+
+# --------------------------
+# Process-wide robots.txt cache
+# --------------------------
+class RobotsCache:
+    """
+    Caches one parsed robots.txt per host.
+
+    A failed fetch (network error or 5xx) is cached as `None` for
+    `negative_ttl` seconds, during which every URL on that host is treated
+    as disallowed - the same answer the per-call check used to give.
+    """
+
+    def __init__(self, ttl: int = ROBOTS_TTL, negative_ttl: int = ROBOTS_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[Optional[RobotFileParser], float]] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    def lookup(self, url: str) -> Tuple[bool, Optional[RobotFileParser]]:
+        """Return (found, parser) for the host of `url` without fetching."""
+        key = robots_url_for(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+            return False, None
+
+    def store(self, url: str, status: int, text: str) -> Optional[RobotFileParser]:
+        """Cache a robots.txt response, following RobotFileParser.read() status rules."""
+        if status >= 500:
+            return self.store_failure(url)
+
+        key = robots_url_for(url)
+        rp = RobotFileParser(key)
+        if status in (401, 403):
+            rp.disallow_all = True
+        elif status >= 400:
+            rp.allow_all = True
+        else:
+            rp.parse(text.splitlines())
+        rp.modified()
+
+        with self._lock:
+            self._entries[key] = (rp, time.monotonic() + self.ttl)
+        return rp
+
+    def store_failure(self, url: str) -> None:
+        with self._lock:
+            self._entries[robots_url_for(url)] = (None, time.monotonic() + self.negative_ttl)
+        return None
+
+    def get(self, url: str, user_agent: Optional[str] = None) -> Optional[RobotFileParser]:
+        """Return the parser for the host of `url`, downloading robots.txt on a miss."""
+        found, rp = self.lookup(url)
+        if found:
+            return rp
+
+        key = robots_url_for(url)
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        # Only one thread downloads a given host's robots.txt; the rest wait and reuse it
+        with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+
+            headers = {"User-Agent": user_agent} if user_agent else None
+            try:
+                res = requests.get(key, headers=headers, timeout=ROBOTS_TIMEOUT)
+            except Exception as e:
+                logging.warning(f"Failed to read robots.txt: {key} | {e}")
+                return self.store_failure(key)
+            return self.store(key, res.status_code, res.text)
+
+    def can_fetch(self, url: str, user_agent: str) -> bool:
+        rp = self.get(url, user_agent)
+        if rp is None:
+            return False
+        return rp.can_fetch(user_agent, url)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Drop one host's entry, or everything when `url` is None."""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(robots_url_for(url), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hosts": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+robots_cache = RobotsCache()
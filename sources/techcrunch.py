@@ -1,10 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from urllib.robotparser import RobotFileParser
 import time
 import logging
 
+from sources.parsing import PARSER_VERSION, ArticleParser, LinkExtractor
+from sources.robots import robots_cache
+from utils.http_cache import http_cache
+from utils.seen_index import get_seen_index
+
 # --------------------------
 # Configuration
 # --------------------------
@@ -22,18 +24,33 @@ REQUEST_DELAY = 2  # in seconds
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
+# --------------------------
+# Selectors (compiled once, see sources/parsing.py)
+# --------------------------
+LINK_EXTRACTOR = LinkExtractor("a.post-block__title__link")
+ARTICLE_PARSER = ArticleParser(
+    title="h1",
+    author="a[rel~=author]",
+    published="time",
+    body="div.article-content",
+    missing_title="No title",
+)
+
+
 # --------------------------
 # Check robots.txt permission
 # --------------------------
 def is_scraping_allowed(path: str = "/") -> bool:
-    try:
-        rp = RobotFileParser()
-        rp.set_url(ROBOTS_URL)
-        rp.read()
-        return rp.can_fetch(HEADERS["User-Agent"], urljoin(BASE_URL, path))
-    except Exception as e:
-        logging.warning(f"Failed to read robots.txt: {e}")
-        return False
+    # robots.txt is fetched once per host and shared by every source (see sources/robots.py)
+    return robots_cache.can_fetch(urljoin(BASE_URL, path), HEADERS["User-Agent"])
+
+
+# --------------------------
+# Extract article links from homepage HTML
+# --------------------------
+def extract_article_links(html: str) -> list:
+    links = [href for href in LINK_EXTRACTOR.hrefs(html) if href.startswith(BASE_URL)]
+    return list(set(links))  # deduplicate
 
 
 # --------------------------
@@ -45,20 +62,22 @@ def get_article_links() -> list:
         return []
 
     try:
-        res = requests.get(BASE_URL, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-        links = [
-            a["href"]
-            for a in soup.select("a.post-block__title__link")
-            if a.get("href") and a["href"].startswith("https://techcrunch.com/")
-        ]
-        return list(set(links))  # deduplicate
+        # Unchanged homepages come back as 304 and reuse the stored link list
+        res = http_cache.fetch(BASE_URL, headers=HEADERS, timeout=10, parse=extract_article_links,
+                              parse_version=PARSER_VERSION)
+        return res.parsed
     except Exception as e:
         logging.error(f"Failed to fetch homepage: {e}")
         return []
 
 
+# --------------------------
+# Extract article fields from HTML
+# --------------------------
+def extract_article(url: str, html: str) -> dict:
+    return ARTICLE_PARSER.parse(url, html)
+
+
 # --------------------------
 # Parse individual article
 # --------------------------
@@ -69,23 +88,9 @@ def parse_article(url: str) -> dict:
         return None
 
     try:
-        res = requests.get(url, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        title = soup.find("h1").get_text(strip=True) if soup.find("h1") else "No title"
-        author = soup.find("a", rel="author").get_text(strip=True) if soup.find("a", rel="author") else "Unknown"
-        published = soup.find("time")["datetime"] if soup.find("time") else None
-        body = soup.find("div", class_="article-content")
-        content = "\n".join(p.get_text(strip=True) for p in body.find_all("p")) if body else ""
-
-        return {
-            "url": url,
-            "title": title,
-            "author": author,
-            "published": published,
-            "content": content
-        }
+        res = http_cache.fetch(url, headers=HEADERS, timeout=10, parse=lambda html: extract_article(url, html),
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to parse article: {url} | {e}")
@@ -95,16 +100,22 @@ def parse_article(url: str) -> dict:
 # --------------------------
 # Main scraper function
 # --------------------------
-def scrape_techcrunch(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY) -> list:
+def scrape_techcrunch(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY, skip_seen: bool = True) -> list:
     logging.info(" Fetching articles from TechCrunch...")
     articles = []
-    links = get_article_links()[:limit]
+    links = get_article_links()
+    if skip_seen:
+        # Already-ingested articles are dropped before any request is made
+        links = get_seen_index().filter_new(links)
+    links = links[:limit]
 
     for i, link in enumerate(links):
         logging.info(f"[{i+1}/{len(links)}] Scraping: {link}")
         article = parse_article(link)
         if article:
             articles.append(article)
+            if skip_seen:
+                get_seen_index().mark([link], source="techcrunch")
         time.sleep(delay)
 
     logging.info(f" Done. {len(articles)} articles fetched.")
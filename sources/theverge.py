@@ -1,10 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
 import time
 import logging
 
+from sources.parsing import PARSER_VERSION, ArticleParser, LinkExtractor
+from sources.robots import robots_cache
+from utils.http_cache import http_cache
+from utils.seen_index import get_seen_index
+
 # --------------------------
 # Configuration
 # --------------------------
@@ -22,18 +24,37 @@ REQUEST_DELAY = 2  # seconds
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
+# --------------------------
+# Selectors (compiled once, see sources/parsing.py)
+# --------------------------
+LINK_EXTRACTOR = LinkExtractor("a[href]")  # filtered against BASE_URL below
+ARTICLE_PARSER = ArticleParser(
+    title="h1",
+    author="span.byline__name",
+    published="time",
+    body="div.duet--article--article-body-components-container",
+    missing_title="No title",
+)
+
+
 # --------------------------
 # Check robots.txt permission
 # --------------------------
 def is_scraping_allowed(path: str = "/") -> bool:
-    try:
-        rp = RobotFileParser()
-        rp.set_url(ROBOTS_URL)
-        rp.read()
-        return rp.can_fetch(HEADERS["User-Agent"], urljoin(BASE_URL, path))
-    except Exception as e:
-        logging.warning(f"robots.txt check failed: {e}")
-        return False
+    # robots.txt is fetched once per host and shared by every source (see sources/robots.py)
+    return robots_cache.can_fetch(urljoin(BASE_URL, path), HEADERS["User-Agent"])
+
+
+# --------------------------
+# Extract article links from homepage HTML
+# --------------------------
+def extract_article_links(html: str) -> list:
+    links = []
+    for href in LINK_EXTRACTOR.hrefs(html):
+        if href.startswith(BASE_URL) and "/202" in href:
+            links.append(href.split("?")[0])  # remove URL params
+
+    return list(set(links))  # deduplicate
 
 
 # --------------------------
@@ -45,23 +66,23 @@ def get_article_links() -> list:
         return []
 
     try:
-        res = requests.get(BASE_URL, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        links = []
-        for a in soup.select("a[href^='https://www.theverge.com/']"):
-            href = a.get("href")
-            if href and href.startswith("https://www.theverge.com/") and "/202" in href:
-                links.append(href.split("?")[0])  # remove URL params
-
-        return list(set(links))  # deduplicate
+        # Unchanged homepages come back as 304 and reuse the stored link list
+        res = http_cache.fetch(BASE_URL, headers=HEADERS, timeout=10, parse=extract_article_links,
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to fetch homepage: {e}")
         return []
 
 
+# --------------------------
+# Extract article fields from HTML
+# --------------------------
+def extract_article(url: str, html: str) -> dict:
+    return ARTICLE_PARSER.parse(url, html)
+
+
 # --------------------------
 # Parse single article
 # --------------------------
@@ -72,25 +93,9 @@ def parse_article(url: str) -> dict:
         return None
 
     try:
-        res = requests.get(url, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        title = soup.find("h1").get_text(strip=True) if soup.find("h1") else "No title"
-        author_tag = soup.find("span", class_="byline__name")
-        author = author_tag.get_text(strip=True) if author_tag else "Unknown"
-        published = soup.find("time")
-        published_date = published["datetime"] if published and published.has_attr("datetime") else None
-        article_body = soup.find("div", class_="duet--article--article-body-components-container")
-        content = "\n".join(p.get_text(strip=True) for p in article_body.find_all("p")) if article_body else ""
-
-        return {
-            "url": url,
-            "title": title,
-            "author": author,
-            "published": published_date,
-            "content": content
-        }
+        res = http_cache.fetch(url, headers=HEADERS, timeout=10, parse=lambda html: extract_article(url, html),
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to parse article: {url} | {e}")
@@ -100,16 +105,22 @@ def parse_article(url: str) -> dict:
 # --------------------------
 # Main scraper function
 # --------------------------
-def scrape_theverge(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY) -> list:
+def scrape_theverge(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY, skip_seen: bool = True) -> list:
     logging.info(" Fetching articles from The Verge...")
     articles = []
-    links = get_article_links()[:limit]
+    links = get_article_links()
+    if skip_seen:
+        # Already-ingested articles are dropped before any request is made
+        links = get_seen_index().filter_new(links)
+    links = links[:limit]
 
     for i, url in enumerate(links):
         logging.info(f"[{i+1}/{len(links)}] Scraping: {url}")
         article = parse_article(url)
         if article:
             articles.append(article)
+            if skip_seen:
+                get_seen_index().mark([url], source="theverge")
         time.sleep(delay)
 
     logging.info(f" Done. {len(articles)} articles scraped.")
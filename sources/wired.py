@@ -1,10 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
 import time
 import logging
 
+from sources.parsing import PARSER_VERSION, ArticleParser, LinkExtractor
+from sources.robots import robots_cache
+from utils.http_cache import http_cache
+from utils.seen_index import get_seen_index
+
 # --------------------------
 # Configuration
 # --------------------------
@@ -22,18 +24,37 @@ REQUEST_DELAY = 2  # seconds
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
+# --------------------------
+# Selectors (compiled once, see sources/parsing.py)
+# --------------------------
+LINK_EXTRACTOR = LinkExtractor("a[data-test-id='article-link']")
+ARTICLE_PARSER = ArticleParser(
+    title="h1",
+    author="a.byline-component__link",
+    published="time",
+    body="article",
+)
+
+
 # --------------------------
 # Check robots.txt permission
 # --------------------------
 def is_scraping_allowed(path: str = "/") -> bool:
-    try:
-        rp = RobotFileParser()
-        rp.set_url(ROBOTS_URL)
-        rp.read()
-        return rp.can_fetch(HEADERS["User-Agent"], urljoin(BASE_URL, path))
-    except Exception as e:
-        logging.warning(f"Failed to read robots.txt: {e}")
-        return False
+    # robots.txt is fetched once per host and shared by every source (see sources/robots.py)
+    return robots_cache.can_fetch(urljoin(BASE_URL, path), HEADERS["User-Agent"])
+
+
+# --------------------------
+# Extract article links from homepage HTML
+# --------------------------
+def extract_article_links(html: str) -> list:
+    links = []
+    for href in LINK_EXTRACTOR.hrefs(html):
+        full_url = urljoin(BASE_URL, href)
+        if '/202' in full_url:
+            links.append(full_url)
+
+    return list(set(links))
 
 
 # --------------------------
@@ -45,25 +66,23 @@ def get_article_links() -> list:
         return []
 
     try:
-        res = requests.get(BASE_URL, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        links = []
-        for a in soup.select("a[data-test-id='article-link']"):
-            href = a.get("href")
-            if href:
-                full_url = urljoin(BASE_URL, href)
-                if '/202' in full_url:
-                    links.append(full_url)
-
-        return list(set(links))
+        # Unchanged homepages come back as 304 and reuse the stored link list
+        res = http_cache.fetch(BASE_URL, headers=HEADERS, timeout=10, parse=extract_article_links,
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to fetch homepage: {e}")
         return []
 
 
+# --------------------------
+# Extract article fields from HTML
+# --------------------------
+def extract_article(url: str, html: str) -> dict:
+    return ARTICLE_PARSER.parse(url, html)
+
+
 # --------------------------
 # Parse an individual article
 # --------------------------
@@ -74,30 +93,9 @@ def parse_article(url: str) -> dict:
         return None
 
     try:
-        res = requests.get(url, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        title_tag = soup.find("h1")
-        title = title_tag.get_text(strip=True) if title_tag else "No Title"
-
-        author_tag = soup.find("a", class_="byline-component__link")
-        author = author_tag.get_text(strip=True) if author_tag else "Unknown"
-
-        time_tag = soup.find("time")
-        published = time_tag["datetime"] if time_tag and time_tag.has_attr("datetime") else None
-
-        article_body = soup.find("article")
-        paragraphs = article_body.select("p") if article_body else []
-        content = "\n".join(p.get_text(strip=True) for p in paragraphs)
-
-        return {
-            "url": url,
-            "title": title,
-            "author": author,
-            "published": published,
-            "content": content
-        }
+        res = http_cache.fetch(url, headers=HEADERS, timeout=10, parse=lambda html: extract_article(url, html),
+                              parse_version=PARSER_VERSION)
+        return res.parsed
 
     except Exception as e:
         logging.error(f"Failed to parse article: {url} | {e}")
@@ -107,16 +105,22 @@ def parse_article(url: str) -> dict:
 # --------------------------
 # Main scraper
 # --------------------------
-def scrape_wired(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY) -> list:
+def scrape_wired(limit: int = ARTICLE_LIMIT, delay: int = REQUEST_DELAY, skip_seen: bool = True) -> list:
     logging.info(" Scraping Wired for recent articles...")
     articles = []
-    links = get_article_links()[:limit]
+    links = get_article_links()
+    if skip_seen:
+        # Already-ingested articles are dropped before any request is made
+        links = get_seen_index().filter_new(links)
+    links = links[:limit]
 
     for i, link in enumerate(links):
         logging.info(f"[{i+1}/{len(links)}] Scraping: {link}")
         article = parse_article(link)
         if article:
             articles.append(article)
+            if skip_seen:
+                get_seen_index().mark([link], source="wired")
         time.sleep(delay)
 
     logging.info(f" Completed. Scraped {len(articles)} articles.")
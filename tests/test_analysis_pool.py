@@ -0,0 +1,28 @@
+"""Where the analysis pool scores single texts: in-process while cold, in the workers once warm."""
+from utils.analysis_pool import AnalysisPool
+from utils.credibility import score_credibility
+
+ARTICLE = "The company unveiled a new processor on Tuesday, according to analysts. " * 40
+
+
+def test_single_texts_go_to_the_workers_once_warm():
+    pool = AnalysisPool(workers=1)
+    assert pool.runs_inline(ARTICLE)  # not started yet
+    with pool:
+        assert pool.ready
+        assert not pool.runs_inline(ARTICLE)
+        assert not pool.runs_inline("short text")
+        assert pool.run("credibility", ARTICLE, timeout=30) == score_credibility(ARTICLE)
+
+
+def test_inline_threshold_keeps_small_texts_in_process():
+    pool = AnalysisPool(workers=1, inline_max_chars=100)
+    with pool:
+        assert pool.runs_inline("short text")
+        assert not pool.runs_inline(ARTICLE)
+
+
+def test_disabled_pool_scores_everything_in_process():
+    pool = AnalysisPool(workers=0)
+    assert pool.runs_inline(ARTICLE)
+    assert pool.run("credibility", ARTICLE) == score_credibility(ARTICLE)
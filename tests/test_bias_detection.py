@@ -0,0 +1,51 @@
+import pytest
+from textblob import TextBlob
+
+from utils.analysis_pool import _run_all
+from utils.bias_detection import analyze_bias, calculate_bias_score, clean_text, count_bias_cues
+
+# Punctuation, URLs and emoticons all move TextBlob polarity, so raw and cleaned text score differently
+TEXTS = [
+    "This is great!",
+    "This is great!!! Obviously the best launch ever :)",
+    "What a disaster... see https://example.com/story for the shocking details!",
+    "Not bad at all! The outrage is, clearly, overblown :(",
+    "A truly terrible, horribly bad product... www.example.com said it was a miracle!!",
+    "The company reported quarterly revenue of $4.2B, up 3% year over year.",
+]
+
+
+def baseline_bias_score(text: str) -> float:
+    # The scorer before AnalyzedDocument: cues and TextBlob polarity, both on the cleaned text
+    cleaned = clean_text(text)
+    return round(count_bias_cues(cleaned) * 0.7 + abs(TextBlob(cleaned).sentiment.polarity) * 10 * 0.3, 2)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_bias_score_matches_baseline(text):
+    assert calculate_bias_score(text) == baseline_bias_score(text)
+
+
+def test_punctuation_does_not_change_polarity_term():
+    # "great!" has polarity 1.0, "great" 0.8; bias uses the cleaned text
+    assert calculate_bias_score("This is great!") == 2.4
+
+
+def test_batched_bias_matches_single():
+    texts = [(text + " ") * 8 for text in TEXTS]  # past analyze_bias's 100-character minimum
+    batched = _run_all(("sentiment", "bias"), texts)
+    assert [result["bias"] for result in batched] == [analyze_bias(text) for text in texts]
+
+
+def test_count_bias_cues_keeps_its_case_sensitive_contract():
+    # Like the original text.count(phrase.lower()): only lowercase occurrences count
+    assert count_bias_cues("Obviously a disaster, obviously a DISASTER") == 2
+    assert count_bias_cues(clean_text("Obviously a disaster, obviously a DISASTER")) == 4
+
+
+def test_other_matchers_stay_case_insensitive():
+    from utils.phrase_matcher import PhraseMatcher
+
+    assert PhraseMatcher({"cues": ["Shocking"]}).counts("SHOCKING, shocking")["cues"] == 2
+    assert PhraseMatcher({"cues": ["Shocking"]}, case_sensitive=True).counts("SHOCKING, shocking")["cues"] == 1
+    assert PhraseMatcher({"cues": ["shocking"]}, whole_words=True, case_sensitive=True).counts("Shocking shocking")["cues"] == 1
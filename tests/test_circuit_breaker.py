@@ -0,0 +1,32 @@
+"""Circuit breaker state transitions."""
+import time
+
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_opens_after_consecutive_failures_and_recovers_through_a_trial():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=0.1)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one trial at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_late_failures_while_open_do_not_push_recovery_back():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=0.2)
+    breaker.record_failure()
+    opened_at = breaker.opened_at
+    time.sleep(0.1)
+    breaker.record_failure()  # an in-flight call that started before the circuit opened
+    assert breaker.opened_at == opened_at
+    assert breaker.counts["failures"] == 2
+    time.sleep(0.15)
+    assert breaker.allow()
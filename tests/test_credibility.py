@@ -0,0 +1,58 @@
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from utils.credibility import combine_features, credibility_features, score_credibility, score_credibility_batch
+from utils.rescore_credibility import rescore
+
+WORDS = ["according", "to", "the", "report", "shocking", "miracle", "source:", "exposed", "chip", "launch",
+         "you", "won't", "believe", "!", "!!!", "?!", "data", "market", "the", "the"]
+
+
+def baseline_score(features) -> float:
+    # The original score_credibility's arithmetic on the same counts
+    word_count, has_source, clickbait, exclamations, excessive_punct, repetition = features
+    length_score = min(word_count / 300, 1.0)
+    raw_score = (
+        length_score * 0.4 +
+        int(has_source) * 0.2 +
+        (1 / (1 + clickbait + exclamations + excessive_punct + repetition)) * 0.4
+    )
+    return round(min(max(raw_score, 0.0), 1.0), 2)
+
+
+def random_texts(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 400))) for _ in range(n)]
+
+
+def test_rounding_ties_match_python_round():
+    # raw score 0.325: np.round gives 0.32, round() 0.33
+    features = (90, 1, 3, 27, 19, 30)
+    assert combine_features(np.array(features))[0] == baseline_score(features) == 0.33
+
+
+def test_batch_matches_single_and_baseline():
+    texts = random_texts(2000)
+    batch = score_credibility_batch(texts).tolist()
+    assert batch == [score_credibility(text) for text in texts]
+    assert batch == [baseline_score(credibility_features(text)) for text in texts]
+
+
+def test_rescore_leaves_cli_summaries_alone(tmp_path):
+    db = str(tmp_path / "techscope.db")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, summary TEXT)")
+    conn.execute("CREATE TABLE summaries (id TEXT PRIMARY KEY, summary TEXT, credibility REAL)")
+    conn.executemany("INSERT INTO articles (summary) VALUES (?)", [(text,) for text in random_texts(10)])
+    conn.execute("INSERT INTO summaries VALUES ('a', 'shocking!!!', 70.0)")
+    conn.commit()
+
+    results = rescore(db)
+    assert set(results) == {"articles"}
+    assert conn.execute("SELECT credibility FROM summaries").fetchone()[0] == 70.0
+    with pytest.raises(ValueError):
+        rescore(db, tables=("summaries",))
+    conn.close()
@@ -0,0 +1,118 @@
+"""Adaptive feed poll planning, driven by a fake clock."""
+import pytest
+
+import utils.feed_scheduler as feed_scheduler
+from utils.feed_scheduler import AdaptivePollScheduler
+
+START = 1_700_000_000.0
+FEEDS = ["http://b.test/feed", "http://a.test/feed", "http://c.test/feed"]
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(feed_scheduler.random, "uniform", lambda low, high: 1.0)
+
+
+def make(clock, urls=FEEDS):
+    return AdaptivePollScheduler(urls, initial_interval=1800, min_interval=300, max_interval=14400, clock=clock)
+
+
+def test_every_feed_is_due_on_the_first_tick(clock):
+    poller = make(clock)
+    assert sorted(poller.pop_due()) == sorted(FEEDS)
+    assert poller.pop_due() == []
+    assert poller.seconds_until_next() == 14400  # nothing scheduled
+
+
+def test_interval_follows_the_publication_rate(clock):
+    poller = make(clock, FEEDS[:1])
+    url = FEEDS[0]
+    assert poller.record(url, "ok", 5) == 1800  # no rate yet: keep the starting interval
+
+    clock.advance(1800)
+    assert poller.record(url, "ok", 9) == pytest.approx(400)  # 9 per 1800 s -> 2 per 400 s
+    clock.advance(400)
+    assert poller.record(url, "ok", 2) == pytest.approx(400)  # same rate, same interval
+
+    clock.advance(400)
+    assert poller.record(url, "ok", 100) == 300  # a burst is clamped to min_interval
+    assert poller.status()[0]["entries_per_hour"] == pytest.approx((0.3 * 0.25 + 0.7 * 0.005) * 3600, abs=0.01)
+
+
+def test_idle_polls_stretch_up_to_the_max(clock):
+    poller = make(clock, FEEDS[:1])
+    intervals = []
+    for _ in range(6):
+        intervals.append(poller.record(FEEDS[0], "unchanged", 0))
+        clock.advance(intervals[-1])
+    assert intervals == [2700, 4050, 6075, 9112.5, 13668.75, 14400]
+
+
+def test_errors_back_off_exponentially_and_are_clamped(clock, no_jitter):
+    poller = make(clock, FEEDS[:1])
+    url = FEEDS[0]
+    assert [poller.record(url, "error") for _ in range(4)] == [3600, 7200, 14400, 14400]
+    assert poller.feeds[url].interval == 1800  # backoff never replaces the learned interval
+
+    # Long outages neither overflow nor exceed the max
+    for _ in range(2000):
+        poller.record(url, "timeout")
+    assert poller.record(url, "error") == 14400
+    assert poller.status()[0]["errors"] == 2005
+
+    assert poller.record(url, "unchanged", 0) == 2700  # recovery resets the count
+    assert poller.feeds[url].errors == 0
+
+
+@pytest.mark.parametrize("jitter, expected", [(0.8, 2880), (1.2, 4320)])
+def test_error_jitter_stays_within_bounds(clock, monkeypatch, jitter, expected):
+    monkeypatch.setattr(feed_scheduler.random, "uniform", lambda low, high: jitter if low <= jitter <= high else None)
+    poller = make(clock, FEEDS[:1])
+    assert poller.record(FEEDS[0], "error") == pytest.approx(expected)
+
+
+def test_heap_pops_feeds_in_due_order_and_status_matches(clock, no_jitter):
+    poller = make(clock)
+    poller.pop_due()
+    poller.record("http://a.test/feed", "unchanged", 0)  # due in 2700 s
+    poller.record("http://b.test/feed", "ok", 3)         # due in 1800 s
+    poller.record("http://c.test/feed", "error")         # due in 3600 s
+
+    assert poller.seconds_until_next() == 1800
+    assert [row["url"] for row in poller.status()] == ["http://b.test/feed", "http://a.test/feed", "http://c.test/feed"]
+    row = poller.status()[0]
+    assert row == {
+        "url": "http://b.test/feed",
+        "next_due": row["next_due"],
+        "due_in_seconds": 1800,
+        "interval_seconds": 1800,
+        "entries_per_hour": None,
+        "errors": 0,
+        "polls": 1,
+        "last_status": "ok",
+    }
+    assert row["next_due"] != "now"
+
+    clock.advance(1799)
+    assert poller.pop_due() == []
+    clock.advance(1000)
+    assert poller.pop_due() == ["http://b.test/feed", "http://a.test/feed"]
+    assert poller.seconds_until_next() == pytest.approx(801)
+    clock.advance(801)
+    assert poller.pop_due() == ["http://c.test/feed"]
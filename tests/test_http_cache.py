@@ -0,0 +1,108 @@
+"""Conditional-GET cache: revalidation, parse versions, deferred saves, expiry and pruning."""
+import os
+import time
+
+import pytest
+
+import utils.http_cache as http_cache_module
+from utils.http_cache import HTTPCache
+
+URL = "http://example.test/feed"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeServer:
+    """Stands in for requests: answers 304 when the client's ETag matches the current body's."""
+
+    def __init__(self, body="<p>v1</p>"):
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        etag = f'"{self.body}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {"ETag": etag})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(str(tmp_path), max_age_days=1, max_entries=3)
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def test_not_modified_reuses_stored_body_and_parse(cache, server):
+    parses = []
+    parse = lambda body: parses.append(body) or body.upper()
+
+    first = cache.fetch(URL, parse=parse, session=server, parse_version="1")
+    second = cache.fetch(URL, parse=parse, session=server, parse_version="1")
+    assert not first.not_modified and second.not_modified
+    assert second.text == "<p>v1</p>" and second.parsed == "<P>V1</P>"
+    assert server.requests[1] == {"If-None-Match": '"<p>v1</p>"'}
+    assert parses == ["<p>v1</p>"]
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_parse_version_change_reparses_stored_body(cache, server):
+    cache.fetch(URL, parse=lambda body: "old", session=server, parse_version="1")
+    res = cache.fetch(URL, parse=lambda body: "new", session=server, parse_version="2")
+    assert res.not_modified and res.parsed == "new"
+    # The new result is stored, so the next 304 reuses it
+    assert cache.fetch(URL, parse=lambda body: "again", session=server, parse_version="2").parsed == "new"
+
+
+def test_deferred_save_is_only_stored_on_commit(cache, server):
+    res = cache.fetch(URL, session=server, defer_save=True)
+    assert cache.load(URL) is None
+    assert not cache.fetch(URL, session=server, defer_save=True).not_modified
+
+    res.commit()
+    assert cache.fetch(URL, session=server).not_modified
+
+
+def test_expired_entries_are_downloaded_again(cache, server):
+    cache.fetch(URL, session=server)
+    stale = time.time() - 2 * 86400
+    os.utime(cache._path(URL), (stale, stale))
+    assert not cache.fetch(URL, session=server).not_modified
+    assert "If-None-Match" not in server.requests[-1]
+
+
+def test_not_modified_restarts_the_entry_age(cache, server):
+    cache.fetch(URL, session=server)
+    old = time.time() - 3600
+    os.utime(cache._path(URL), (old, old))
+    cache.fetch(URL, session=server)
+    assert time.time() - os.path.getmtime(cache._path(URL)) < 60
+
+
+def test_prune_drops_expired_then_oldest(cache, monkeypatch):
+    monkeypatch.setattr(http_cache_module, "PRUNE_EVERY", 10_000)
+    now = time.time()
+    for i in range(5):
+        url = f"{URL}/{i}"
+        cache.save(url, {"etag": str(i)}, "body")
+        os.utime(cache._path(url), (now - i * 60, now - i * 60))
+    expired = now - 2 * 86400
+    os.utime(cache._path(f"{URL}/4"), (expired, expired))
+
+    # /4 has expired; of the other four, the oldest (/3) goes to keep max_entries=3
+    assert cache.prune() == 2
+    assert [cache.load(f"{URL}/{i}") is not None for i in range(5)] == [True, True, True, False, False]
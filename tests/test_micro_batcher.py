@@ -0,0 +1,151 @@
+"""MicroBatcher driven the way the API uses it: concurrent callers on an asyncio loop."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.micro_batcher import MicroBatcher
+
+
+class Recorder:
+    """Batch function that records each batch it is given."""
+
+    def __init__(self, delay=0.0, fail=None):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        time.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        return [item if isinstance(item, Exception) else f"{item}!" for item in items]
+
+
+def submit_all(batcher, items, stagger=0.0):
+    """Submit every item from its own thread, like concurrent requests do; returns results or exceptions."""
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=len(items) or 1))
+        calls = []
+        for item in items:
+            calls.append(asyncio.to_thread(batcher.submit, item, 5))
+            await asyncio.sleep(stagger)
+        return await asyncio.gather(*calls, return_exceptions=True)
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(process, **kwargs):
+        batcher = MicroBatcher("test", process, **kwargs)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.close()
+
+
+def test_full_batches_go_without_waiting(make_batcher):
+    gate = threading.Event()
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        if items == ["first"]:
+            gate.wait(5)  # hold the worker so the next calls queue up behind it
+        return [f"{item}!" for item in items]
+
+    batcher = make_batcher(process, max_batch_size=4, max_wait_ms=2000)
+    first = threading.Thread(target=batcher.submit, args=("first", 5))
+    first.start()
+    while not batches:
+        time.sleep(0.001)
+    threading.Timer(0.1, gate.set).start()
+
+    started = time.perf_counter()
+    results = submit_all(batcher, list(range(8)))
+    first.join(5)
+    assert time.perf_counter() - started < 1  # never waited out max_wait_ms
+    assert [len(batch) for batch in batches[1:]] == [4, 4]
+    assert sorted(item for batch in batches[1:] for item in batch) == list(range(8))
+    assert results == [f"{i}!" for i in range(8)]
+
+
+def test_partial_batch_waits_at_most_max_wait(make_batcher):
+    process = Recorder()
+    batcher = make_batcher(process, max_batch_size=100, max_wait_ms=100)
+    started = time.perf_counter()
+    assert submit_all(batcher, ["a", "b", "c"]) == ["a!", "b!", "c!"]
+    elapsed = time.perf_counter() - started
+    assert process.batches == [["a", "b", "c"]]
+    assert 0.09 <= elapsed < 0.5
+
+
+def test_each_caller_gets_its_own_result(make_batcher):
+    process = Recorder(delay=0.01)
+    batcher = make_batcher(process, max_batch_size=5, max_wait_ms=20)
+    items = [f"text-{i}" for i in range(20)]
+    results = submit_all(batcher, items, stagger=0.002)
+    assert results == [f"{item}!" for item in items]
+    assert sum(len(batch) for batch in process.batches) == 20
+    assert batcher.stats()["items"] == 20
+
+
+def test_exception_result_reaches_only_its_caller(make_batcher):
+    batcher = make_batcher(Recorder(), max_batch_size=10, max_wait_ms=50)
+    error = ValueError("bad item")
+    results = submit_all(batcher, ["a", error, "c"])
+    assert results[0] == "a!" and results[2] == "c!"
+    assert results[1] is error
+
+
+def test_batch_failure_reaches_every_waiter(make_batcher):
+    process = Recorder(fail=RuntimeError("model crashed"))
+    batcher = make_batcher(process, max_batch_size=10, max_wait_ms=50)
+    results = submit_all(batcher, ["a", "b", "c"])
+    assert len(process.batches) == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == "model crashed" for result in results)
+
+
+def test_wrong_result_count_fails_the_batch(make_batcher):
+    batcher = make_batcher(lambda items: items[:1], max_batch_size=10, max_wait_ms=50)
+    results = submit_all(batcher, ["a", "b"])
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_close_finishes_pending_items(make_batcher):
+    process = Recorder(delay=0.05)
+    batcher = make_batcher(process, max_batch_size=2, max_wait_ms=10)
+    results = {}
+
+    def call(item):
+        results[item] = batcher.submit(item, timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.02)  # first batch in flight, the rest still queued
+    batcher.close()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {i: f"{i}!" for i in range(6)}
+    assert batcher._thread is None
+    # A later call starts a new worker
+    assert batcher.submit("late", timeout=5) == "late!"
+
+
+def test_repeated_close_stops_cleanly(make_batcher):
+    batcher = make_batcher(Recorder(), max_batch_size=2, max_wait_ms=10)
+    assert batcher.submit("a", timeout=5) == "a!"
+    batcher.close(timeout=1)
+    batcher.close(timeout=1)
+    assert batcher._thread is None
+    assert batcher.submit("b", timeout=5) == "b!"
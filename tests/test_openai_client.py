@@ -0,0 +1,146 @@
+"""OpenAI client and summarizer fallbacks against the local stand-in API (benchmarks/openai_stub.py)."""
+import time
+import asyncio
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+import utils.summarizer as summarizer
+from benchmarks.openai_stub import OpenAIStub
+from utils.openai_client import OpenAIClient, OpenAIError
+import utils.summary_router as summary_router
+from utils.summary_router import SummaryUnavailable, breakers, route_summary
+
+ARTICLE = ("The company unveiled a new processor on Tuesday. It is built on a smaller process node. "
+           "Analysts expect shipments to begin next quarter. ") * 3
+MESSAGES = [{"role": "user", "content": "Summarize the following news article:\n\n" + ARTICLE}]
+
+
+@pytest.fixture
+def stub():
+    with OpenAIStub(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def client(stub):
+    client = OpenAIClient(api_key="test", base_url=stub.base_url, max_concurrency=2, timeout=5,
+                          max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    yield client
+    client.close()
+
+
+def test_complete_returns_reply(client):
+    assert client.complete(MESSAGES) == "The company unveiled a new processor on Tuesday. It is built on a smaller process node."
+
+
+def test_concurrency_is_capped(stub, client):
+    stub.latency_ms = 50
+    futures = [client.submit(MESSAGES) for _ in range(10)]
+    wait(futures)
+    assert all(future.exception() is None for future in futures)
+    assert stub.max_in_flight == 2
+
+
+def test_rate_limits_are_retried(stub, client):
+    stub.rate_limit_rate = 0.3
+    client.max_retries = 10  # the seeded stub never rate-limits that many times in a row
+    assert all(client.complete(MESSAGES) for _ in range(10))
+    assert stub.status_counts.get(429, 0) > 0
+    assert client.counts["retries"] == stub.status_counts[429]
+
+
+def test_persistent_errors_raise_structured_error(stub, client):
+    stub.error_rate = 1.0
+    with pytest.raises(OpenAIError) as info:
+        client.complete(MESSAGES)
+    assert info.value.status == 500
+    assert info.value.retryable
+    assert info.value.attempts == 4
+
+
+@pytest.fixture
+def openai_summarizer(monkeypatch, stub, client):
+    """Summarizer wired to the stub, without the summary cache; the local model fails."""
+    def broken_model(name):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(summarizer, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(summarizer, "USE_OPENAI", True)
+    monkeypatch.setattr(summarizer, "get_openai_client", lambda: client)
+    monkeypatch.setattr(summarizer, "get_summary_cache", lambda: None)
+    monkeypatch.setattr(summarizer.registry, "get", broken_model)
+    for breaker in breakers.values():
+        breaker.reset()
+    return stub
+
+
+def test_summarize_article_uses_openai(openai_summarizer):
+    assert summarizer.summarize_article(ARTICLE).startswith("The company unveiled")
+
+
+def test_failed_fallback_raises_instead_of_returning_text(openai_summarizer):
+    openai_summarizer.error_rate = 1.0
+    with pytest.raises(summarizer.SummarizationError):
+        summarizer.summarize_article(ARTICLE)
+    results = summarizer.summarize_articles([ARTICLE, "too short"])
+    assert isinstance(results[0], summarizer.SummarizationError)
+    assert results[1] == summarizer.TOO_SHORT_MESSAGE
+
+
+def test_router_reports_unavailable_when_both_backends_fail(openai_summarizer):
+    openai_summarizer.error_rate = 1.0
+    with pytest.raises(SummaryUnavailable):
+        asyncio.run(route_summary(ARTICLE, deadline_ms=5000, hedge_ms=0))
+
+
+def slow_local(text):
+    time.sleep(0.2)
+    return "local summary"
+
+
+def test_lost_race_counts_against_openai(openai_summarizer):
+    openai_summarizer.latency_ms = 1000
+    result = asyncio.run(route_summary(ARTICLE, deadline_ms=5000, hedge_ms=50, local=slow_local))
+    assert (result["backend"], result["hedged"]) == ("hf", True)
+    assert breakers["openai"].failures == 1
+
+
+def test_hedges_are_capped(monkeypatch, openai_summarizer):
+    monkeypatch.setattr(summary_router, "_hedge_slots", threading.BoundedSemaphore(1))
+    openai_summarizer.latency_ms = 600
+
+    async def three_requests():
+        return await asyncio.gather(*(route_summary(ARTICLE, deadline_ms=5000, hedge_ms=50, local=slow_local)
+                                      for _ in range(3)))
+
+    backends = sorted(result["backend"] for result in asyncio.run(three_requests()))
+    assert backends == ["hf", "openai", "openai"]
+
+
+def test_lost_hedge_still_reports_to_the_local_breaker(openai_summarizer):
+    def failing_local(text):
+        time.sleep(0.3)
+        raise summarizer.SummarizationError("model crashed")
+
+    openai_summarizer.latency_ms = 100
+    result = asyncio.run(route_summary(ARTICLE, deadline_ms=5000, hedge_ms=20, local=failing_local))
+    assert (result["backend"], result["hedged"]) == ("openai", True)
+    time.sleep(0.4)  # the hedge can't be cancelled; it reports when it finishes
+    assert breakers["hf"].failures == 1
+
+
+def test_skipped_hedge_leaves_the_half_open_trial(monkeypatch, openai_summarizer):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()  # every hedge slot busy
+    monkeypatch.setattr(summary_router, "_hedge_slots", slots)
+    hf = breakers["hf"]
+    for _ in range(hf.failure_threshold):
+        hf.record_failure()
+    hf.opened_at -= hf.reset_seconds  # due for its half-open trial
+
+    openai_summarizer.latency_ms = 200
+    result = asyncio.run(route_summary(ARTICLE, deadline_ms=5000, hedge_ms=20, local=slow_local))
+    assert result["backend"] == "openai"
+    assert hf.allow()  # the trial was not handed to the skipped hedge
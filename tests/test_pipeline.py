@@ -0,0 +1,120 @@
+"""Stage DAG runner: dependency order, concurrency, failure propagation and cancellation."""
+import asyncio
+import time
+
+import pytest
+
+from utils.pipeline import Stage, StageFailed, in_thread, run_pipeline
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_stages_get_upstream_results_and_independent_ones_overlap():
+    events = []
+
+    def step(name, seconds, result):
+        async def body(**inputs):
+            events.append(("start", name))
+            await asyncio.sleep(seconds)
+            events.append(("end", name))
+            return result(**inputs)
+        return body
+
+    started = time.perf_counter()
+    results, timings = run(run_pipeline([
+        # Listed out of order on purpose
+        Stage("join", step("join", 0, lambda left, right: left + right), after=("left", "right")),
+        Stage("left", step("left", 0.2, lambda source: source + "L"), after=("source",)),
+        Stage("right", step("right", 0.2, lambda source: source + "R"), after=("source",)),
+        Stage("source", step("source", 0, lambda: "s")),
+    ]))
+    elapsed = time.perf_counter() - started
+
+    assert results == {"source": "s", "left": "sL", "right": "sR", "join": "sLsR"}
+    assert set(timings) == set(results)
+    position = {event: i for i, event in enumerate(events)}
+    assert position[("end", "source")] < position[("start", "left")]
+    assert position[("end", "source")] < position[("start", "right")]
+    assert position[("start", "join")] > max(position[("end", "left")], position[("end", "right")])
+    assert elapsed < 0.35  # left and right ran side by side, not one after the other
+
+
+def test_in_thread_adapter_receives_the_upstream_result():
+    results, _ = run(run_pipeline([
+        Stage("scrape", in_thread(lambda: "some text")),
+        Stage("words", lambda scrape: in_thread(str.split)(scrape), after=("scrape",)),
+    ]))
+    assert results["words"] == ["some", "text"]
+
+
+def test_failure_is_named_and_downstream_stages_never_run():
+    ran = []
+
+    async def broken():
+        raise KeyError("boom")
+
+    async def downstream(scrape):
+        ran.append("downstream")
+
+    with pytest.raises(StageFailed) as info:
+        run(run_pipeline([
+            Stage("scrape", broken),
+            Stage("summary", downstream, after=("scrape",)),
+            Stage("storage", downstream, after=("summary",)),
+        ]))
+    assert info.value.stage == "scrape"
+    assert isinstance(info.value.__cause__, KeyError)
+    assert ran == []
+
+
+def test_failure_cancels_running_siblings():
+    finished = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            finished.append("cancelled")
+            raise
+        finished.append("completed")
+
+    async def broken():
+        await asyncio.sleep(0.05)
+        raise ValueError("bad page")
+
+    started = time.perf_counter()
+    with pytest.raises(StageFailed) as info:
+        run(run_pipeline([Stage("slow", slow), Stage("broken", broken)]))
+    assert info.value.stage == "broken"
+    assert finished == ["cancelled"]
+    assert time.perf_counter() - started < 1
+
+
+def test_cancelling_the_caller_cancels_every_stage():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(run_pipeline([Stage("a", slow), Stage("b", slow)]), timeout=0.05)
+
+    run(main())
+    assert cancelled == ["slow", "slow"]
+
+
+def test_unknown_dependencies_and_cycles_are_rejected():
+    async def noop(**_):
+        return None
+
+    with pytest.raises(ValueError, match="unknown"):
+        run(run_pipeline([Stage("a", noop, after=("missing",))]))
+    with pytest.raises(ValueError, match="cycle"):
+        run(run_pipeline([Stage("a", noop, after=("b",)), Stage("b", noop, after=("a",))]))
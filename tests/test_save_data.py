@@ -0,0 +1,46 @@
+"""Article storage on databases created before URLs were unique."""
+import sqlite3
+
+import pytest
+
+import utils.save_data as save_data
+from utils.dedupe_urls import dedupe_urls
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """An articles table without the UNIQUE constraint, holding one URL twice."""
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, url TEXT, "
+                     "summary TEXT, source TEXT, date_published TEXT)")
+        conn.executemany("INSERT INTO articles (title, url) VALUES (?, ?)",
+                         [("first", "http://a"), ("again", "http://a"), ("other", "http://b")])
+    conn.close()
+    monkeypatch.setattr(save_data, "DB_PATH", path)
+    return path
+
+
+def rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT title, url FROM articles ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_save_keeps_stored_duplicates_and_skips_known_urls(legacy_db):
+    inserted = save_data.save_articles([{"title": "a3", "link": "http://a"}, {"title": "c", "link": "http://c"},
+                                        {"title": "c2", "link": "http://c"}])
+    assert inserted == 1
+    assert rows(legacy_db) == [("first", "http://a"), ("again", "http://a"), ("other", "http://b"), ("c", "http://c")]
+
+
+def test_dedupe_reports_before_it_deletes(legacy_db):
+    assert dedupe_urls(legacy_db) == {"duplicates": 1, "urls": 1, "removed": 0}
+    assert len(rows(legacy_db)) == 3
+
+    assert dedupe_urls(legacy_db, apply=True)["removed"] == 1
+    assert rows(legacy_db) == [("first", "http://a"), ("other", "http://b")]
+    assert save_data.save_articles([{"title": "a2", "link": "http://a"}, {"title": "d", "link": "http://d"}]) == 1
@@ -0,0 +1,71 @@
+"""Feed polling: cache validators are only stored for feeds whose articles were kept."""
+import time
+
+import pytest
+
+import utils.http_cache as http_cache_module
+import utils.scheduler as scheduler
+from utils.http_cache import HTTPCache
+
+FEED = "http://example.test/feed"
+RSS = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>One</title><link>http://example.test/1</link><guid>1</guid><description>First story</description></item>
+</channel></rss>"""
+
+
+class FeedServer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def get(self, url, headers=None, timeout=None):
+        time.sleep(self.delay)
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return FakeResponse(304, "")
+        return FakeResponse(200, RSS)
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = {"ETag": '"v1"'}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = HTTPCache(str(tmp_path))
+    monkeypatch.setattr(scheduler, "http_cache", cache)
+    return cache
+
+
+def serve(monkeypatch, server):
+    monkeypatch.setattr(http_cache_module.requests, "get", server.get)
+
+
+def test_validators_wait_for_commit(cache, monkeypatch):
+    serve(monkeypatch, FeedServer())
+    pending = []
+    articles, stats = scheduler.fetch_feeds([FEED], skip_seen=False, pending_commits=pending)
+    assert [a["link"] for a in articles] == ["http://example.test/1"]
+
+    # The tick never committed, so the entries are downloaded again rather than 304'd away
+    articles, stats = scheduler.fetch_feeds([FEED], skip_seen=False, pending_commits=[])
+    assert stats[FEED]["status"] == "ok" and len(articles) == 1
+
+    for commit in pending:
+        commit()
+    articles, stats = scheduler.fetch_feeds([FEED], skip_seen=False)
+    assert stats[FEED]["status"] == "unchanged" and articles == []
+
+
+def test_timed_out_feed_stores_nothing(cache, monkeypatch):
+    serve(monkeypatch, FeedServer(delay=0.3))
+    _, stats = scheduler.fetch_feeds([FEED], skip_seen=False, deadline=0.05)
+    assert stats[FEED]["status"] == "timeout"
+    time.sleep(0.5)  # the abandoned worker thread finishes in the background
+    assert cache.load(FEED) is None
@@ -0,0 +1,37 @@
+"""Two-tier summary cache shared by several processes (two instances on one file stand in for them)."""
+import time
+
+from utils.summary_cache import SummaryCache, cache_key
+
+TEXT = "A new processor was unveiled on Tuesday."
+KEY = cache_key(TEXT, "hf", "bart")
+
+
+def test_invalidation_reaches_another_instance(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a = SummaryCache(path, sync_seconds=0)
+    worker_b = SummaryCache(path, sync_seconds=0)
+    worker_a.put(KEY, "summary", TEXT, "hf", "bart")
+    assert worker_b.get(KEY) == "summary"  # now in worker_b's memory tier
+
+    assert worker_a.invalidate(TEXT) == 1
+    assert worker_b.get(KEY) is None
+    assert worker_b.stats()["memory_entries"] == 0
+
+
+def test_memory_hits_skip_the_generation_check_until_it_is_due(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    worker_a = SummaryCache(path, sync_seconds=0)
+    worker_b = SummaryCache(path, sync_seconds=0.2)
+    worker_a.put(KEY, "summary", TEXT, "hf", "bart")
+    assert worker_b.get(KEY) == "summary"
+    worker_a.invalidate()
+
+    queries = []
+    conn = worker_b._conn()
+    monkeypatch.setattr(worker_b, "_conn", lambda: queries.append(1) or conn)
+    assert worker_b.get(KEY) == "summary"  # stale for at most sync_seconds
+    assert queries == []
+
+    time.sleep(0.25)
+    assert worker_b.get(KEY) is None
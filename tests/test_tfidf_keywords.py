@@ -0,0 +1,45 @@
+from utils.tfidf_keywords import KeywordIndex
+
+NEWS = [
+    "Apple announced a faster chip for laptops and phones.",
+    "Apple reported record revenue from phones this quarter.",
+    "Regulators questioned Apple about app store fees.",
+]
+
+
+def test_reader_sees_another_writers_flush(tmp_path):
+    path = str(tmp_path / "keyword_df.db")
+    writer = KeywordIndex(path)
+    reader = KeywordIndex(path, refresh_seconds=0)
+    assert reader.documents == 0
+
+    writer.add_documents(NEWS, keys=[f"https://example.com/{i}" for i in range(len(NEWS))])
+    writer.flush()
+    reader.keywords("Apple chip news")
+    assert reader.documents == 3
+    assert reader.df["apple"] == 3
+
+
+def test_concurrent_writers_add_up(tmp_path):
+    path = str(tmp_path / "keyword_df.db")
+    first, second = KeywordIndex(path, refresh_seconds=0), KeywordIndex(path, refresh_seconds=0)
+    first.add_documents(NEWS[:2])
+    second.add_documents(NEWS[2:])
+    first.flush()
+    second.flush()
+    # Each keeps its own unflushed view until it notices the other's write
+    assert first.refresh() and second.refresh()
+    assert first.documents == second.documents == 3
+    assert first.df == second.df
+
+
+def test_refresh_keeps_unflushed_counts(tmp_path):
+    path = str(tmp_path / "keyword_df.db")
+    writer, local = KeywordIndex(path), KeywordIndex(path, refresh_seconds=0)
+    local.add_documents(NEWS[:1])
+    writer.add_documents(NEWS[1:])
+    writer.flush()
+    assert local.refresh()
+    assert local.documents == 3
+    local.flush()
+    assert KeywordIndex(path).documents == 3
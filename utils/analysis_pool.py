@@ -0,0 +1,200 @@
+import os
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from utils.bias_detection import analyze_bias
+from utils.credibility import score_credibility
+from utils.document import AnalyzedDocument
+from utils.keywords import extract_with_rake
+from utils.lexicon_sentiment import polarity_batch
+from utils.sentiment import analyze_sentiment
+
+# === CONFIGURATION ===
+ANALYSIS_POOL_ENABLED = os.getenv("ANALYSIS_POOL_ENABLED", "true").lower() == "true"
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# Single texts up to this size are scored in the calling process even once the workers are warm.
+# 0 (default) sends every text to the workers then, so API handlers scale across cores.
+ANALYSIS_INLINE_MAX_CHARS = int(os.getenv("ANALYSIS_INLINE_MAX_CHARS", "0"))
+ANALYSIS_MAX_TASKS_PER_CHILD = int(os.getenv("ANALYSIS_MAX_TASKS_PER_CHILD", "1000")) or None  # 0 = never recycle
+ANALYSIS_CHUNK_SIZE = 16  # texts per inter-process round trip in map()
+
+logger = logging.getLogger("analysis_pool")
+
+# Pure-Python, GIL-bound analyzers that are worth running in other processes
+TASKS: Dict[str, Callable[[str], Any]] = {
+    "sentiment": analyze_sentiment,
+    "bias": analyze_bias,
+    "credibility": score_credibility,
+    "rake": extract_with_rake,
+}
+
+
+def _warm_worker() -> None:
+    """Runs once in each worker: pay lexicon / NLTK start-up before the first real task."""
+    try:
+        analyze_sentiment("warm up " * 10)
+        analyze_bias("warm up " * 30)
+        extract_with_rake("warm up")
+    except Exception as e:
+        logging.getLogger("analysis_pool").warning(f"Worker warm-up failed: {e}")
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _run_task(task: str, text: str) -> Any:
+    return TASKS[task](text)
+
+
+def _run_chunk(task: str, texts: List[str]) -> List[Any]:
+    analyzer = TASKS[task]
+    return [analyzer(text) for text in texts]
+
+
+def _run_all(tasks: Sequence[str], texts: List[str]) -> List[Dict[str, Any]]:
+    # One AnalyzedDocument per text: tokens, cleaned text and polarity are shared by the tasks
+    docs = [AnalyzedDocument(text) for text in texts]
+    # Polarity for the whole chunk in one batch: sentiment scores the text, bias its cleaned copy
+    if "sentiment" in tasks:
+        for doc, value in zip(docs, polarity_batch([doc.text for doc in docs]).tolist()):
+            doc.polarity = value
+    if "bias" in tasks:
+        for doc, value in zip(docs, polarity_batch([doc.cleaned for doc in docs]).tolist()):
+            doc.cleaned_polarity = value
+    return [{task: TASKS[task](doc.normalized if task == "rake" else doc) for task in tasks} for doc in docs]
+
+
+class AnalysisPool:
+    """
+    Process pool for the CPU-bound analyzers in TASKS.
+
+    Workers are started on first use (or start()) and warm up in the
+    background, are recycled after `max_tasks_per_child` tasks to bound
+    memory growth, and shut down gracefully at exit. Single texts are scored
+    in the calling process only while the workers are still warming up, or
+    when no longer than `inline_max_chars` (0 by default, i.e. never). With
+    `workers=0` (or ANALYSIS_POOL_ENABLED=false via get_analysis_pool)
+    everything runs there.
+    """
+
+    def __init__(self, workers: int = ANALYSIS_WORKERS, max_tasks_per_child: Optional[int] = ANALYSIS_MAX_TASKS_PER_CHILD,
+                 inline_max_chars: int = ANALYSIS_INLINE_MAX_CHARS):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.inline_max_chars = inline_max_chars
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, block: bool = False) -> "AnalysisPool":
+        """Spawn the workers without waiting for them to warm up, unless `block`."""
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                # Worker recycling needs a non-fork start method; spawn also keeps
+                # parent state (models, sockets, locks) out of the workers
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+                self._ready.clear()
+                # Workers are spawned on demand; one concurrent ping each brings them all up
+                pings = [self._executor.submit(_ready) for _ in range(self.workers)]
+                threading.Thread(target=self._mark_ready, args=(pings,), name="analysis-pool-warmup", daemon=True).start()
+            executor = self._executor
+        if block and executor is not None:
+            self._ready.wait()
+        return self
+
+    def _mark_ready(self, pings: List[Future]) -> None:
+        # Texts are scored here until the workers are up, so warm this process too
+        _warm_worker()
+        wait(pings)
+        self._ready.set()
+        logger.info(f"Analysis pool ready: {self.workers} workers")
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def runs_inline(self, text: str) -> bool:
+        """Whether submit() would score `text` in the calling process."""
+        return self._executor is None or not self._ready.is_set() or len(text or "") <= self.inline_max_chars
+
+    def submit(self, task: str, text: str) -> Future:
+        if task not in TASKS:
+            raise KeyError(f"Unknown analysis task '{task}'")
+        executor = self.start()._executor
+        if executor is None or self.runs_inline(text):
+            future: Future = Future()
+            try:
+                future.set_result(TASKS[task](text))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return executor.submit(_run_task, task, text)
+
+    def run(self, task: str, text: str, timeout: Optional[float] = None) -> Any:
+        """Run one analyzer on one text and wait for the result."""
+        return self.submit(task, text).result(timeout=timeout)
+
+    def map(self, task: str, texts: Iterable[str], chunk_size: int = ANALYSIS_CHUNK_SIZE) -> List[Any]:
+        """Run one analyzer over many texts, `chunk_size` texts per worker round trip."""
+        texts = list(texts)
+        if task not in TASKS:
+            raise KeyError(f"Unknown analysis task '{task}'")
+        self.start()
+        if self._executor is None:
+            return _run_chunk(task, texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        futures = [self._executor.submit(_run_chunk, task, chunk) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+    def analyze_many(self, texts: Iterable[str], tasks: Sequence[str] = ("sentiment", "bias", "credibility"),
+                     chunk_size: int = ANALYSIS_CHUNK_SIZE) -> List[Dict[str, Any]]:
+        """Several analyzers per text in one round trip: [{task: result, ...}, ...] in input order."""
+        texts = list(texts)
+        unknown = [task for task in tasks if task not in TASKS]
+        if unknown:
+            raise KeyError(f"Unknown analysis tasks: {', '.join(unknown)}")
+        self.start()
+        if self._executor is None:
+            return _run_all(tasks, texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        futures = [self._executor.submit(_run_all, tuple(tasks), chunk) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """Stop the workers; by default let submitted tasks finish first."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            self._ready.clear()
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+            logger.info("Analysis pool stopped")
+
+    def __enter__(self) -> "AnalysisPool":
+        return self.start(block=True)
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+_pool: Optional[AnalysisPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_pool() -> AnalysisPool:
+    """Process-wide pool, started on first use (runs inline when ANALYSIS_POOL_ENABLED is false)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AnalysisPool(ANALYSIS_WORKERS if ANALYSIS_POOL_ENABLED else 0)
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -1,6 +1,9 @@
 import re
-from textblob import TextBlob
-from typing import Dict, Any
+from typing import Dict, Any, Union
+
+from utils.document import AnalyzedDocument, as_document
+from utils.lexicon_sentiment import polarity
+from utils.phrase_matcher import get_matcher, register_phrases
 
 # A set of phrases and words often associated with biased reporting
 BIAS_CUES = {
@@ -14,6 +17,10 @@ BIAS_CUES = {
     ]
 }
 
+# Compiled once; lists can be overridden via PHRASE_LISTS_PATH (see utils/phrase_matcher.py).
+# Case-sensitive like the original str.count: callers pass text that is already lowercased
+register_phrases("bias", BIAS_CUES, case_sensitive=True)
+
 def clean_text(text: str) -> str:
     """Clean and normalize article text for analysis"""
     text = re.sub(r"http\S+|www.\S+", "", text)
@@ -22,23 +29,17 @@ def clean_text(text: str) -> str:
 
 def count_bias_cues(text: str) -> int:
     """Count the presence of known biased cues in the text"""
-    cue_count = 0
-    for category in BIAS_CUES.values():
-        for phrase in category:
-            occurrences = text.count(phrase.lower())
-            cue_count += occurrences
-    return cue_count
+    return sum(get_matcher("bias").counts(text).values())
 
 def detect_sentiment_bias(text: str) -> float:
     """Estimate article polarity using sentiment (proxy for emotional framing)"""
-    blob = TextBlob(text)
-    return blob.sentiment.polarity  # -1 (negative) to +1 (positive)
+    return polarity(text)  # -1 (negative) to +1 (positive)
 
-def calculate_bias_score(text: str) -> float:
+def calculate_bias_score(text: Union[str, AnalyzedDocument]) -> float:
     """Combine cues and sentiment into a simple bias score"""
-    cleaned = clean_text(text)
-    cue_score = count_bias_cues(cleaned)
-    polarity_score = abs(detect_sentiment_bias(cleaned))
+    doc = as_document(text)
+    cue_score = count_bias_cues(doc.cleaned)
+    polarity_score = abs(doc.cleaned_polarity)
     
     # Weighted sum: cues + sentiment bias
     bias_score = (cue_score * 0.7) + (polarity_score * 10 * 0.3)
@@ -53,12 +54,13 @@ def label_bias(score: float) -> str:
     else:
         return "High Bias"
 
-def analyze_bias(text: str) -> Dict[str, Any]:
+def analyze_bias(text: Union[str, AnalyzedDocument]) -> Dict[str, Any]:
     """Main function to analyze bias in a news article"""
-    if not text or len(text.strip()) < 100:
+    doc = as_document(text)
+    if len(doc.text.strip()) < 100:
         return {"bias_score": 0.0, "bias_label": "Not enough text"}
 
-    score = calculate_bias_score(text)
+    score = calculate_bias_score(doc)
     label = label_bias(score)
 
     return {
@@ -0,0 +1,87 @@
+import time
+import threading
+from typing import Any, Dict, Optional
+
+# === CONFIGURATION ===
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures that open the circuit
+BREAKER_RESET_SECONDS = 30.0   # how long an open circuit skips the backend
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Tracks one backend's health so callers can skip it while it is failing.
+
+    `failure_threshold` consecutive failures open the circuit: allow() then
+    returns False for `reset_seconds`. After that one trial call is let
+    through (half-open); its success closes the circuit, its failure opens
+    it again for another `reset_seconds`. Failures reported while open come
+    from calls started earlier; they are counted but don't restart the wait.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started: Optional[float] = None
+        self.counts = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go to the backend now. In half-open state only one
+        caller gets True, unless that trial has not reported back within
+        `reset_seconds` (e.g. it was abandoned), in which case another may try.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._trial_running = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and (not self._trial_running or now - self.trial_started >= self.reset_seconds):
+                self._trial_running = True
+                self.trial_started = now
+                return True
+            self.counts["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.counts["successes"] += 1
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.counts["failures"] += 1
+            if self.state == OPEN:
+                return  # a call started before the circuit opened; don't push recovery back
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counts["opened"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._trial_running = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at)), 1)
+            return {"state": self.state, "consecutive_failures": self.failures, "retry_in_seconds": retry_in, **self.counts}
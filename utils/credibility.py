@@ -1,45 +1,86 @@
 import re
 import string
-from collections import Counter
+from typing import Sequence, Tuple, Union
 
-def score_credibility(text: str) -> float:
-    """
-    Heuristic-based credibility scoring of an article.
-    Returns a score between 0 (low credibility) and 1 (high credibility).
-    """
+import numpy as np
+
+from utils.document import AnalyzedDocument, as_document
+from utils.phrase_matcher import get_matcher, register_phrases
+
+CLICKBAIT_PHRASES = [
+    "you won't believe", "shocking", "top secret", "exposed", "miracle",
+    "will blow your mind", "never seen before", "what happens next"
+]
+SOURCE_PHRASES = ["according to", "source:"]
+
+# Compiled once; lists can be overridden via PHRASE_LISTS_PATH (see utils/phrase_matcher.py)
+register_phrases("credibility", {"clickbait": CLICKBAIT_PHRASES, "sources": SOURCE_PHRASES})
+
+# Feature columns produced by credibility_features, in order
+FEATURES = ("word_count", "has_source", "clickbait", "exclamations", "excessive_punct", "repetition")
+IDEAL_LENGTH = 300  # words
+WEIGHTS = {"length": 0.4, "source": 0.2, "penalty": 0.4}
+
+def credibility_features(text: Union[str, AnalyzedDocument]) -> Tuple[int, int, int, int, int, int]:
+    """The heuristic's raw counts for one article, in FEATURES order."""
+    doc = as_document(text)
 
     # Lowercase and remove extra whitespace
-    text = text.lower().strip()
+    text = doc.lower
 
-    # 1. Check for clickbait phrases
-    clickbait_phrases = [
-        "you won't believe", "shocking", "top secret", "exposed", "miracle",
-        "will blow your mind", "never seen before", "what happens next"
-    ]
-    clickbait_score = sum(phrase in text for phrase in clickbait_phrases)
+    # 1. Check for clickbait phrases (and, for step 4, sources) in one matcher call
+    phrases_found = get_matcher("credibility").distinct_counts(text)
+    clickbait_score = phrases_found["clickbait"]
 
     # 2. Count excessive punctuation (e.g., multiple exclamations)
     exclamations = text.count("!") + text.count("!!!")
     excessive_punct = len(re.findall(r"[!?]{2,}", text))
 
     # 3. Analyze word repetition (spammy feel)
-    words = re.findall(r'\w+', text)
-    word_freq = Counter(words)
-    top_repeated = word_freq.most_common(3)
+    top_repeated = doc.word_counts.most_common(3)
     repetition_score = sum(freq for word, freq in top_repeated if freq > 5)
 
     # 4. Presence of sources or citations
-    has_source = "according to" in text or "source:" in text
+    has_source = phrases_found["sources"] > 0
+
+    return len(doc.tokens), int(has_source), clickbait_score, exclamations, excessive_punct, repetition_score
 
-    # 5. Article length check
-    length_score = min(len(words) / 300, 1.0)  # Normalized score (ideal length ≥ 300 words)
+def combine_features(features: np.ndarray) -> np.ndarray:
+    """Vectorized weighting of an (n, len(FEATURES)) feature matrix into n scores in [0, 1]."""
+    features = np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURES))
+    word_count, has_source = features[:, 0], features[:, 1]
+    penalties = features[:, 2:].sum(axis=1)
+
+    # 5. Article length check: normalized score (ideal length >= IDEAL_LENGTH words)
+    length_score = np.minimum(word_count / IDEAL_LENGTH, 1.0)
 
     # --- Final credibility calculation ---
     raw_score = (
-        length_score * 0.4 +
-        int(has_source) * 0.2 +
-        (1 / (1 + clickbait_score + exclamations + excessive_punct + repetition_score)) * 0.4
+        length_score * WEIGHTS["length"] +
+        has_source * WEIGHTS["source"] +
+        (1 / (1 + penalties)) * WEIGHTS["penalty"]
     )
 
-    # Clamp score to [0, 1]
-    return round(min(max(raw_score, 0.0), 1.0), 2)
+    # Clamp score to [0, 1]; Python's round, since np.round differs on ties such as 0.325
+    return np.array([round(score, 2) for score in np.clip(raw_score, 0.0, 1.0).tolist()], dtype=np.float64)
+
+def score_credibility(text: Union[str, AnalyzedDocument]) -> float:
+    """
+    Heuristic-based credibility scoring of an article.
+    Returns a score between 0 (low credibility) and 1 (high credibility).
+    """
+    return float(combine_features(np.array(credibility_features(text)))[0])
+
+def score_credibility_batch(texts: Sequence[Union[str, AnalyzedDocument]]) -> np.ndarray:
+    """
+    score_credibility for many texts: features are collected into one NumPy
+    matrix and weighted in a single vectorized step. Returns a float array.
+    """
+    if not len(texts):
+        return np.zeros(0)
+    features = np.fromiter(
+        (value for text in texts for value in credibility_features(text or "")),
+        dtype=np.float64,
+        count=len(texts) * len(FEATURES),
+    )
+    return combine_features(features)
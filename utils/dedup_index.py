@@ -0,0 +1,178 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import faiss  # optional: approximate nearest-neighbour search for large histories
+except ImportError:
+    faiss = None
+
+from utils.seen_index import normalize_key
+
+# === CONFIGURATION ===
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", os.path.join(PROJECT_ROOT, "data", "dedup_index.db"))
+DEDUP_INDEX_SIZE = int(os.getenv("DEDUP_INDEX_SIZE", "50000"))  # most recent articles kept
+DEDUP_INDEX_ENABLED = os.getenv("DEDUP_INDEX_ENABLED", "true").lower() == "true"
+DEDUP_USE_ANN = os.getenv("DEDUP_USE_ANN", "auto").lower()  # "auto" | "true" | "false"
+DEDUP_BLOCK_SIZE = int(os.getenv("DEDUP_BLOCK_SIZE", "1024"))
+HNSW_NEIGHBOURS = 32
+HNSW_SEARCH_DEPTH = 64
+
+logger = logging.getLogger("dedup_index")
+
+
+def best_matches(queries: np.ndarray, corpus: np.ndarray, block_size: int = DEDUP_BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact nearest neighbour by inner product, one corpus block at a time so
+    the similarity matrix never exceeds len(queries) x block_size.
+    Returns (best corpus index, best similarity) per query row.
+    """
+    best_index = np.full(len(queries), -1, dtype=np.int64)
+    best_score = np.full(len(queries), -np.inf, dtype=np.float32)
+    for start in range(0, len(corpus), block_size):
+        sims = queries @ corpus[start:start + block_size].T
+        index = sims.argmax(axis=1)
+        score = sims[np.arange(len(queries)), index]
+        better = score > best_score
+        best_index[better] = index[better] + start
+        best_score[better] = score[better]
+    return best_index, best_score
+
+
+class DuplicateIndex:
+    """
+    Persistent store of embeddings for articles already kept, so new
+    articles can be checked against history and not just the current batch.
+
+    Vectors live in SQLite and are loaded into one float32 matrix at start-up.
+    Search is an exact blockwise dot product, or a faiss HNSW index when faiss
+    is installed and DEDUP_USE_ANN allows it. Only the newest `max_entries`
+    articles are kept.
+    """
+
+    def __init__(self, path: str = DEDUP_INDEX_PATH, max_entries: int = DEDUP_INDEX_SIZE, use_ann: str = DEDUP_USE_ANN):
+        self.path = path
+        self.max_entries = max_entries
+        self.use_ann = faiss is not None and use_ann != "false"
+        if use_ann == "true" and faiss is None:
+            logger.warning("DEDUP_USE_ANN=true but faiss is not installed; using exact search")
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dedup_vectors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT UNIQUE,
+                vector BLOB,
+                added_at REAL
+            )
+        """)
+        self._conn.commit()
+        self._load()
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT key, vector FROM dedup_vectors ORDER BY id DESC LIMIT ?", (self.max_entries,)
+        ).fetchall()[::-1]
+        self._keys = [key for key, _ in rows]
+        self._matrix = (
+            np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+            if rows else np.zeros((0, 0), dtype=np.float32)
+        )
+        self._ann = None
+        if self.use_ann and rows:
+            self._build_ann()
+
+    def _build_ann(self) -> None:
+        self._ann = faiss.IndexHNSWFlat(self._matrix.shape[1], HNSW_NEIGHBOURS, faiss.METRIC_INNER_PRODUCT)
+        self._ann.hnsw.efSearch = HNSW_SEARCH_DEPTH
+        self._ann.add(self._matrix)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(self, embeddings: np.ndarray, threshold: float = 0.9) -> List[Tuple[int, str, float]]:
+        """For each query row whose closest stored article is >= threshold: (row, key, similarity)."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if not self._keys or not len(embeddings):
+                return []
+            if self._ann is not None:
+                scores, indices = self._ann.search(embeddings, 1)
+                best_index, best_score = indices[:, 0], scores[:, 0]
+            else:
+                best_index, best_score = best_matches(embeddings, self._matrix)
+            return [
+                (row, self._keys[best_index[row]], round(float(best_score[row]), 4))
+                for row in np.nonzero((best_score >= threshold) & (best_index >= 0))[0].tolist()
+            ]
+
+    def add(self, keys: Iterable[str], embeddings: np.ndarray) -> None:
+        """Remember articles (keyed by URL/GUID); existing keys are left unchanged."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        rows, vectors = [], []
+        with self._lock:
+            known = set(self._keys)
+            for key, vector in zip(keys, embeddings):
+                key = normalize_key(key)
+                if key in known:
+                    continue
+                known.add(key)
+                rows.append((key, vector.tobytes(), time.time()))
+                vectors.append(vector)
+            if not rows:
+                return
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO dedup_vectors (key, vector, added_at) VALUES (?, ?, ?)", rows)
+
+            new = np.stack(vectors)
+            self._keys.extend(key for key, _, _ in rows)
+            self._matrix = np.vstack([self._matrix, new]) if len(self._matrix) else new
+            if len(self._keys) > self.max_entries:
+                self._prune()
+            elif self._ann is not None:
+                self._ann.add(new)
+            elif self.use_ann:
+                self._build_ann()
+
+    def _prune(self) -> None:
+        # HNSW has no removal, so dropping the oldest entries rebuilds the ANN index
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM dedup_vectors WHERE id NOT IN (SELECT id FROM dedup_vectors ORDER BY id DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+        self._keys = self._keys[-self.max_entries:]
+        self._matrix = self._matrix[-self.max_entries:]
+        if self.use_ann:
+            self._build_ann()
+
+    def clear(self) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM dedup_vectors")
+            self._keys = []
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            self._ann = None
+
+
+_index: Optional[DuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> Optional[DuplicateIndex]:
+    """Process-wide DuplicateIndex opened on first use, or None when DEDUP_INDEX_ENABLED is false."""
+    global _index
+    if not DEDUP_INDEX_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = DuplicateIndex()
+        return _index
@@ -0,0 +1,67 @@
+"""
+One-off migration: remove stored articles whose URL repeats an earlier row,
+then add the unique index on articles(url) that save_articles relies on.
+
+Only the earliest row (lowest id) of each URL is kept. By default the job
+only reports what it would remove; pass --apply to delete and index.
+
+Usage:
+    python -m utils.dedupe_urls [--db techscope.db] [--apply]
+"""
+import os
+import sys
+import sqlite3
+import argparse
+from typing import Dict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.save_data import DB_PATH, URL_INDEX
+
+DUPLICATES = """
+    FROM articles
+    WHERE url IS NOT NULL
+      AND id NOT IN (SELECT MIN(id) FROM articles WHERE url IS NOT NULL GROUP BY url)
+"""
+
+
+def dedupe_urls(db_path: str = DB_PATH, apply: bool = False) -> Dict[str, int]:
+    """
+    Count (and with `apply`, delete) rows that repeat an earlier row's URL.
+    Returns {"duplicates", "urls", "removed"}.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles'").fetchone():
+            raise ValueError(f"No table 'articles' in {db_path}")
+        duplicates, urls = conn.execute(f"SELECT COUNT(*), COUNT(DISTINCT url) {DUPLICATES}").fetchone()
+        removed = 0
+        if apply:
+            with conn:
+                removed = conn.execute(f"DELETE {DUPLICATES}").rowcount
+                conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {URL_INDEX} ON articles (url)")
+        return {"duplicates": duplicates, "urls": urls, "removed": removed}
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--apply", action="store_true", help="delete the duplicates and create the index")
+    args = parser.parse_args()
+
+    try:
+        result = dedupe_urls(args.db, args.apply)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.apply:
+        print(f"Removed {result['removed']} duplicate rows of {result['urls']} URLs; {URL_INDEX} created")
+    else:
+        print(f"{result['duplicates']} duplicate rows of {result['urls']} URLs would be removed; rerun with --apply")
+
+
+if __name__ == "__main__":
+    main()
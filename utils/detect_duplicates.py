@@ -1,33 +1,61 @@
-from sentence_transformers import SentenceTransformer, util
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 
-# Load model once (MiniLM is fast & accurate for semantic similarity)
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from utils.dedup_index import DEDUP_BLOCK_SIZE, DuplicateIndex, get_duplicate_index
+from utils.embeddings import embedding_service
 
 def compute_embeddings(texts: List[str]) -> np.ndarray:
-    """Generate embeddings for a list of texts."""
-    return model.encode(texts, convert_to_tensor=True, normalize_embeddings=True)
+    """Generate normalized embeddings for a list of texts (cached, see utils/embeddings.py)."""
+    return embedding_service.embed(texts)
 
-def detect_similar_articles(articles: List[str], threshold: float = 0.9) -> List[Tuple[int, int, float]]:
+def detect_similar_articles(
+    articles: List[str],
+    threshold: float = 0.9,
+    embeddings: Optional[np.ndarray] = None,
+    block_size: int = DEDUP_BLOCK_SIZE,
+) -> List[Tuple[int, int, float]]:
     """
     Detect similar articles by computing pairwise cosine similarity.
 
     Args:
         articles: List of article texts (already cleaned).
         threshold: Cosine similarity threshold to flag as duplicates.
+        embeddings: Precomputed normalized embeddings, one row per article.
+        block_size: Rows of the similarity matrix computed at a time.
 
     Returns:
         List of tuples: (index1, index2, similarity_score)
     """
-    duplicates = []
-    embeddings = compute_embeddings(articles)
+    if len(articles) < 2:
+        return []
+    if embeddings is None:
+        embeddings = compute_embeddings(articles)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
 
-    # Compute upper triangle of similarity matrix
-    for i in range(len(articles)):
-        for j in range(i + 1, len(articles)):
-            sim = float(util.cos_sim(embeddings[i], embeddings[j]))
-            if sim >= threshold:
-                duplicates.append((i, j, round(sim, 4)))
+    # Upper triangle of the similarity matrix, one block of rows at a time
+    # so memory stays at block_size x n
+    duplicates = []
+    for start in range(0, len(embeddings), block_size):
+        sims = embeddings[start:start + block_size] @ embeddings.T
+        # k=start+1 keeps only columns j > i for the block's global row i
+        rows, cols = np.nonzero(np.triu(sims >= threshold, k=start + 1))
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            duplicates.append((start + row, col, round(float(sims[row, col]), 4)))
 
     return duplicates
+
+def find_historical_duplicates(
+    embeddings: np.ndarray,
+    threshold: float = 0.9,
+    index: Optional[DuplicateIndex] = None,
+) -> List[Tuple[int, str, float]]:
+    """
+    Check articles against previously kept ones (see utils/dedup_index.py).
+
+    Returns:
+        List of tuples: (index, matching stored URL/GUID, similarity_score)
+    """
+    index = index if index is not None else get_duplicate_index()
+    if index is None:
+        return []
+    return index.search(embeddings, threshold)
@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from functools import cached_property
+from typing import List, Tuple, Union
+
+_URL = re.compile(r"http\S+|www.\S+")
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9\s]")
+_SPACES = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"[.!?]+(?=\s|$)")
+
+
+class AnalyzedDocument:
+    """
+    One article's text, normalized and tokenized once for every scorer.
+
+    Each view is computed on first access and memoized, so running several
+    scorers on the same document does each piece of work once, and a scorer
+    that needs only one view pays only for that one. All scorers accept
+    either a plain string or an AnalyzedDocument.
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased, stripped text (credibility)"""
+        return self.text.lower().strip()
+
+    @cached_property
+    def cleaned(self) -> str:
+        """URLs and punctuation removed, lowercased (bias cues)"""
+        text = _URL.sub("", self.text)
+        text = _NON_ALNUM.sub("", text)
+        return text.strip().lower()
+
+    @cached_property
+    def normalized(self) -> str:
+        """`cleaned` with whitespace runs collapsed (keyword extraction)"""
+        return _SPACES.sub(" ", self.cleaned).strip()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """\\w+ tokens of the lowercased text"""
+        return _WORD.findall(self.lower)
+
+    @cached_property
+    def word_counts(self) -> Counter:
+        return Counter(self.tokens)
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of each sentence in `text`"""
+        spans, start = [], 0
+        for match in _SENTENCE_END.finditer(self.text):
+            if self.text[start:match.end()].strip():
+                spans.append((start, match.end()))
+            start = match.end()
+        if self.text[start:].strip():
+            spans.append((start, len(self.text)))
+        return spans
+
+    @property
+    def sentences(self) -> List[str]:
+        return [self.text[start:end].strip() for start, end in self.sentence_spans]
+
+    @cached_property
+    def polarity(self) -> float:
+        """
+        Sentiment polarity of the original text, -1 (negative) to +1 (positive).
+        Batch scorers may assign it up front (see utils/lexicon_sentiment.py).
+        """
+        from utils.lexicon_sentiment import polarity
+        return polarity(self.text)
+
+    @cached_property
+    def cleaned_polarity(self) -> float:
+        """
+        Polarity of `cleaned` (bias). Differs from `polarity` whenever
+        punctuation or URLs carry sentiment, e.g. "great!" vs "great".
+        """
+        from utils.lexicon_sentiment import polarity
+        return polarity(self.cleaned)
+
+
+def as_document(text: Union[str, AnalyzedDocument]) -> AnalyzedDocument:
+    """Wrap a string; pass an AnalyzedDocument through unchanged."""
+    return text if isinstance(text, AnalyzedDocument) else AnalyzedDocument(text)
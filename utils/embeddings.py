@@ -0,0 +1,108 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+import numpy as np
+
+from utils.model_registry import registry
+from utils.summary_cache import text_hash
+
+# === CONFIGURATION ===
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # fast & accurate for semantic similarity
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))  # ~1.5 KB per MiniLM vector
+
+logger = logging.getLogger("embeddings")
+
+
+# === MODEL SETUP ===
+# One SentenceTransformer per process, shared by KeyBERT and duplicate detection
+def load_sentence_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+registry.register("sentence_model", load_sentence_model)
+
+
+class EmbeddingService:
+    """
+    Batched document embeddings with an in-process LRU keyed by content hash.
+
+    Vectors are L2-normalized float32 rows, so cosine similarity is a dot
+    product. Texts that differ only in whitespace share a cache entry, and
+    repeated texts within one call are encoded once.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, batch_size: int = EMBEDDING_BATCH_SIZE,
+                 max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self):
+        return registry.get("sentence_model")
+
+    def _key(self, text: str) -> str:
+        return f"{self.model_name}:{text_hash(text)}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts; returns an array of shape (len(texts), dim)."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [self._key(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[key] = vector
+            self.hits += sum(1 for key in keys if key in vectors)
+            self.misses += sum(1 for key in keys if key not in vectors)
+
+        # Encode each missing text once, however often it repeats
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            encoded = self.model.encode(
+                list(missing.values()),
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            ).astype(np.float32, copy=False)
+            with self._lock:
+                for key, vector in zip(missing, encoded):
+                    vectors[key] = vector
+                    self._cache[key] = vector
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+
+        return np.stack([vectors[key] for key in keys])
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+embedding_service = EmbeddingService()
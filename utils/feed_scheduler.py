@@ -0,0 +1,140 @@
+import heapq
+import random
+import time
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# === CONFIGURATION ===
+MIN_INTERVAL = 5 * 60      # seconds
+MAX_INTERVAL = 4 * 60 * 60  # seconds
+TARGET_NEW_PER_POLL = 2.0  # aim to find about this many new entries per poll
+RATE_SMOOTHING = 0.3       # EWMA weight of the newest observation
+IDLE_GROWTH = 1.5          # interval multiplier after a poll with nothing new
+ERROR_BACKOFF = 2.0        # interval multiplier per consecutive failure
+MAX_BACKOFF_STEPS = 32     # caps the exponent; the interval hits max_interval long before
+
+
+class FeedState:
+    """Polling history of a single feed."""
+
+    def __init__(self, url: str, interval: float):
+        self.url = url
+        self.interval = interval
+        self.next_due = 0.0
+        self.last_polled: Optional[float] = None
+        self.rate: Optional[float] = None  # smoothed new entries per second
+        self.errors = 0
+        self.polls = 0
+        self.last_status: Optional[str] = None
+
+
+class AdaptivePollScheduler:
+    """
+    Per-feed poll planning with a min-heap ordered by next due time.
+
+    Each feed's interval follows its observed publication rate (new entries
+    per second, smoothed), clamped to [min_interval, max_interval]. Polls
+    that find nothing stretch the interval; failures back off exponentially
+    with jitter. The scheduler only plans - callers fetch the due feeds and
+    report back through record(). Times come from `clock` (time.time by
+    default) unless a method is given `now`.
+    """
+
+    def __init__(
+        self,
+        feed_urls: List[str],
+        initial_interval: float = 30 * 60,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        target_new_per_poll: float = TARGET_NEW_PER_POLL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.clock = clock
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new_per_poll = target_new_per_poll
+        self.feeds: Dict[str, FeedState] = {}
+        self._heap: List[tuple] = []
+        self._lock = threading.Lock()
+
+        initial = self._clamp(initial_interval)
+        for url in feed_urls:
+            self.feeds[url] = FeedState(url, initial)
+            heapq.heappush(self._heap, (0.0, url))  # everything is due on the first tick
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return every feed whose next poll time has passed."""
+        now = self.clock() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, url = heapq.heappop(self._heap)
+                due.append(url)
+        return due
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = self.clock() if now is None else now
+        with self._lock:
+            if not self._heap:
+                return self.max_interval
+            return max(0.0, self._heap[0][0] - now)
+
+    def record(self, url: str, status: str, new_entries: int = 0, now: Optional[float] = None) -> float:
+        """
+        Report the outcome of polling `url` ("ok", "unchanged", "error" or
+        "timeout") and reschedule it. Returns the next interval in seconds.
+        """
+        now = self.clock() if now is None else now
+        with self._lock:
+            state = self.feeds[url]
+            state.polls += 1
+            state.last_status = status
+
+            if status in ("error", "timeout"):
+                state.errors += 1
+                backoff = state.interval * (ERROR_BACKOFF ** min(state.errors, MAX_BACKOFF_STEPS))
+                interval = self._clamp(backoff * random.uniform(0.8, 1.2))
+            else:
+                state.errors = 0
+                if state.last_polled is not None:
+                    observed = new_entries / max(now - state.last_polled, 1.0)
+                    state.rate = observed if state.rate is None else (
+                        RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * state.rate
+                    )
+                state.last_polled = now
+
+                if new_entries == 0:
+                    interval = state.interval * IDLE_GROWTH
+                elif state.rate:
+                    interval = self.target_new_per_poll / state.rate
+                else:
+                    interval = state.interval
+                interval = self._clamp(interval)
+                state.interval = interval
+
+            state.next_due = now + interval
+            heapq.heappush(self._heap, (state.next_due, url))
+            return interval
+
+    def status(self, now: Optional[float] = None) -> List[Dict]:
+        """Per-feed view sorted by next due time."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            rows = [
+                {
+                    "url": s.url,
+                    "next_due": datetime.fromtimestamp(s.next_due).isoformat(timespec="seconds") if s.next_due else "now",
+                    "due_in_seconds": round(max(0.0, s.next_due - now)),
+                    "interval_seconds": round(s.interval),
+                    "entries_per_hour": round(s.rate * 3600, 2) if s.rate is not None else None,
+                    "errors": s.errors,
+                    "polls": s.polls,
+                    "last_status": s.last_status,
+                }
+                for s in self.feeds.values()
+            ]
+        return sorted(rows, key=lambda r: r["due_in_seconds"])
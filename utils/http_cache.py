@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+# === CONFIGURATION ===
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(PROJECT_ROOT, "data", "http_cache"))
+HTTP_CACHE_MAX_AGE_DAYS = float(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "30"))  # since last download or 304
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "5000"))
+PRUNE_EVERY = 200  # writes between sweeps of the cache directory
+
+logger = logging.getLogger("http_cache")
+
+
+def _nothing() -> None:
+    pass
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    text: str
+    not_modified: bool = False  # True when the server answered 304 and the stored copy was used
+    parsed: Any = None          # result of the caller's `parse` function, reused on 304
+    content: Optional[bytes] = None  # undecoded body of a fresh download; None when served from the cache
+    commit: Callable[[], None] = field(default=_nothing, repr=False)  # stores the entry when fetched with defer_save
+
+
+class HTTPCache:
+    """
+    On-disk conditional-GET cache.
+
+    Each URL is stored as one JSON file holding its ETag / Last-Modified
+    validators, the body and (optionally) the caller's parsed result. Later
+    fetches send If-None-Match / If-Modified-Since; on a 304 the stored body
+    and parsed result are returned without parsing the page again, unless
+    the result was stored under a different `parse_version` (the extractor
+    changed since), in which case the stored body is parsed again.
+
+    Entries not downloaded or revalidated for `max_age_days` are dropped,
+    and every PRUNE_EVERY writes the directory is trimmed to the newest
+    `max_entries` files.
+
+    Callers that only finish with a response later (e.g. once its articles
+    are stored) pass `defer_save=True` and call `response.commit()` then.
+    Until they do, the next fetch downloads the page again instead of
+    getting a 304 for content that was never used.
+    """
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, max_age_days: float = HTTP_CACHE_MAX_AGE_DAYS,
+                 max_entries: int = HTTP_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_age = max_age_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0    # 304 Not Modified
+        self.misses = 0  # full 200 download
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    # === STORAGE ===
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                self.invalidate(url)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, url: str, headers: Dict[str, str], body: str, parsed: Any = None,
+             parse_version: Optional[str] = None) -> None:
+        entry = {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "body": body,
+            "parsed": parsed,
+            "parse_version": parse_version,
+            "stored_at": time.time(),
+        }
+        if not entry["etag"] and not entry["last_modified"]:
+            return  # nothing to revalidate with, so storing it would never pay off
+        self._write(entry)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        url = entry["url"]
+        path = self._path(url)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"HTTP cache write failed for {url}: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def _touch(self, url: str) -> None:
+        # A 304 revalidates the entry, so it starts aging again from now
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def invalidate(self, url: str) -> None:
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
+
+    def prune(self) -> int:
+        """Drop expired entries, then the oldest beyond `max_entries`. Returns how many were removed."""
+        entries = []
+        now = time.time()
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                    # Expired entries, and temp files left behind by a crashed writer
+                    if now - mtime > self.max_age or (name.endswith(".tmp") and now - mtime > 3600):
+                        os.remove(path)
+                        removed += 1
+                    elif name.endswith(".json"):
+                        entries.append((mtime, path))
+                except OSError:
+                    continue
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"HTTP cache pruned {removed} entries")
+        return removed
+
+    # === REQUEST HELPERS ===
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _finish(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        text: str,
+        entry: Optional[Dict[str, Any]],
+        parse: Optional[Callable[[str], Any]],
+        parse_version: Optional[str] = None,
+        content: Optional[bytes] = None,
+        defer_save: bool = False,
+    ) -> CachedResponse:
+        if status_code == 304 and entry is not None:
+            with self._lock:
+                self.hits += 1
+            parsed = entry.get("parsed")
+            if parse is not None and (parsed is None or entry.get("parse_version") != parse_version):
+                # Never parsed, or parsed by an older extractor: redo it from the stored body
+                parsed = parse(entry["body"])
+                save = lambda: self._write({**entry, "parsed": parsed, "parse_version": parse_version})
+            else:
+                save = lambda: self._touch(url)
+            return CachedResponse(url, 200, entry["body"], not_modified=True, parsed=parsed,
+                                  commit=self._commit(save, defer_save))
+
+        with self._lock:
+            self.misses += 1
+        parsed = parse(text) if parse is not None else None
+        save = lambda: self.save(url, {k.lower(): v for k, v in headers.items()}, text, parsed, parse_version)
+        return CachedResponse(url, status_code, text, parsed=parsed, content=content,
+                              commit=self._commit(save, defer_save))
+
+    @staticmethod
+    def _commit(save: Callable[[], None], defer_save: bool) -> Callable[[], None]:
+        if defer_save:
+            return save
+        save()
+        return _nothing
+
+    # === PUBLIC API ===
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        parse: Optional[Callable[[str], Any]] = None,
+        session: Optional[requests.Session] = None,
+        parse_version: Optional[str] = None,
+        defer_save: bool = False,
+    ) -> CachedResponse:
+        """
+        GET `url` through the cache (blocking). Raises requests.HTTPError on
+        non-2xx responses other than 304. `parse_version` identifies the
+        extractor behind `parse`; a stored result from another version is
+        not reused. With `defer_save`, nothing is written until the caller
+        calls the response's commit().
+        """
+        entry = self.load(url)
+        request_headers = dict(headers or {})
+        request_headers.update(self.conditional_headers(entry))
+
+        res = (session or requests).get(url, headers=request_headers, timeout=timeout)
+        if res.status_code != 304 or entry is None:
+            res.raise_for_status()
+        return self._finish(url, res.status_code, res.headers, res.text, entry, parse, parse_version, res.content,
+                            defer_save)
+
+    async def afetch(self, client, url: str, parse: Optional[Callable[[str], Any]] = None,
+                     parse_version: Optional[str] = None, defer_save: bool = False) -> CachedResponse:
+        """
+        Async variant of fetch() for an httpx.AsyncClient. Disk access and
+        `parse` run in a worker thread so the event loop is never blocked.
+        """
+        entry = await asyncio.to_thread(self.load, url)
+        res = await client.get(url, headers=self.conditional_headers(entry))
+        if res.status_code != 304 or entry is None:
+            res.raise_for_status()
+        return await asyncio.to_thread(
+            self._finish, url, res.status_code, res.headers, res.text, entry, parse, parse_version, res.content,
+            defer_save,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "not_modified": self.hits,
+                "downloaded": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+http_cache = HTTPCache()
@@ -1,23 +1,35 @@
+import os
 import re
 import logging
-from typing import List
+from typing import List, Optional, Union
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 
-try:
-    from keybert import KeyBERT
-    from rake_nltk import Rake
-except ImportError:
-    raise ImportError("Please install required packages: `pip install keybert rake-nltk`")
+from utils.document import AnalyzedDocument, as_document
+from utils.embeddings import embedding_service
+from utils.model_registry import registry
+from utils.tfidf_keywords import get_keyword_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("keywords")
 
+# === CONFIGURATION ===
+# "semantic": KeyBERT (RAKE fallback); "fast": corpus TF-IDF (utils/tfidf_keywords.py);
+# "auto": KeyBERT once its model is loaded and the batch is small, TF-IDF otherwise
+KEYWORD_MODES = ("fast", "semantic", "auto")
+KEYWORD_MODE = os.getenv("KEYWORD_MODE", "semantic")
+KEYWORD_AUTO_MAX_BATCH = int(os.getenv("KEYWORD_AUTO_MAX_BATCH", "64"))
+
 # === MODEL SETUP ===
-try:
-    kw_model = KeyBERT(model="all-MiniLM-L6-v2")
-except Exception as e:
-    logger.warning(f"KeyBERT model load failed: {e}")
-    kw_model = None
+# KeyBERT is loaded on first use (or by an explicit warmup), not at import. It
+# wraps the shared sentence model (utils/embeddings.py) rather than loading its own copy.
+def load_keybert():
+    try:
+        from keybert import KeyBERT
+    except ImportError:
+        raise ImportError("Please install required packages: `pip install keybert rake-nltk`")
+    return KeyBERT(model=registry.get("sentence_model"))
+
+registry.register("keybert", load_keybert)
 
 def clean_for_keywords(text: str) -> str:
     """Preprocess text for keyword extraction"""
@@ -26,20 +38,52 @@ def clean_for_keywords(text: str) -> str:
     text = re.sub(r"\s+", " ", text)             # normalize spaces
     return text.strip().lower()
 
-def extract_with_keybert(text: str, top_n: int = 10) -> List[str]:
-    """Extract keywords using KeyBERT"""
-    if not kw_model:
-        raise RuntimeError("KeyBERT model not initialized.")
+def extract_with_keybert(text: str, top_n: int = 10, embed_text: Optional[str] = None) -> List[str]:
+    """
+    Extract keywords using KeyBERT. The document vector comes from the shared
+    embedding service for `embed_text` (default: `text`), so an article already
+    embedded for duplicate detection isn't encoded again.
+    """
+    try:
+        kw_model = registry.get("keybert")
+    except Exception as e:
+        raise RuntimeError(f"KeyBERT model not initialized: {e}")
     try:
-        keywords = kw_model.extract_keywords(text, top_n=top_n, stop_words="english")
+        doc_embedding = embedding_service.embed_one(embed_text or text)
+        keywords = kw_model.extract_keywords(
+            text, top_n=top_n, stop_words="english", doc_embeddings=doc_embedding.reshape(1, -1)
+        )
         return [kw[0] for kw in keywords]
     except Exception as e:
         logger.warning(f"KeyBERT extraction failed: {e}")
         return []
 
+def extract_with_keybert_batch(texts: List[str], top_n: int = 10, embed_texts: Optional[List[str]] = None) -> List[List[str]]:
+    """
+    KeyBERT over many documents at once: document vectors come from one
+    batched embedding call and candidate words are embedded in one pass for
+    the whole batch. Returns one keyword list per text ([] where it failed).
+    """
+    if not texts:
+        return []
+    try:
+        kw_model = registry.get("keybert")
+    except Exception as e:
+        raise RuntimeError(f"KeyBERT model not initialized: {e}")
+    try:
+        doc_embeddings = embedding_service.embed(embed_texts or texts)
+        keywords = kw_model.extract_keywords(texts, top_n=top_n, stop_words="english", doc_embeddings=doc_embeddings)
+        if len(texts) == 1:
+            keywords = [keywords]  # KeyBERT unwraps single-document results
+        return [[kw[0] for kw in doc_keywords] for doc_keywords in keywords]
+    except Exception as e:
+        logger.warning(f"KeyBERT batch extraction failed: {e}")
+        return [[] for _ in texts]
+
 def extract_with_rake(text: str, top_n: int = 10) -> List[str]:
     """Fallback method using RAKE"""
     try:
+        from rake_nltk import Rake
         rake = Rake()
         rake.extract_keywords_from_text(text)
         return rake.get_ranked_phrases()[:top_n]
@@ -58,15 +102,55 @@ def post_process_keywords(keywords: List[str]) -> List[str]:
             cleaned.add(" ".join(terms))
     return sorted(cleaned, key=lambda k: (-len(k), k))[:10]
 
-def extract_keywords(text: str, top_n: int = 10) -> List[str]:
-    """Main keyword extraction function with fallback"""
-    if not text or len(text) < 100:
+def _resolve_mode(mode: Optional[str], batch_size: int = 1) -> str:
+    mode = mode or KEYWORD_MODE
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"Unknown keyword mode '{mode}' (expected one of {', '.join(KEYWORD_MODES)})")
+    if mode == "auto":
+        # Never pay the model load on the request path, and keep bulk runs cheap
+        if registry.is_loaded("keybert") and batch_size <= KEYWORD_AUTO_MAX_BATCH:
+            return "semantic"
+        return "fast"
+    return mode
+
+def extract_keywords(text: Union[str, AnalyzedDocument], top_n: int = 10, mode: Optional[str] = None) -> List[str]:
+    """Main keyword extraction function with fallback; `mode` defaults to KEYWORD_MODE"""
+    mode = _resolve_mode(mode)
+    doc = as_document(text)
+    if len(doc.text) < 100:
         return []
 
-    cleaned_text = clean_for_keywords(text)
+    if mode == "fast":
+        return post_process_keywords(get_keyword_index().keywords(doc, top_n))
 
-    keywords = extract_with_keybert(cleaned_text, top_n)
+    cleaned_text = doc.normalized  # same as clean_for_keywords(doc.text)
+
+    # Embed the original text, not the cleaned one, so the vector is shared with
+    # duplicate detection; MiniLM's tokenizer is uncased, so cleaning changes little.
+    keywords = extract_with_keybert(cleaned_text, top_n, embed_text=doc.text)
     if not keywords:
         keywords = extract_with_rake(cleaned_text, top_n)
 
     return post_process_keywords(keywords)
+
+def extract_keywords_batch(texts: List[Union[str, AnalyzedDocument]], top_n: int = 10, mode: Optional[str] = None) -> List[List[str]]:
+    """extract_keywords for many texts, with one batched KeyBERT pass"""
+    docs = [as_document(text) for text in texts]
+    results = [[] for _ in docs]
+    pending = [i for i, doc in enumerate(docs) if len(doc.text) >= 100]
+    if not pending:
+        return results
+
+    if _resolve_mode(mode, len(pending)) == "fast":
+        index = get_keyword_index()
+        for i in pending:
+            results[i] = post_process_keywords(index.keywords(docs[i], top_n))
+        return results
+
+    cleaned = [docs[i].normalized for i in pending]
+    batch_keywords = extract_with_keybert_batch(cleaned, top_n, embed_texts=[docs[i].text for i in pending])
+    for i, cleaned_text, keywords in zip(pending, cleaned, batch_keywords):
+        if not keywords:
+            keywords = extract_with_rake(cleaned_text, top_n)
+        results[i] = post_process_keywords(keywords)
+    return results
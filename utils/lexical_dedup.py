@@ -0,0 +1,221 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.seen_index import normalize_key
+
+# === CONFIGURATION ===
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", os.path.join(PROJECT_ROOT, "data", "minhash_index.db"))
+LEXICAL_INDEX_SIZE = int(os.getenv("LEXICAL_INDEX_SIZE", "100000"))  # most recent signatures kept
+LEXICAL_DEDUP_ENABLED = os.getenv("LEXICAL_DEDUP_ENABLED", "true").lower() == "true"
+LEXICAL_THRESHOLD = float(os.getenv("LEXICAL_THRESHOLD", "0.8"))  # estimated Jaccard on shingles
+SHINGLE_SIZE = 5        # words per shingle
+NUM_PERM = 128          # MinHash permutations
+NUM_BANDS = 16          # LSH bands of NUM_PERM // NUM_BANDS rows: candidates from ~0.7 Jaccard up
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)  # fixed seed: signatures must stay comparable across runs
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+logger = logging.getLogger("lexical_dedup")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Set of `size`-word shingles of the lowercased, punctuation-free text."""
+    words = re.sub(r"[^a-z0-9\s]", " ", text.lower()).split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM-value MinHash signature (uint32) of the text's shingles."""
+    tokens = shingles(text)
+    if not tokens:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "little") for t in tokens],
+        dtype=np.uint64,
+    )
+    # Universal hashing a*x + b mod p, one row per permutation (uint64 wrap-around is fine here)
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class MinHashLSH:
+    """
+    In-memory banded LSH over MinHash signatures. Only items sharing at least
+    one band bucket are compared, so a lookup costs about the same however
+    many items are stored.
+    """
+
+    def __init__(self, bands: int = NUM_BANDS):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: List[Dict[bytes, list]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Union[int, str], np.ndarray] = {}
+
+    def _bands(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key) -> bool:
+        return key in self._signatures
+
+    def insert(self, key: Union[int, str], signature: np.ndarray) -> None:
+        if key in self._signatures:
+            return
+        self._signatures[key] = signature
+        for band, bucket in self._bands(signature):
+            self._buckets[band][bucket].append(key)
+
+    def remove(self, key: Union[int, str]) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, bucket in self._bands(signature):
+            keys = self._buckets[band][bucket]
+            keys.remove(key)
+            if not keys:
+                del self._buckets[band][bucket]
+
+    def query(self, signature: np.ndarray, threshold: float = LEXICAL_THRESHOLD) -> Optional[Tuple[Union[int, str], float]]:
+        """Most similar stored item with estimated Jaccard >= threshold, as (key, similarity)."""
+        candidates = set()
+        for band, bucket in self._bands(signature):
+            candidates.update(self._buckets[band].get(bucket, ()))
+        best = None
+        for key in candidates:
+            sim = jaccard(signature, self._signatures[key])
+            if sim >= threshold and (best is None or sim > best[1]):
+                best = (key, round(sim, 4))
+        return best
+
+
+class LexicalIndex(MinHashLSH):
+    """
+    MinHashLSH whose signatures persist in SQLite, for near-duplicate checks
+    across runs. Keys are normalized URLs/GUIDs; only the newest `max_entries`
+    signatures are loaded and kept.
+    """
+
+    def __init__(self, path: str = LEXICAL_INDEX_PATH, max_entries: int = LEXICAL_INDEX_SIZE):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._order: List[str] = []
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS minhash_signatures (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT UNIQUE,
+                signature BLOB,
+                added_at REAL
+            )
+        """)
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT key, signature FROM minhash_signatures ORDER BY id DESC LIMIT ?", (max_entries,)
+        ).fetchall()
+        for key, blob in reversed(rows):
+            super().insert(key, np.frombuffer(blob, dtype=np.uint32))
+            self._order.append(key)
+
+    def query(self, signature: np.ndarray, threshold: float = LEXICAL_THRESHOLD) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            return super().query(signature, threshold)
+
+    def add(self, keys: Iterable[str], signatures: Iterable[np.ndarray]) -> None:
+        rows = []
+        with self._lock:
+            for key, signature in zip(keys, signatures):
+                key = normalize_key(key)
+                if key in self or (signature == _MAX_HASH).all():
+                    continue
+                super().insert(key, signature)
+                self._order.append(key)
+                rows.append((key, signature.astype(np.uint32).tobytes(), time.time()))
+            if not rows:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO minhash_signatures (key, signature, added_at) VALUES (?, ?, ?)", rows
+                )
+                if len(self._order) > self.max_entries:
+                    for key in self._order[:-self.max_entries]:
+                        super().remove(key)
+                    self._order = self._order[-self.max_entries:]
+                    self._conn.execute(
+                        "DELETE FROM minhash_signatures WHERE id NOT IN "
+                        "(SELECT id FROM minhash_signatures ORDER BY id DESC LIMIT ?)",
+                        (self.max_entries,),
+                    )
+
+
+def find_near_duplicates(
+    texts: List[str],
+    threshold: float = LEXICAL_THRESHOLD,
+    index: Optional[LexicalIndex] = None,
+) -> Tuple[List[np.ndarray], List[Tuple[int, Union[int, str], float]]]:
+    """
+    Lexical near-duplicate pass over a batch.
+
+    Each text is checked against the persistent `index` (if any) and against
+    the earlier texts of the batch that were not themselves duplicates.
+
+    Returns:
+        (signatures, matches) where matches are (index, earlier batch index
+        or stored URL/GUID, estimated Jaccard) for every text to drop.
+    """
+    signatures = [minhash(text) for text in texts]
+    batch = MinHashLSH()
+    matches = []
+    for i, signature in enumerate(signatures):
+        if (signature == _MAX_HASH).all():
+            continue  # no words to compare; leave it to the semantic stage
+        match = index.query(signature, threshold) if index is not None else None
+        if match is None:
+            match = batch.query(signature, threshold)
+        if match is None:
+            batch.insert(i, signature)
+        else:
+            matches.append((i, match[0], match[1]))
+    return signatures, matches
+
+
+_index: Optional[LexicalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lexical_index() -> Optional[LexicalIndex]:
+    """Process-wide LexicalIndex opened on first use, or None when LEXICAL_DEDUP_ENABLED is false."""
+    global _index
+    if not LEXICAL_DEDUP_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = LexicalIndex()
+        return _index
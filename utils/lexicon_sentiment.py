@@ -0,0 +1,175 @@
+"""
+Batch sentiment polarity without a TextBlob object per text.
+
+TextBlob's default analyzer is a lexicon lookup with a few rules (intensifiers
+such as "very", negation, "!" emphasis), but each call re-runs its general
+purpose tokenizer and walks nested lexicon dictionaries. LexiconSentiment
+compiles the same lexicon once into a flat token -> (polarity, intensity,
+is_modifier) table, tokenizes with one regex, applies the same rules in a
+single pass per text, and averages the scores of a whole batch with NumPy.
+Scores match TextBlob's polarity up to tokenization edge cases; run
+`python -m benchmarks.bench_sentiment` for the comparison.
+"""
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# === CONFIGURATION ===
+# "lexicon" (this module) or "textblob" (one TextBlob per text, the reference)
+SENTIMENT_ENGINE = os.getenv("SENTIMENT_ENGINE", "lexicon")
+
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+EXCLAMATION_BOOST = 1.25
+NEGATION_FACTOR = -0.5  # "not good" = slightly bad, "not bad" = slightly good
+
+# Same split points as TextBlob's tokenizer: punctuation is stripped from the
+# ends of a whitespace token but kept inside it ("well-known", "u.s").
+# Apostrophes and quotes separate tokens, as they do there, after "n't" is
+# split off its verb ("don't" -> "do n ' t").
+_PUNCT = re.escape(".,;:!?()[]{}`@#$^&*+-|=~_") + "/"
+_CONTRACTION = re.compile("n't")
+_QUOTES = re.compile("[\"'‘’“”]")
+
+
+def _token_pattern(emoticons: Sequence[str]) -> "re.Pattern":
+    emoticon = "|".join(re.escape(e) for e in sorted(emoticons, key=len, reverse=True))
+    return re.compile(
+        rf"(?<!\S)(?:{emoticon}|\(\s?!\s?\))(?!\S)"  # whole-token emoticons and sarcasm "(!)"
+        rf"|[^\s{_PUNCT}]+(?:[{_PUNCT}]+[^\s{_PUNCT}]+)*"  # words
+        r"|\.\.\.|!"  # punctuation that affects the score (or resets the rules)
+    )
+
+
+class LexiconSentiment:
+    """
+    Polarity (-1 to +1) from TextBlob's English sentiment lexicon, compiled once.
+
+    Rules, as in TextBlob's PatternAnalyzer: a known adverb modifies the next
+    known word ("very good" scores good x 1.3) across words of up to two
+    letters; "no", "not" or "never" before a known word scales its score by
+    -0.5; each "!" boosts the previous score by 25%; emoticons count as scored
+    words. The text's polarity is the mean of its scores (0 when none).
+    """
+
+    def __init__(self):
+        from textblob import _text
+        from textblob.en import sentiment as lexicon
+
+        if not dict.__len__(lexicon):
+            lexicon.load()
+        # (polarity, intensity, can modify the next word) of each word, all senses averaged
+        self.table: Dict[str, Tuple[float, float, bool]] = {
+            word: (entry[None][0], entry[None][2], "RB" in entry)
+            for word, entry in dict.items(lexicon)
+            if None in entry
+        }
+        # Alphabetic ones ("xD") are ordinary words to TextBlob
+        self.emoticons: Dict[str, float] = {
+            emoticon.lower(): score for (_, score), group in _text.EMOTICONS.items()
+            for emoticon in group if not emoticon.isalpha()
+        }
+        self._token = _token_pattern(list(self.emoticons))
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._token.findall(_QUOTES.sub(" ", _CONTRACTION.sub(" n't", text).lower()))
+
+    def scores(self, tokens: Sequence[str]) -> Tuple[List[float], List[bool]]:
+        """Score of each assessed word (before negation) and whether it was negated."""
+        table, emoticons = self.table, self.emoticons
+        scores: List[float] = []
+        intensities: List[float] = []
+        negated: List[bool] = []
+        modifier: Optional[str] = None  # preceding known adverb ("very")
+        negation: Optional[str] = None  # preceding "not"
+        for token in tokens:
+            entry = table.get(token)
+            if entry is not None:
+                polarity, intensity, is_modifier = entry
+                if modifier is None:
+                    scores.append(polarity)
+                    intensities.append(intensity)
+                    negated.append(False)
+                else:
+                    # "very good": the modifier's own score is replaced by the modified one
+                    scores[-1] = max(-1.0, min(polarity * intensities[-1], 1.0))
+                    intensities[-1] = intensity
+                if negation is not None:
+                    intensities[-1] = 1.0 / intensities[-1]
+                    negated[-1] = True
+                modifier = token if is_modifier else None
+                negation = token if token in NEGATIONS else None
+                continue
+
+            if token in NEGATIONS:
+                negation = token
+            elif negation and len(token) > 1:
+                negation = None  # kept across small words only ("not a good")
+            if negation is not None and modifier is not None and modifier.endswith("ly"):
+                negated[-1] = True  # "really not good"
+                negation = None
+            elif modifier and len(token) > 2:
+                modifier = None  # kept across small words only ("very a good")
+            if token == "!":
+                if scores:
+                    scores[-1] = max(-1.0, min(scores[-1] * EXCLAMATION_BOOST, 1.0))
+            elif token[0] == "(":
+                scores.append(0.0)  # sarcasm "(!)": scored as neutral but counted
+                intensities.append(1.0)
+                negated.append(False)
+            elif token in emoticons:
+                scores.append(emoticons[token])
+                intensities.append(1.0)
+                negated.append(False)
+        return scores, negated
+
+    def polarity(self, text: str) -> float:
+        return float(self.polarity_batch([text])[0])
+
+    def polarity_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Polarity of each text; scores of the whole batch are averaged in one vectorized step."""
+        counts = np.zeros(len(texts), dtype=np.int64)
+        all_scores: List[float] = []
+        all_negated: List[bool] = []
+        for i, text in enumerate(texts):
+            scores, negated = self.scores(self.tokenize(text or ""))
+            counts[i] = len(scores)
+            all_scores.extend(scores)
+            all_negated.extend(negated)
+
+        scores = np.asarray(all_scores, dtype=np.float64)
+        scores = np.where(np.asarray(all_negated, dtype=bool), scores * NEGATION_FACTOR, scores)
+        doc_ids = np.repeat(np.arange(len(texts)), counts)
+        totals = np.bincount(doc_ids, weights=scores, minlength=len(texts))
+        return totals / np.maximum(counts, 1)
+
+
+_lexicon: Optional[LexiconSentiment] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon_sentiment() -> LexiconSentiment:
+    """Process-wide compiled lexicon, built on first use."""
+    global _lexicon
+    with _lexicon_lock:
+        if _lexicon is None:
+            _lexicon = LexiconSentiment()
+        return _lexicon
+
+
+def polarity_batch(texts: Sequence[str], engine: Optional[str] = None) -> np.ndarray:
+    """Polarity (-1 to +1) of each text with SENTIMENT_ENGINE (or `engine`)."""
+    engine = engine or SENTIMENT_ENGINE
+    if engine == "textblob":
+        from textblob import TextBlob
+        return np.array([TextBlob(text or "").sentiment.polarity for text in texts], dtype=np.float64)
+    if engine != "lexicon":
+        raise ValueError(f"Unknown sentiment engine '{engine}' (expected 'lexicon' or 'textblob')")
+    return get_lexicon_sentiment().polarity_batch(texts)
+
+
+def polarity(text: str, engine: Optional[str] = None) -> float:
+    """Polarity (-1 to +1) of one text with SENTIMENT_ENGINE (or `engine`)."""
+    return float(polarity_batch([text], engine)[0])
@@ -0,0 +1,128 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+# === CONFIGURATION ===
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "true").lower() == "true"
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "16"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "10"))
+
+logger = logging.getLogger("micro_batcher")
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item calls into batched calls.
+
+    Callers block in submit(); a worker thread takes the first waiting item,
+    keeps collecting for up to `max_wait_ms` or until `max_batch_size` items,
+    runs `process(items)` once and hands each caller its own result. If the
+    batch raises, every caller in it gets the exception; a result that is an
+    exception instance is raised to its own caller only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = MICROBATCH_MAX_SIZE,
+        max_wait_ms: float = MICROBATCH_MAX_WAIT_MS,
+    ):
+        self.name = name
+        self.process = process
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closing = False
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def submit(self, item: Any, timeout: float = None) -> Any:
+        """Queue one item and wait for its result."""
+        future: Future = Future()
+        # Under the lock, so the worker can't decide to stop between the check and the put
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"batcher-{self.name}", daemon=True)
+                self._closing = False
+                self._thread.start()
+            self._queue.put((item, future))
+        return future.result(timeout=timeout)
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                break  # close() is handled after this batch
+            batch.append(entry)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is not _STOP:
+                self._process_batch(self._collect(first))
+            with self._lock:
+                # After close(), stop once every item queued so far has its answer
+                if self._closing and self._queue.empty():
+                    self._thread = None
+                    return
+
+    def _process_batch(self, batch: list) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = self.process(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name}: {len(items)} items in, {len(results)} results out")
+        except Exception as e:
+            logger.warning(f"{self.name}: batch of {len(items)} failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        with self._lock:
+            self.batches += 1
+            self.items += len(items)
+            self.largest_batch = max(self.largest_batch, len(items))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued work and stop the worker thread."""
+        with self._lock:
+            thread = self._thread
+            self._closing = True
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)  # wakes the worker if it is idle
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
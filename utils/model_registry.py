@@ -0,0 +1,98 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger("model_registry")
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, process-wide models.
+
+    Modules register a zero-argument loader under a name at import time
+    (cheap); the loader only runs on the first get(). Loading is guarded by a
+    per-model lock so concurrent first requests load the model once. A failed
+    load is remembered and re-raised until reset(name) is called, so a missing
+    model doesn't cost a multi-second retry on every request.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def names(self) -> list:
+        with self._lock:
+            return sorted(self._loaders)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"No model registered under '{name}'")
+            lock = self._locks[name]
+
+        with lock:
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                raise self._errors[name]
+
+            logger.info(f"Loading model '{name}'...")
+            started = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                logger.warning(f"Loading model '{name}' failed: {e}")
+                self._errors[name] = e
+                raise
+            self._load_seconds[name] = round(time.perf_counter() - started, 2)
+            self._models[name] = model
+            logger.info(f"Model '{name}' ready in {self._load_seconds[name]}s")
+            return model
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Load the given models (default: all registered). Returns per-model status."""
+        result = {}
+        for name in (names if names is not None else self.names()):
+            try:
+                self.get(name)
+                result[name] = {"loaded": True, "load_seconds": self._load_seconds.get(name)}
+            except Exception as e:
+                result[name] = {"loaded": False, "error": str(e)}
+        return result
+
+    def reset(self, name: str) -> None:
+        """Forget a loaded model or a remembered load failure."""
+        with self._locks.get(name, self._lock):
+            self._models.pop(name, None)
+            self._errors.pop(name, None)
+            self._load_seconds.pop(name, None)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": self._load_seconds.get(name),
+                "error": str(self._errors[name]) if name in self._errors else None,
+            }
+            for name in self.names()
+        }
+
+
+registry = ModelRegistry()
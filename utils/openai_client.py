@@ -0,0 +1,201 @@
+"""
+Pooled, concurrency-limited client for the OpenAI chat completions API.
+
+One httpx.AsyncClient (shared keep-alive connections) runs on a dedicated
+event loop thread, so async handlers, sync handlers and scheduler threads
+all go through the same pool and the same concurrency cap:
+
+    summary = await get_openai_client().acomplete(messages)   # from async code
+    summary = get_openai_client().complete(messages)          # from sync code
+
+429s, 5xx responses, timeouts and connection errors are retried with full
+jitter exponential backoff (honouring Retry-After); anything else, or
+running out of attempts, raises OpenAIError.
+
+For tests and benchmarks, point OPENAI_BASE_URL at the local stand-in:
+    python -m benchmarks.openai_stub
+"""
+import os
+import atexit
+import random
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# === CONFIGURATION ===
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))  # requests in flight
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))  # seconds per attempt
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))  # after the first attempt
+OPENAI_BACKOFF_BASE = 0.5  # seconds; attempt n waits up to base * 2**n
+OPENAI_BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger("openai_client")
+
+
+class OpenAIError(RuntimeError):
+    """
+    A chat completion that did not produce a result.
+
+    `status` is the last HTTP status (None for timeouts, connection errors
+    or a missing API key), `retryable` whether the failure was transient,
+    `attempts` how many requests were made.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = False, attempts: int = 0):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.attempts = attempts
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"error": str(self), "status": self.status, "retryable": self.retryable, "attempts": self.attempts}
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class OpenAIClient:
+    """
+    Chat completions over one connection pool, at most `max_concurrency`
+    requests in flight. The pool, the semaphore and the event loop they
+    belong to are created on first use and torn down by close().
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = OPENAI_API_KEY,
+        base_url: str = OPENAI_BASE_URL,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        timeout: float = OPENAI_TIMEOUT,
+        max_retries: int = OPENAI_MAX_RETRIES,
+        backoff_base: float = OPENAI_BACKOFF_BASE,
+        backoff_max: float = OPENAI_BACKOFF_MAX,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.counts = {"requests": 0, "retries": 0, "failures": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    # --- lifecycle ---
+    def start(self) -> "OpenAIClient":
+        with self._lock:
+            if self._loop is not None:
+                return self
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="openai-client", daemon=True)
+            thread.start()
+
+            async def setup() -> None:
+                limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+                self._http = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            asyncio.run_coroutine_threadsafe(setup(), loop).result()
+            self._loop, self._thread = loop, thread
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    # --- requests ---
+    def submit(self, messages: List[Dict[str, str]], **params: Any) -> Future:
+        """Start a chat completion without waiting; the Future yields the reply text or raises OpenAIError."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._complete(messages, **params), self._loop)
+
+    def complete(self, messages: List[Dict[str, str]], **params: Any) -> str:
+        """Blocking chat completion; returns the reply text or raises OpenAIError."""
+        return self.submit(messages, **params).result()
+
+    async def acomplete(self, messages: List[Dict[str, str]], **params: Any) -> str:
+        """Chat completion awaitable from any event loop; returns the reply text or raises OpenAIError."""
+        return await asyncio.wrap_future(self.submit(messages, **params))
+
+    async def _complete(self, messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo", **params: Any) -> str:
+        if not self.api_key:
+            raise OpenAIError("OPENAI_API_KEY is not set")
+        payload = {"model": model, "messages": messages, **params}
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        attempt = 0
+        while True:
+            attempt += 1
+            status, wait = None, None
+            async with self._semaphore:
+                self.counts["requests"] += 1
+                try:
+                    response = await self._http.post("/chat/completions", json=payload, headers=headers)
+                except httpx.TimeoutException as e:
+                    error = OpenAIError(f"OpenAI request timed out: {e!r}", None, True, attempt)
+                except httpx.TransportError as e:
+                    error = OpenAIError(f"OpenAI connection failed: {e!r}", None, True, attempt)
+                else:
+                    status = response.status_code
+                    if status == 200:
+                        try:
+                            return response.json()["choices"][0]["message"]["content"].strip()
+                        except (ValueError, KeyError, IndexError, TypeError) as e:
+                            self.counts["failures"] += 1
+                            raise OpenAIError(f"Malformed OpenAI response: {e!r}", status, False, attempt)
+                    error = OpenAIError(
+                        f"OpenAI returned HTTP {status}: {response.text[:200]}", status, status in RETRY_STATUSES, attempt
+                    )
+                    wait = _retry_after(response)
+
+            if not error.retryable or attempt > self.max_retries:
+                self.counts["failures"] += 1
+                raise error
+            # Full jitter: spreads out retries from many callers that failed together
+            backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+            delay = max(backoff, min(wait, self.backoff_max)) if wait is not None else backoff
+            self.counts["retries"] += 1
+            logger.info(f"OpenAI attempt {attempt} failed ({status or 'no response'}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "max_concurrency": self.max_concurrency,
+            "max_retries": self.max_retries,
+            **self.counts,
+        }
+
+
+_client: Optional[OpenAIClient] = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAIClient:
+    """Process-wide client, started on first request."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAIClient()
+            atexit.register(_client.close)
+        return _client
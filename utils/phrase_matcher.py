@@ -0,0 +1,175 @@
+import os
+import re
+import json
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import ahocorasick  # optional: pyahocorasick, single-pass matching of large phrase lists
+except ImportError:
+    ahocorasick = None
+
+# === CONFIGURATION ===
+# Optional JSON file overriding phrase lists: {"<matcher>": {"<category>": ["phrase", ...]}}
+PHRASE_LISTS_PATH = os.getenv("PHRASE_LISTS_PATH", "")
+
+logger = logging.getLogger("phrase_matcher")
+
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """
+    Regex for a set of literal phrases with shared prefixes factored out
+    ("according to|accused" -> "ac(?:cording to|cused)"), so the regex engine
+    walks a trie instead of retrying every alternative at every position.
+    A phrase that is a prefix of another is optional, so the longer one wins.
+    """
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """
+    Counts many phrases, grouped into categories, with the phrase set
+    compiled once up front.
+
+    Phrases are lowercased. Text is matched case-insensitively, or with
+    `case_sensitive` as given, so only its lowercase occurrences count (like
+    `text.count(phrase.lower())`). By default phrases match as substrings,
+    like `str.count`; with `whole_words` they only match between word
+    boundaries. The compiled form depends on what is available:
+      - pyahocorasick installed: one Aho-Corasick automaton, one pass over
+        the text however many phrases there are;
+      - whole_words: one trie-shaped regex (leftmost-longest, non-overlapping);
+      - otherwise: one C-level `str.count` per phrase. Not a single pass:
+        cost grows with the phrase count, but up to roughly 150 phrases it
+        is faster in CPython than a pure-regex single pass (see README).
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], whole_words: bool = False, case_sensitive: bool = False):
+        self.categories = {name: [p.lower() for p in phrases if p] for name, phrases in categories.items()}
+        self.whole_words = whole_words
+        self.case_sensitive = case_sensitive
+        self._phrase_categories: Dict[str, List[str]] = {}
+        for name, phrases in self.categories.items():
+            for phrase in phrases:
+                self._phrase_categories.setdefault(phrase, []).append(name)
+        self._phrases = list(self._phrase_categories)
+
+        self._regex = None
+        self._automaton = None
+        if not self._phrases:
+            return
+        if whole_words:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            self._regex = re.compile(rf"\b(?:{_trie_pattern(self._phrases)})\b", flags)
+        elif ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for phrase in self._phrases:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+
+    def phrase_counts(self, text: str) -> Counter:
+        """Occurrences of each phrase."""
+        if not self._phrases or not text:
+            return Counter()
+        if self._regex is not None:
+            return Counter(match.lower() for match in self._regex.findall(text))
+        if not self.case_sensitive:
+            text = text.lower()
+        if self._automaton is not None:
+            return Counter(phrase for _, phrase in self._automaton.iter(text))
+        return Counter({phrase: n for phrase in self._phrases if (n := text.count(phrase))})
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Total occurrences per category (a phrase listed in two categories counts in both)."""
+        return self._by_category(self.phrase_counts(text), distinct=False)
+
+    def distinct_counts(self, text: str) -> Dict[str, int]:
+        """Number of different phrases found per category."""
+        return self._by_category(self.phrase_counts(text), distinct=True)
+
+    def _by_category(self, found: Counter, distinct: bool) -> Dict[str, int]:
+        result = {name: 0 for name in self.categories}
+        for phrase, count in found.items():
+            for name in self._phrase_categories.get(phrase, ()):
+                result[name] += 1 if distinct else count
+        return result
+
+
+_defaults: Dict[str, Dict[str, List[str]]] = {}
+_options: Dict[str, bool] = {}
+_case_sensitive: Dict[str, bool] = {}
+_matchers: Dict[str, PhraseMatcher] = {}
+_lock = threading.Lock()
+
+
+def _file_overrides(name: str) -> Dict[str, List[str]]:
+    if not PHRASE_LISTS_PATH:
+        return {}
+    try:
+        with open(PHRASE_LISTS_PATH, encoding="utf-8") as f:
+            return json.load(f).get(name, {})
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read phrase lists from {PHRASE_LISTS_PATH}: {e}")
+        return {}
+
+
+def register_phrases(name: str, categories: Dict[str, Iterable[str]], whole_words: bool = False,
+                     case_sensitive: bool = False) -> None:
+    """
+    Declare a named matcher's default phrase lists. Categories found under
+    `name` in PHRASE_LISTS_PATH replace the defaults; the matcher is compiled
+    on first get_matcher().
+    """
+    with _lock:
+        _defaults[name] = {category: list(phrases) for category, phrases in categories.items()}
+        _options[name] = whole_words
+        _case_sensitive[name] = case_sensitive
+        _matchers.pop(name, None)
+
+
+def configure_phrases(name: str, categories: Dict[str, Iterable[str]], whole_words: Optional[bool] = None) -> PhraseMatcher:
+    """Replace some or all categories of a matcher at runtime and recompile it."""
+    with _lock:
+        merged = {
+            **_defaults.get(name, {}),
+            **_file_overrides(name),
+            **{category: list(p) for category, p in categories.items()},
+        }
+        _defaults[name] = merged
+        if whole_words is not None:
+            _options[name] = whole_words
+        _matchers[name] = PhraseMatcher(merged, _options.get(name, False), _case_sensitive.get(name, False))
+        return _matchers[name]
+
+
+def get_matcher(name: str) -> PhraseMatcher:
+    """The compiled matcher for a registered phrase set."""
+    matcher = _matchers.get(name)
+    if matcher is not None:
+        return matcher
+    with _lock:
+        if name not in _matchers:
+            if name not in _defaults:
+                raise KeyError(f"No phrase lists registered under '{name}'")
+            _matchers[name] = PhraseMatcher({**_defaults[name], **_file_overrides(name)}, _options[name],
+                                            _case_sensitive[name])
+        return _matchers[name]
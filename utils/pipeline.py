@@ -0,0 +1,122 @@
+"""
+Minimal async DAG executor for per-article processing.
+
+Each Stage names the stages it depends on; it starts as soon as those have
+finished and receives their results as keyword arguments, so independent
+stages run concurrently and a request takes about as long as its slowest
+path rather than the sum of all stages. Blocking work should be handed to
+an executor inside the stage (see in_thread / in_pool).
+
+    results, timings = await run_pipeline([
+        Stage("scrape", lambda: fetch(url)),
+        Stage("summary", lambda scrape: summarize(scrape), after=("scrape",)),
+        # Stage bodies take the dependency names as parameters, so adapt plain functions
+        Stage("keywords", lambda scrape: in_thread(extract_keywords)(scrape), after=("scrape",)),
+    ])
+"""
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from utils.analysis_pool import get_analysis_pool
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[..., Awaitable[Any]]  # called with the results of `after` as keyword arguments
+    after: Tuple[str, ...] = ()
+
+
+class StageFailed(RuntimeError):
+    """A stage raised; `stage` names it and the original exception is chained."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+
+
+def in_thread(fn: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """Stage body that runs a blocking function (model inference, disk or DB I/O) in a worker thread."""
+    async def run(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return run
+
+
+def in_pool(task: str) -> Callable[[str], Awaitable[Any]]:
+    """
+    Stage body that runs one of the analysis pool's CPU-bound TASKS in a
+    worker process, or in a thread when the pool would score it inline.
+    """
+    async def run(text: str) -> Any:
+        pool = get_analysis_pool().start()
+        if pool.runs_inline(text):
+            return await asyncio.to_thread(pool.run, task, text)
+        return await asyncio.wrap_future(pool.submit(task, text))
+    return run
+
+
+async def run_pipeline(stages: Sequence[Stage]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run every stage once dependencies allow. Returns ({stage: result},
+    {stage: milliseconds}). The first failing stage raises StageFailed and
+    cancels everything still running.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.after if dep not in by_name]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {', '.join(missing)}")
+
+    tasks: Dict[str, asyncio.Task] = {}
+    timings: Dict[str, float] = {}
+
+    async def execute(stage: Stage) -> Any:
+        inputs = {dep: await tasks[dep] for dep in stage.after}
+        started = time.perf_counter()
+        try:
+            return await stage.run(**inputs)
+        except asyncio.CancelledError:
+            raise
+        except StageFailed:
+            raise
+        except Exception as e:
+            raise StageFailed(stage.name, e) from e
+        finally:
+            timings[stage.name] = round((time.perf_counter() - started) * 1000, 1)
+
+    # Every task exists before any of them starts, so each can await its
+    # dependencies' tasks; _ordered() rejects cycles, which would deadlock
+    for stage in _ordered(stages):
+        tasks[stage.name] = asyncio.ensure_future(execute(stage))
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return dict(zip(tasks, results)), timings
+
+
+def _ordered(stages: Sequence[Stage]) -> List[Stage]:
+    """Stages in dependency order; raises ValueError on a cycle."""
+    ordered: List[Stage] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+    by_name = {stage.name: stage for stage in stages}
+
+    def visit(stage: Stage) -> None:
+        if state.get(stage.name) == 2:
+            return
+        if state.get(stage.name) == 1:
+            raise ValueError(f"Pipeline has a cycle through '{stage.name}'")
+        state[stage.name] = 1
+        for dep in stage.after:
+            visit(by_name[dep])
+        state[stage.name] = 2
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
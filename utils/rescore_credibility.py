@@ -0,0 +1,183 @@
+"""
+Re-score credibility for rows already stored in SQLite.
+
+Rows are streamed in keyset-paginated chunks (rowid > last seen), scored
+with score_credibility_batch, and written back with one executemany per
+chunk inside a single transaction, so memory stays at one chunk however
+large the table is. A missing score column is added as REAL.
+
+Only `articles` is re-scored by default. `summaries.credibility` is written
+by the CLI on a 0-100 scale with its own formula (cli/techscope_cli.py) and
+read by the dashboard, so the job refuses to overwrite it with 0-1 scores.
+
+Usage:
+    python -m utils.rescore_credibility [--db techscope.db] [--table articles]
+                                        [--text-column summary] [--score-column credibility]
+                                        [--chunk-size 2000] [--workers 4] [--dry-run]
+"""
+import os
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.credibility import score_credibility_batch
+from utils.save_data import DB_PATH
+
+CHUNK_SIZE = 2000
+DEFAULT_TABLES = ("articles",)
+# Score columns that hold a different scorer's values, not score_credibility's
+FOREIGN_SCORES = {("summaries", "credibility"): "the CLI's 0-100 score"}
+
+logger = logging.getLogger("rescore_credibility")
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def iter_chunks(conn: sqlite3.Connection, table: str, text_column: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, str]]]:
+    """Yield [(rowid, text), ...] chunks in rowid order without holding a cursor open across writes."""
+    last = -1
+    while True:
+        rows = conn.execute(
+            f'SELECT rowid, "{text_column}" FROM "{table}" WHERE rowid > ? ORDER BY rowid LIMIT ?',
+            (last, chunk_size),
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    return score_credibility_batch(texts).tolist()
+
+
+def rescore_table(
+    conn: sqlite3.Connection,
+    table: str,
+    text_column: str = "summary",
+    score_column: str = "credibility",
+    chunk_size: int = CHUNK_SIZE,
+    pool: Optional[ProcessPoolExecutor] = None,
+    dry_run: bool = False,
+    max_in_flight: int = 2,
+) -> Dict[str, float]:
+    """
+    Re-score every row of one table. With a pool, up to `max_in_flight`
+    chunks are scored while the next ones are read; without one, each chunk
+    is scored and written before the next is read.
+    Returns {"rows", "changed", "seconds"}.
+    """
+    if (table, score_column) in FOREIGN_SCORES:
+        raise ValueError(f"'{table}.{score_column}' holds {FOREIGN_SCORES[(table, score_column)]}; "
+                         f"pass another --score-column to store 0-1 scores next to it")
+    columns = _columns(conn, table)
+    if not columns:
+        raise ValueError(f"No table '{table}'")
+    if text_column not in columns:
+        raise ValueError(f"Table '{table}' has no column '{text_column}'")
+    if score_column not in columns and not dry_run:
+        with conn:
+            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{score_column}" REAL')
+    read_scores = score_column in columns
+
+    started = time.perf_counter()
+    rows_done = changed = 0
+    window = max_in_flight if pool is not None else 0
+    in_flight: deque = deque()
+    for rows in iter_chunks(conn, table, text_column, chunk_size):
+        texts = [text or "" for _, text in rows]
+        in_flight.append((rows, pool.submit(_score_chunk, texts) if pool is not None else _score_chunk(texts)))
+        while len(in_flight) > window:
+            changed += _write_back(conn, table, score_column, *in_flight.popleft(), read_scores, dry_run)
+        rows_done += len(rows)
+        logger.info(f"{table}: {rows_done} rows scored")
+    while in_flight:
+        changed += _write_back(conn, table, score_column, *in_flight.popleft(), read_scores, dry_run)
+
+    return {"rows": rows_done, "changed": changed, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def _write_back(conn, table, score_column, rows, scores, read_scores: bool, dry_run: bool) -> int:
+    """Update the chunk's changed scores in one transaction; returns how many changed."""
+    if isinstance(scores, Future):
+        scores = scores.result()
+    rowids = [rowid for rowid, _ in rows]
+
+    old = {}
+    if read_scores:
+        placeholders = ",".join("?" * len(rowids))
+        old = dict(conn.execute(
+            f'SELECT rowid, "{score_column}" FROM "{table}" WHERE rowid IN ({placeholders})', rowids
+        ).fetchall())
+    updates = [(score, rowid) for rowid, score in zip(rowids, scores) if old.get(rowid) != score]
+    if updates and not dry_run:
+        with conn:
+            conn.executemany(f'UPDATE "{table}" SET "{score_column}" = ? WHERE rowid = ?', updates)
+    return len(updates)
+
+
+def rescore(
+    db_path: str = DB_PATH,
+    tables=DEFAULT_TABLES,
+    text_column: str = "summary",
+    score_column: str = "credibility",
+    chunk_size: int = CHUNK_SIZE,
+    workers: int = 1,
+    dry_run: bool = False,
+) -> Dict[str, Dict[str, float]]:
+    """Re-score the given tables of one database; tables that don't exist are skipped."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    results = {}
+    try:
+        for table in tables:
+            if not _columns(conn, table):
+                logger.warning(f"Skipping missing table '{table}'")
+                continue
+            results[table] = rescore_table(
+                conn, table, text_column, score_column, chunk_size, pool, dry_run, max_in_flight=workers * 2
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        conn.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--table", action="append", dest="tables", help="repeatable (default: articles)")
+    parser.add_argument("--text-column", default="summary")
+    parser.add_argument("--score-column", default="credibility")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1, help="score chunks in this many processes")
+    parser.add_argument("--dry-run", action="store_true", help="count changes without writing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    try:
+        results = rescore(args.db, args.tables or DEFAULT_TABLES, args.text_column, args.score_column,
+                          args.chunk_size, args.workers, args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+    for table, result in results.items():
+        rate = result["rows"] / result["seconds"] if result["seconds"] else 0.0
+        print(f"{table}: {result['rows']} rows, {result['changed']} changed, {result['seconds']}s ({rate:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
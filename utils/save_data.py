@@ -24,3 +24,67 @@ def load_articles() -> List[Dict]:
     except Exception as e:
         print(f"Error loading articles: {e}")
         return []
+
+URL_INDEX = "idx_articles_url"
+
+def _ensure_unique_urls(conn: sqlite3.Connection) -> bool:
+    """
+    `url TEXT UNIQUE` only applies to tables created by save_articles; older
+    databases get the constraint as a unique index when their URLs are
+    already unique. Returns False when duplicates prevent it; nothing is
+    deleted here (see `python -m utils.dedupe_urls`).
+    """
+    try:
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {URL_INDEX} ON articles (url)")
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+def save_articles(articles: List[Dict], raise_errors: bool = False) -> int:
+    """
+    Insert scheduler articles (title, link, summary, source, published) into
+    the 'articles' table, creating it if needed. Already-stored URLs are skipped.
+    Returns the number of rows inserted; on failure 0, or with `raise_errors`
+    the exception.
+    """
+    if not articles:
+        return 0
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT,
+                    url TEXT UNIQUE,
+                    summary TEXT,
+                    source TEXT,
+                    date_published TEXT
+                )
+            """)
+            rows = [
+                (a.get("title"), a.get("link"), a.get("summary"), a.get("source"), a.get("published"))
+                for a in articles
+            ]
+            before = conn.total_changes
+            if _ensure_unique_urls(conn):
+                conn.executemany(
+                    "INSERT OR IGNORE INTO articles (title, url, summary, source, date_published) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            else:
+                # Stored duplicates block the index: skip known URLs row by row instead
+                conn.executemany(
+                    "INSERT INTO articles (title, url, summary, source, date_published) "
+                    "SELECT ?, ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM articles WHERE url = ?)",
+                    [row + (row[1],) for row in rows],
+                )
+            inserted = conn.total_changes - before
+        conn.close()
+        return inserted
+
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"Error saving articles: {e}")
+        return 0
@@ -1,9 +1,16 @@
 import time
 import feedparser
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Dict, Optional, Tuple
 from utils.clean_text import clean_article_text
-from utils.detect_duplicates import detect_similar_articles
+from utils.detect_duplicates import compute_embeddings, detect_similar_articles, find_historical_duplicates
+from utils.dedup_index import get_duplicate_index
+from utils.lexical_dedup import find_near_duplicates, get_lexical_index
 from utils.save_data import save_articles
+from utils.http_cache import http_cache
+from utils.seen_index import get_seen_index
+from utils.tfidf_keywords import get_keyword_index
+from utils.feed_scheduler import AdaptivePollScheduler
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -16,47 +23,229 @@ TECH_FEEDS = [
     "https://www.wired.com/feed/rss",
     "https://www.zdnet.com/news/rss.xml"
 ]
+FEED_TIMEOUT = 15   # seconds, per socket operation
+FEED_DEADLINE = 30  # seconds, whole fetch + parse of one feed
+FEED_WORKERS = 8
 
-def fetch_articles(feed_urls: List[str]) -> List[Dict]:
-    """Fetch and clean articles from a list of RSS feeds."""
+def fetch_feed(url: str, skip_seen: bool = True) -> Tuple[List[Dict], str, Callable[[], None]]:
+    """
+    Fetch, parse and clean one RSS feed. Returns (articles, status, commit)
+    where status is "ok" or "unchanged" (HTTP 304). The feed's cache
+    validators are only stored once `commit()` is called, so a feed whose
+    articles never get saved is downloaded in full again next time.
+    Errors propagate to the caller.
+    """
+    res = http_cache.fetch(url, timeout=FEED_TIMEOUT, defer_save=True)
+    if res.not_modified:
+        # 304: nothing new since the last committed tick, so skip parsing entirely
+        return [], "unchanged", res.commit
+
+    seen = get_seen_index() if skip_seen else None
+    # Raw bytes, so feedparser detects the encoding from the XML prolog itself
+    feed = feedparser.parse(res.content)
     articles = []
+    for entry in feed.entries:
+        if seen is not None and seen.seen_any((entry.get("id"), entry.get("link"))):
+            continue
+        article = {
+            "title": entry.get("title", "").strip(),
+            "link": entry.get("link", ""),
+            "guid": entry.get("id", ""),
+            "summary": clean_article_text(entry.get("summary", "") or entry.get("content", [{}])[0].get("value", "")),
+            "published": entry.get("published", ""),
+            "source": feed.feed.get("title", "Unknown")
+        }
+        articles.append(article)
+
+    return articles, "ok", res.commit
+
+def fetch_feeds(
+    feed_urls: List[str],
+    skip_seen: bool = True,
+    deadline: float = FEED_DEADLINE,
+    max_workers: int = FEED_WORKERS,
+    pending_commits: Optional[List[Callable[[], None]]] = None,
+) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Fetch all feeds concurrently. A feed that errors or is still running after
+    `deadline` seconds is dropped without affecting the others, and its cache
+    validators are never stored.
+
+    The validators of the feeds that did finish are stored at once, or, with
+    `pending_commits`, appended there as callbacks for the caller to run once
+    the articles are saved.
+
+    Returns (articles, stats) where stats maps each feed URL to
+    {"status": ok|unchanged|error|timeout, "articles": int, "seconds": float, "error": str|None}.
+    """
+    articles, stats = [], {}
+    if not feed_urls:
+        return articles, stats
+
+    started, ended = {}, {}
+
+    def timed_fetch(url: str) -> Tuple[List[Dict], str, Callable[[], None]]:
+        started[url] = time.perf_counter()
+        try:
+            return fetch_feed(url, skip_seen)
+        finally:
+            ended[url] = time.perf_counter()
+
+    # One worker per feed (up to max_workers) so every feed starts at once and
+    # `deadline` bounds each feed rather than the queue behind it.
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(feed_urls)), thread_name_prefix="feed")
+    futures = {url: pool.submit(timed_fetch, url) for url in feed_urls}
+    wait(futures.values(), timeout=deadline)
+    now = time.perf_counter()
+
+    # Keep results in feed order so downstream dedup is deterministic
+    for url, future in futures.items():
+        elapsed = round(ended.get(url, now) - started.get(url, now), 3)
+        if not future.done():
+            future.cancel()
+            logging.error(f"Feed timed out after {deadline}s: {url}")
+            stats[url] = {"status": "timeout", "articles": 0, "seconds": elapsed, "error": None}
+            continue
+        try:
+            feed_articles, status, commit = future.result()
+        except Exception as e:
+            logging.error(f"Failed to fetch feed: {url} | {e}")
+            stats[url] = {"status": "error", "articles": 0, "seconds": elapsed, "error": str(e)}
+            continue
+        if pending_commits is not None:
+            pending_commits.append(commit)
+        else:
+            commit()
+        articles.extend(feed_articles)
+        stats[url] = {"status": status, "articles": len(feed_articles), "seconds": elapsed, "error": None}
 
-    for url in feed_urls:
-        feed = feedparser.parse(url)
-        for entry in feed.entries:
-            article = {
-                "title": entry.get("title", "").strip(),
-                "link": entry.get("link", ""),
-                "summary": clean_article_text(entry.get("summary", "") or entry.get("content", [{}])[0].get("value", "")),
-                "published": entry.get("published", ""),
-                "source": feed.feed.get("title", "Unknown")
-            }
-            articles.append(article)
+    # Don't block on hung feeds; their threads finish (or hit FEED_TIMEOUT) in the background
+    pool.shutdown(wait=False, cancel_futures=True)
+    return articles, stats
 
+def fetch_articles(feed_urls: List[str], skip_seen: bool = True) -> List[Dict]:
+    """
+    Fetch and clean articles from a list of RSS feeds.
+    With `skip_seen`, entries whose GUID or link is already in the seen index are dropped before cleaning.
+    """
+    articles, _ = fetch_feeds(feed_urls, skip_seen)
     return articles
 
-def filter_duplicates(articles: List[Dict]) -> List[Dict]:
-    """Remove duplicate articles based on semantic similarity."""
+def filter_duplicates(
+    articles: List[Dict],
+    threshold: float = 0.9,
+    remember: bool = True,
+    pending_commits: Optional[List[Callable[[], None]]] = None,
+) -> List[Dict]:
+    """
+    Remove duplicate articles in two stages, each checking both within the
+    batch and against articles kept on earlier runs:
+      1. lexical: MinHash LSH over word shingles (utils/lexical_dedup.py)
+         drops near-verbatim copies such as syndicated stories;
+      2. semantic: embedding similarity (utils/dedup_index.py) on the rest.
+    With `remember`, the survivors are added to both histories: at once, or
+    with `pending_commits`, by a callback appended there for after they are saved.
+    """
+    if not articles:
+        return []
     contents = [article["summary"] for article in articles]
-    duplicates = detect_similar_articles(contents)
+    keys = [article.get("link") or article.get("guid") for article in articles]
 
-    unique_indices = set(range(len(articles)))
-    for i, j, _ in duplicates:
+    lexical_index = get_lexical_index()
+    signatures, near_duplicates = find_near_duplicates(contents, index=lexical_index)
+    dropped = {i for i, _, _ in near_duplicates}
+    remaining = [i for i in range(len(articles)) if i not in dropped]
+    logging.debug(f"Lexical dedup dropped {len(dropped)} of {len(articles)} articles")
+    if not remaining:
+        return []
+
+    # Semantic stage only embeds what the lexical stage let through
+    embeddings = compute_embeddings([contents[i] for i in remaining])
+    unique = set(range(len(remaining)))
+    for i, j, _ in detect_similar_articles([contents[i] for i in remaining], threshold, embeddings):
         # Keep the first, discard the second
-        if j in unique_indices:
-            unique_indices.remove(j)
+        unique.discard(j)
+
+    for i, key, sim in find_historical_duplicates(embeddings, threshold):
+        if i in unique:
+            logging.debug(f"Dropping {keys[remaining[i]]}: {sim} similar to earlier {key}")
+            unique.remove(i)
+
+    kept = sorted(unique)
+    if remember:
+        keyed = [i for i in kept if keys[remaining[i]]]
+
+        def add_to_histories() -> None:
+            dedup_index = get_duplicate_index()
+            if dedup_index is not None:
+                dedup_index.add([keys[remaining[i]] for i in keyed], embeddings[keyed])
+            if lexical_index is not None:
+                lexical_index.add([keys[remaining[i]] for i in keyed], [signatures[remaining[i]] for i in keyed])
+
+        if pending_commits is not None:
+            pending_commits.append(add_to_histories)
+        else:
+            add_to_histories()
 
-    return [articles[i] for i in sorted(unique_indices)]
+    return [articles[remaining[i]] for i in kept]
 
-def run_scheduler(interval_minutes: int = 30):
-    """Continuously fetch and update articles at regular intervals."""
+def ingest(raw_articles: List[Dict], pending_commits: List[Callable[[], None]]) -> None:
+    """Deduplicate, store and index one tick's articles. Errors propagate, so the tick can be retried."""
+    unique_articles = filter_duplicates(raw_articles, pending_commits=pending_commits)
+    save_articles(unique_articles, raise_errors=True)
+    # Keep the fast keyword tier's document frequencies current
+    keyword_index = get_keyword_index()
+    keyword_index.add_documents(
+        [article["summary"] for article in unique_articles],
+        keys=[article["link"] for article in unique_articles],
+    )
+    keyword_index.flush()
+    # Mark everything fetched (duplicates included) so the next tick only sees new entries
+    get_seen_index().mark(
+        [key for article in raw_articles for key in (article["guid"], article["link"])],
+        source="rss",
+    )
+    logging.info(f" {len(unique_articles)} new unique articles saved.")
+
+def run_scheduler(
+    interval_minutes: int = 30,
+    min_interval_minutes: int = 5,
+    max_interval_minutes: int = 240,
+):
+    """
+    Continuously fetch and update articles, polling each feed on its own
+    adaptive interval (see utils/feed_scheduler.py). `interval_minutes` is
+    the starting interval before any publication rate has been observed.
+    """
     logging.info(" Starting TechScope Scheduler...")
+    poller = AdaptivePollScheduler(
+        TECH_FEEDS,
+        initial_interval=interval_minutes * 60,
+        min_interval=min_interval_minutes * 60,
+        max_interval=max_interval_minutes * 60,
+    )
     while True:
-        logging.info(" Fetching latest tech articles...")
-        raw_articles = fetch_articles(TECH_FEEDS)
-        unique_articles = filter_duplicates(raw_articles)
-        save_articles(unique_articles)
-
-        logging.info(f" {len(unique_articles)} new unique articles saved.")
-        logging.info(f" Sleeping for {interval_minutes} minutes...\n")
-        time.sleep(interval_minutes * 60)
+        due_feeds = poller.pop_due()
+        if not due_feeds:
+            time.sleep(poller.seconds_until_next())
+            continue
+
+        logging.info(f" Fetching {len(due_feeds)} due feed(s)...")
+        pending_commits = []
+        raw_articles, feed_stats = fetch_feeds(due_feeds, pending_commits=pending_commits)
+        for url, stat in feed_stats.items():
+            logging.info(f"   {stat['status']:<9} {stat['articles']:>3} new  {stat['seconds']:>6.2f}s  {url}")
+            poller.record(url, stat["status"], stat["articles"])
+
+        try:
+            if raw_articles:
+                ingest(raw_articles, pending_commits)
+            # Only now may the next poll get a 304 for these feeds or treat their
+            # articles as known; a tick that fails before here fetches them again
+            for commit in pending_commits:
+                commit()
+        except Exception as e:
+            logging.error(f" Tick failed, its feeds will be fetched in full next time: {e}")
+
+        for row in poller.status():
+            logging.info(f"   next {row['next_due']}  every {row['interval_seconds'] // 60:>3} min  {row['url']}")
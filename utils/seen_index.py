@@ -0,0 +1,142 @@
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# === CONFIGURATION ===
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEEN_INDEX_PATH = os.getenv("SEEN_INDEX_PATH", os.path.join(PROJECT_ROOT, "data", "seen_urls.db"))
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 0.001
+
+
+def normalize_key(key: str) -> str:
+    """Canonical form of a URL/GUID: lowercase host, no fragment, no utm_* tracking params."""
+    key = key.strip()
+    parts = urlsplit(key)
+    if not parts.scheme or not parts.netloc:
+        return key  # opaque GUID
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not k.startswith("utm_")])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenIndex:
+    """
+    Persistent set of already-ingested article URLs / feed GUIDs.
+
+    SQLite is the source of truth; a Bloom filter loaded at start-up answers
+    the common "never seen" case without touching the database.
+    """
+
+    def __init__(self, path: str = SEEN_INDEX_PATH, capacity: int = BLOOM_CAPACITY):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                key TEXT PRIMARY KEY,
+                source TEXT,
+                first_seen REAL
+            )
+        """)
+        self._conn.commit()
+
+        count = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self._bloom = BloomFilter(max(capacity, count * 2))
+        for (key,) in self._conn.execute("SELECT key FROM seen"):
+            self._bloom.add(key)
+
+    def _grow_if_full(self) -> None:
+        if self._bloom.count < self._bloom.capacity:
+            return
+        bloom = BloomFilter(max(self._bloom.capacity, self._bloom.count) * 2, self._bloom.error_rate)
+        for (key,) in self._conn.execute("SELECT key FROM seen"):
+            bloom.add(key)
+        self._bloom = bloom
+
+    def seen(self, key: str) -> bool:
+        key = normalize_key(key)
+        with self._lock:
+            if key not in self._bloom:
+                return False
+            # Bloom hit may be a false positive: confirm against SQLite
+            row = self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone()
+            return row is not None
+
+    def seen_any(self, keys: Iterable[Optional[str]]) -> bool:
+        return any(self.seen(key) for key in keys if key)
+
+    def filter_new(self, keys: Iterable[str]) -> List[str]:
+        """Keep only keys not in the index, preserving order."""
+        return [key for key in keys if not self.seen(key)]
+
+    def mark(self, keys: Iterable[Optional[str]], source: Optional[str] = None) -> None:
+        rows = [(normalize_key(key), source, time.time()) for key in keys if key]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO seen (key, source, first_seen) VALUES (?, ?, ?)", rows)
+            for key, _, _ in rows:
+                if key not in self._bloom:
+                    self._bloom.add(key)
+            self._grow_if_full()
+
+    def forget(self, keys: Iterable[str]) -> None:
+        """Remove keys so they are processed again (the Bloom filter is rebuilt)."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM seen WHERE key = ?", [(normalize_key(k),) for k in keys])
+            bloom = BloomFilter(self._bloom.capacity, self._bloom.error_rate)
+            for (key,) in self._conn.execute("SELECT key FROM seen"):
+                bloom.add(key)
+            self._bloom = bloom
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+
+_index: Optional[SeenIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_seen_index() -> SeenIndex:
+    """Process-wide SeenIndex, opened on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SeenIndex()
+        return _index
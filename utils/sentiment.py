@@ -1,25 +1,11 @@
-from textblob import TextBlob
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence, Union
 
-def analyze_sentiment(text: str) -> Dict[str, Any]:
-    """
-    Analyze sentiment of the given text using TextBlob.
-    
-    Returns:
-        {
-            'sentiment_score': float (0–10 scale),
-            'sentiment_label': str (Negative, Neutral, Positive)
-        }
-    """
-    if not text or len(text.strip()) < 50:
-        return {
-            "sentiment_score": 0.0,
-            "sentiment_label": "Not enough text"
-        }
+from utils.document import AnalyzedDocument, as_document
+from utils.lexicon_sentiment import polarity_batch
 
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity  # Range: -1.0 to 1.0
+MIN_LENGTH = 50  # characters, after stripping
 
+def _result(polarity: float) -> Dict[str, Any]:
     # Normalize polarity (-1 to 1) → (0 to 10)
     sentiment_score = round((polarity + 1) * 5, 2)
 
@@ -35,3 +21,38 @@ def analyze_sentiment(text: str) -> Dict[str, Any]:
         "sentiment_score": sentiment_score,
         "sentiment_label": label
     }
+
+def analyze_sentiment(text: Union[str, AnalyzedDocument]) -> Dict[str, Any]:
+    """
+    Analyze sentiment of the given text (TextBlob's lexicon, see utils/lexicon_sentiment.py).
+
+    Returns:
+        {
+            'sentiment_score': float (0–10 scale),
+            'sentiment_label': str (Negative, Neutral, Positive)
+        }
+    """
+    doc = as_document(text)
+    if len(doc.text.strip()) < MIN_LENGTH:
+        return {
+            "sentiment_score": 0.0,
+            "sentiment_label": "Not enough text"
+        }
+
+    return _result(doc.polarity)  # Range: -1.0 to 1.0, memoized on the document
+
+def analyze_sentiment_batch(texts: Sequence[Union[str, AnalyzedDocument]]) -> List[Dict[str, Any]]:
+    """
+    analyze_sentiment for many texts: polarities of all texts long enough are
+    computed in one batch, and stored on the documents for later scorers.
+    """
+    docs = [as_document(text) for text in texts]
+    results = [{"sentiment_score": 0.0, "sentiment_label": "Not enough text"} for _ in docs]
+    pending = [i for i, doc in enumerate(docs) if len(doc.text.strip()) >= MIN_LENGTH]
+    missing = [i for i in pending if "polarity" not in vars(docs[i])]
+    if missing:
+        for i, value in zip(missing, polarity_batch([docs[i].text for i in missing]).tolist()):
+            docs[i].polarity = value
+    for i in pending:
+        results[i] = _result(docs[i].polarity)
+    return results
@@ -1,66 +1,258 @@
 import os
+import asyncio
 import logging
-import openai
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from utils.model_registry import registry
+from utils.openai_client import OpenAIError, get_openai_client
+from utils.summarizer_engines import load_summarization_pipeline
+from utils.summary_cache import cache_key, get_summary_cache
 
 # === CONFIGURATION ===
 USE_OPENAI = os.getenv("USE_OPENAI", "true").lower() == "true"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+HF_BATCH_SIZE = int(os.getenv("HF_BATCH_SIZE", "8"))
+MIN_TEXT_LENGTH = 100
+TOO_SHORT_MESSAGE = "Article too short to summarize."
+OPENAI_MODEL = "gpt-3.5-turbo"
+OPENAI_MAX_TOKENS = 300
+HF_MODEL = "facebook/bart-large-cnn"
+HF_GENERATION = {"max_length": 130, "min_length": 30, "do_sample": False}
+SUMMARIZER_ENGINE = os.getenv("SUMMARIZER_ENGINE", "torch")  # torch | torch-int8 | onnx
+SUMMARIZER_THREADS = int(os.getenv("SUMMARIZER_THREADS", "0")) or None  # 0 = library default
+OPENAI_MAX_WORDS = 3000
 
 # === SETUP LOGGER ===
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("summarizer")
 
+class SummarizationError(RuntimeError):
+    """The local model could not summarize a text; `backend` names the model that failed."""
+
+    def __init__(self, message: str, backend: str = "hf"):
+        super().__init__(message)
+        self.backend = backend
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"error": str(self), "backend": self.backend}
+
 # === SETUP MODELS ===
-if USE_OPENAI and OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
-else:
+# The HF pipeline is loaded on first use (or by an explicit warmup), not at import
+def load_hf_summarizer():
+    return load_summarization_pipeline(HF_MODEL, SUMMARIZER_ENGINE, SUMMARIZER_THREADS)
+
+registry.register("summarizer", load_hf_summarizer)
+
+if not (USE_OPENAI and OPENAI_API_KEY):
     logger.info("Using HuggingFace transformers for summarization...")
-    tokenizer = AutoTokenizer.from_pretrained("facebook/bart-large-cnn")
-    model = AutoModelForSeq2SeqLM.from_pretrained("facebook/bart-large-cnn")
-    summarizer = pipeline("summarization", model=model, tokenizer=tokenizer)
 
-def summarize_with_openai(text: str, max_tokens: int = 300) -> str:
-    """Summarize using OpenAI API"""
-    try:
-        if len(text.split()) > 3000:
-            text = " ".join(text.split()[:3000])  # Truncate if too long
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a concise news summarizer."},
-                {"role": "user", "content": f"Summarize the following news article:\n\n{text}"}
-            ],
-            max_tokens=max_tokens,
-            temperature=0.5
-        )
-        summary = response["choices"][0]["message"]["content"].strip()
-        return summary
-    except Exception as e:
-        logger.warning(f"OpenAI summarization failed: {e}")
-        return "OpenAI summarization failed."
+def uses_local_model() -> bool:
+    """True when summaries come from the local HF model (no OpenAI key, or USE_OPENAI=false)"""
+    return not (USE_OPENAI and OPENAI_API_KEY)
+
+def _openai_messages(text: str) -> List[Dict[str, str]]:
+    words = text.split()
+    if len(words) > OPENAI_MAX_WORDS:
+        text = " ".join(words[:OPENAI_MAX_WORDS])  # Truncate if too long
+    return [
+        {"role": "system", "content": "You are a concise news summarizer."},
+        {"role": "user", "content": f"Summarize the following news article:\n\n{text}"}
+    ]
+
+def submit_openai_summary(text: str, max_tokens: int = OPENAI_MAX_TOKENS) -> Future:
+    """Start an OpenAI summary on the shared client (see utils/openai_client.py) without waiting"""
+    return get_openai_client().submit(
+        _openai_messages(text), model=OPENAI_MODEL, max_tokens=max_tokens, temperature=0.5
+    )
+
+def summarize_with_openai(text: str, max_tokens: int = OPENAI_MAX_TOKENS) -> str:
+    """Summarize using OpenAI API; raises OpenAIError when no summary could be produced"""
+    return submit_openai_summary(text, max_tokens).result()
+
+async def asummarize_with_openai(text: str, max_tokens: int = OPENAI_MAX_TOKENS) -> str:
+    """summarize_with_openai for async callers: waits without holding a thread"""
+    return await asyncio.wrap_future(submit_openai_summary(text, max_tokens))
+
+def truncate_for_bart(text: str) -> str:
+    words = text.split()
+    if len(words) > 1024:
+        return " ".join(words[:1024])  # BART input limit
+    return text
 
 def summarize_with_hf(text: str) -> str:
-    """Summarize using Hugging Face model"""
+    """Summarize using Hugging Face model; raises SummarizationError on failure"""
     try:
-        if len(text.split()) > 1024:
-            text = " ".join(text.split()[:1024])  # BART input limit
-        summary = summarizer(text, max_length=130, min_length=30, do_sample=False)
+        text = truncate_for_bart(text)
+        summary = registry.get("summarizer")(text, **HF_GENERATION)
         return summary[0]["summary_text"]
     except Exception as e:
         logger.warning(f"HuggingFace summarization failed: {e}")
-        return "HuggingFace summarization failed."
+        raise SummarizationError(f"HuggingFace summarization failed: {e}") from e
 
-def summarize_article(text: str) -> str:
-    """Main summarization entry point with fallback"""
-    if not text or len(text.strip()) < 100:
-        return "Article too short to summarize."
+def summarize_with_hf_batch(texts: List[str], batch_size: int = HF_BATCH_SIZE) -> List[Union[str, SummarizationError]]:
+    """
+    Summarize many texts with the Hugging Face model in padded batches.
+
+    Texts are sorted by length so each batch pads to a similar size (longest
+    first, so memory peaks early). Results are returned in input order; if a
+    batch fails, its texts are retried one at a time, and a text that still
+    fails gets its SummarizationError in place of a summary.
+    """
+    batch_size = max(1, batch_size)
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    prepared = {i: truncate_for_bart(texts[i]) for i in order}
+    results = [""] * len(texts)
+
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        try:
+            outputs = registry.get("summarizer")(
+                [prepared[i] for i in chunk],
+                **HF_GENERATION,
+                truncation=True,
+                batch_size=len(chunk),
+            )
+            for i, output in zip(chunk, outputs):
+                results[i] = output["summary_text"]
+        except Exception as e:
+            logger.warning(f"HuggingFace batch summarization failed, retrying one by one: {e}")
+            for i in chunk:
+                try:
+                    results[i] = summarize_with_hf(prepared[i])
+                except SummarizationError as error:
+                    results[i] = error
+
+    return results
+
+# === CACHING (see utils/summary_cache.py) ===
+def _openai_key(text: str) -> str:
+    return cache_key(text, "openai", OPENAI_MODEL, {"max_tokens": OPENAI_MAX_TOKENS})
+
+def _hf_key(text: str) -> str:
+    # Quantized / ONNX output can differ slightly, so those engines get their own entries
+    params = HF_GENERATION if SUMMARIZER_ENGINE == "torch" else {**HF_GENERATION, "engine": SUMMARIZER_ENGINE}
+    return cache_key(text, "hf", HF_MODEL, params)
+
+def cached_summary(text: str, key: str, backend: str, model: str, compute: Callable[[], str]) -> str:
+    """
+    Return the cached summary for `key`, or compute and store it. Failures
+    (exceptions from `compute`) propagate and are not cached.
+    """
+    cache = get_summary_cache()
+    if cache is None:
+        return compute()
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute()
+        cache.put(key, summary, text, backend, model)
+    return summary
+
+def summary_cache_stats() -> Dict[str, Any]:
+    cache = get_summary_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+def invalidate_summaries(text: str = None, backend: str = None) -> int:
+    """Drop cached summaries (all, or for one text and/or backend). Returns rows removed."""
+    cache = get_summary_cache()
+    return cache.invalidate(text, backend) if cache is not None else 0
+
+def summarize_articles(texts: List[str], batch_size: int = HF_BATCH_SIZE) -> List[Union[str, SummarizationError]]:
+    """
+    Summarize a list of articles. With the local model the texts are run in
+    batches (see summarize_with_hf_batch); with OpenAI each text is a separate
+    request, as in summarize_article. A text that could not be summarized
+    gets its SummarizationError in place of a summary.
+    """
+    results = [TOO_SHORT_MESSAGE] * len(texts)
+    pending = [i for i, text in enumerate(texts) if text and len(text.strip()) >= MIN_TEXT_LENGTH]
+    if not pending:
+        return results
 
     if USE_OPENAI and OPENAI_API_KEY:
-        summary = summarize_with_openai(text)
-        if "failed" in summary.lower():
-            summary = summarize_with_hf(text)
+        # All requests go out at once; the client caps how many are in flight
+        cache = get_summary_cache()
+        requests = {}
+        for i in pending:
+            cached = cache.get(_openai_key(texts[i])) if cache is not None else None
+            if cached is None:
+                requests[i] = submit_openai_summary(texts[i])
+            else:
+                results[i] = cached
+        for i, request in requests.items():
+            try:
+                results[i] = request.result()
+            except OpenAIError as e:
+                logger.warning(f"OpenAI summarization failed, using HuggingFace: {e}")
+                try:
+                    results[i] = summarize_with_hf_cached(texts[i])
+                except SummarizationError as error:
+                    results[i] = error
+                continue
+            if cache is not None:
+                cache.put(_openai_key(texts[i]), results[i], texts[i], "openai", OPENAI_MODEL)
     else:
-        summary = summarize_with_hf(text)
+        # Only texts missing from the cache go through the model
+        cache = get_summary_cache()
+        misses = []
+        for i in pending:
+            cached = cache.get(_hf_key(texts[i])) if cache is not None else None
+            if cached is None:
+                misses.append(i)
+            else:
+                results[i] = cached
 
-    return summary
+        for i, summary in zip(misses, summarize_with_hf_batch([texts[i] for i in misses], batch_size)):
+            results[i] = summary
+            if cache is not None and not isinstance(summary, SummarizationError):
+                cache.put(_hf_key(texts[i]), summary, texts[i], "hf", HF_MODEL)
+
+    return results
+
+def summarize_with_hf_cached(text: str) -> str:
+    """summarize_with_hf through the summary cache"""
+    return cached_summary(text, _hf_key(text), "hf", HF_MODEL, lambda: summarize_with_hf(text))
+
+def cached_openai_summary(text: str) -> Optional[str]:
+    cache = get_summary_cache()
+    return cache.get(_openai_key(text)) if cache is not None else None
+
+def store_openai_summary(text: str, summary: str) -> None:
+    cache = get_summary_cache()
+    if cache is not None:
+        cache.put(_openai_key(text), summary, text, "openai", OPENAI_MODEL)
+
+def summarize_article(text: str) -> str:
+    """Main summarization entry point with fallback; raises SummarizationError if the local model fails too"""
+    if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+        return TOO_SHORT_MESSAGE
+
+    if USE_OPENAI and OPENAI_API_KEY:
+        try:
+            return cached_summary(text, _openai_key(text), "openai", OPENAI_MODEL, lambda: summarize_with_openai(text))
+        except OpenAIError as e:
+            logger.warning(f"OpenAI summarization failed, using HuggingFace: {e}")
+
+    return summarize_with_hf_cached(text)
+
+async def asummarize_article(text: str) -> str:
+    """
+    summarize_article for async callers: the OpenAI request is awaited on the
+    shared client, and only the local model (fallback or default) runs in a thread.
+    """
+    if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+        return TOO_SHORT_MESSAGE
+
+    if USE_OPENAI and OPENAI_API_KEY:
+        cached = cached_openai_summary(text)
+        if cached is not None:
+            return cached
+        try:
+            summary = await asummarize_with_openai(text)
+        except OpenAIError as e:
+            logger.warning(f"OpenAI summarization failed, using HuggingFace: {e}")
+        else:
+            store_openai_summary(text, summary)
+            return summary
+
+    return await asyncio.to_thread(summarize_with_hf_cached, text)
@@ -0,0 +1,70 @@
+import os
+import logging
+from typing import Optional
+
+# === CONFIGURATION ===
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINES = ("torch", "torch-int8", "onnx")
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", os.path.join(PROJECT_ROOT, "data", "onnx"))
+
+logger = logging.getLogger("summarizer_engines")
+
+
+def load_summarization_pipeline(model_name: str, engine: str = "torch", threads: Optional[int] = None):
+    """
+    Build a transformers summarization pipeline for `model_name` on CPU.
+
+    Engines:
+        torch       - the model as published (fp32)
+        torch-int8  - torch dynamic quantization: nn.Linear weights stored as
+                      int8, activations quantized on the fly
+        onnx        - exported once to ONNX_CACHE_DIR and run with ONNX Runtime
+                      (needs `pip install optimum[onnxruntime]`)
+
+    `threads` caps intra-op threads for torch / ONNX Runtime (None = library default).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown summarizer engine '{engine}', expected one of {', '.join(ENGINES)}")
+
+    from transformers import pipeline, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if engine == "onnx":
+        model = _load_onnx(model_name, threads)
+    else:
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        if threads:
+            torch.set_num_threads(threads)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        model.eval()
+        if engine == "torch-int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    logger.info(f"Summarization pipeline ready: {model_name} on {engine}" + (f" ({threads} threads)" if threads else ""))
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def _load_onnx(model_name: str, threads: Optional[int]):
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError:
+        raise ImportError("Please install required packages: `pip install optimum[onnxruntime]`")
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+
+    # Export once; later processes load the saved graphs
+    export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        return ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=options)
+
+    logger.info(f"Exporting {model_name} to ONNX in {export_dir} (one-off)...")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, session_options=options)
+    model.save_pretrained(export_dir)
+    return model
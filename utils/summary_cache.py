@@ -0,0 +1,220 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# === CONFIGURATION ===
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", os.path.join(PROJECT_ROOT, "data", "summary_cache.db"))
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))  # in-memory entries
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+# How often a process checks whether another one has invalidated the cache
+SUMMARY_CACHE_SYNC_SECONDS = float(os.getenv("SUMMARY_CACHE_SYNC_SECONDS", "5"))
+
+logger = logging.getLogger("summary_cache")
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def cache_key(text: str, backend: str, model: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Key = hash of the normalized text + backend + model + generation params."""
+    config = json.dumps({"backend": backend, "model": model, "params": params or {}}, sort_keys=True)
+    return f"{text_hash(text)}:{hashlib.sha256(config.encode('utf-8')).hexdigest()[:16]}"
+
+
+class SummaryCache:
+    """
+    Two-tier summary cache.
+
+    Tier 1 is a bounded in-process LRU; tier 2 is a SQLite file (WAL mode)
+    shared by every worker process. A tier-2 hit is promoted into tier 1.
+
+    invalidate() bumps a generation counter stored next to tier 2. Lookups
+    compare it, at most every `sync_seconds`, with the generation this
+    process last saw and empty tier 1 when another process has invalidated
+    since, so no worker serves dropped summaries from memory for longer
+    than that. Tier-1 hits in between never touch SQLite.
+    """
+
+    def __init__(self, path: str = SUMMARY_CACHE_PATH, max_entries: int = SUMMARY_CACHE_SIZE,
+                 sync_seconds: float = SUMMARY_CACHE_SYNC_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.sync_seconds = sync_seconds
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._checked = time.monotonic()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS summary_cache (
+                    key TEXT PRIMARY KEY,
+                    text_hash TEXT,
+                    backend TEXT,
+                    model TEXT,
+                    summary TEXT,
+                    created_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_summary_cache_text ON summary_cache (text_hash)")
+            conn.execute("CREATE TABLE IF NOT EXISTS summary_cache_meta (name TEXT PRIMARY KEY, value INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO summary_cache_meta (name, value) VALUES ('generation', 0)")
+        self._generation = self._read_generation() or 0
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers in other processes run during writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _read_generation(self) -> Optional[int]:
+        try:
+            row = self._conn().execute("SELECT value FROM summary_cache_meta WHERE name = 'generation'").fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache generation read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def _sync_generation(self) -> None:
+        """Empty tier 1 if any process invalidated the cache since this one last looked."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked < self.sync_seconds:
+                return
+            self._checked = now
+        generation = self._read_generation()
+        if generation is None:
+            return
+        with self._lock:
+            if generation != self._generation:
+                self._memory.clear()
+                self._generation = generation
+
+    def _remember(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._memory[key] = summary
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        self._sync_generation()
+        with self._lock:
+            summary = self._memory.get(key)
+            if summary is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return summary
+
+        try:
+            row = self._conn().execute("SELECT summary FROM summary_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache read failed: {e}")
+            row = None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(key, row[0])
+        return row[0]
+
+    def put(self, key: str, summary: str, text: str = "", backend: str = "", model: str = "") -> None:
+        self._remember(key, summary)
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO summary_cache (key, text_hash, backend, model, summary, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, text_hash(text) if text else key.split(":")[0], backend, model, summary, time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache write failed: {e}")
+        with self._lock:
+            self.stores += 1
+
+    def invalidate(self, text: Optional[str] = None, backend: Optional[str] = None) -> int:
+        """
+        Drop cached summaries for one text and/or one backend; with no
+        arguments, drop everything. Returns the number of persistent rows removed.
+        Other processes empty their whole tier 1 within `sync_seconds`.
+        """
+        clauses, args = [], []
+        if text is not None:
+            clauses.append("text_hash = ?")
+            args.append(text_hash(text))
+        if backend is not None:
+            clauses.append("backend = ?")
+            args.append(backend)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._conn() as conn:
+            removed = conn.execute(f"DELETE FROM summary_cache{where}", args).rowcount
+            conn.execute("UPDATE summary_cache_meta SET value = value + 1 WHERE name = 'generation'")
+            generation = conn.execute("SELECT value FROM summary_cache_meta WHERE name = 'generation'").fetchone()[0]
+
+        with self._lock:
+            # A skipped generation means another process invalidated too; drop everything then
+            missed = generation != self._generation + 1
+            self._generation = generation
+            if text is None or missed:
+                self._memory.clear()
+            else:
+                prefix = text_hash(text) + ":"
+                for key in [k for k in self._memory if k.startswith(prefix)]:
+                    del self._memory[key]
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache: Optional[SummaryCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Process-wide cache, or None when SUMMARY_CACHE_ENABLED is false."""
+    global _cache
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SummaryCache()
+        return _cache
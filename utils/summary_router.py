@@ -0,0 +1,199 @@
+"""
+Deadline-aware routing of one summary request between OpenAI and the local model.
+
+Every request gets a latency budget (SUMMARY_DEADLINE_MS unless the caller
+passes one). A circuit breaker per backend (utils/circuit_breaker.py) skips
+a backend that keeps failing. When the OpenAI call has not answered within
+SUMMARY_HEDGE_MS, the local model is started alongside it and whichever
+returns a summary first wins. If neither does before the deadline,
+DeadlineExceeded is raised instead of waiting on a degraded upstream.
+
+Hedged runs can't be cancelled once the model is generating, so at most
+SUMMARY_MAX_HEDGES run at a time on their own threads; past that, requests
+wait on OpenAI alone. An OpenAI call that loses to a hedge counts as a
+failure for its breaker, so a consistently slow upstream gets skipped.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.summarizer import (
+    MIN_TEXT_LENGTH,
+    TOO_SHORT_MESSAGE,
+    asummarize_with_openai,
+    cached_openai_summary,
+    store_openai_summary,
+    summarize_with_hf_cached,
+    uses_local_model,
+)
+
+# === CONFIGURATION ===
+SUMMARY_DEADLINE_MS = float(os.getenv("SUMMARY_DEADLINE_MS", "15000"))
+SUMMARY_HEDGE_MS = float(os.getenv("SUMMARY_HEDGE_MS", "3000"))  # 0 = never start the local model early
+BREAKER_FAILURES = int(os.getenv("SUMMARY_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("SUMMARY_BREAKER_RESET_SECONDS", "30"))
+SUMMARY_MAX_HEDGES = int(os.getenv("SUMMARY_MAX_HEDGES", "2"))  # 0 = never hedge
+
+logger = logging.getLogger("summary_router")
+
+breakers = {
+    "openai": CircuitBreaker("openai", BREAKER_FAILURES, BREAKER_RESET_SECONDS),
+    "hf": CircuitBreaker("hf", BREAKER_FAILURES, BREAKER_RESET_SECONDS),
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """No backend produced a summary within the request's deadline."""
+
+
+class SummaryUnavailable(RuntimeError):
+    """Every backend failed or was skipped by its circuit breaker."""
+
+
+# Hedges get their own threads, so abandoned runs never tie up the default executor
+_hedge_slots = threading.BoundedSemaphore(max(1, SUMMARY_MAX_HEDGES))
+_hedge_executor = ThreadPoolExecutor(max_workers=max(1, SUMMARY_MAX_HEDGES), thread_name_prefix="summary-hedge")
+
+
+def breaker_status() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.status() for name, breaker in breakers.items()}
+
+
+async def _openai(text: str) -> str:
+    summary = await asummarize_with_openai(text)
+    store_openai_summary(text, summary)
+    return summary
+
+
+async def _local(text: str, local: Callable[[str], str]) -> str:
+    # `local` raises SummarizationError when the model fails
+    return await asyncio.to_thread(local, text)
+
+
+def _acquire_hedge_slot() -> bool:
+    return SUMMARY_MAX_HEDGES > 0 and _hedge_slots.acquire(blocking=False)
+
+
+def _start_hedge(text: str, local: Callable[[str], str]) -> asyncio.Future:
+    """
+    Run `local` on a hedge thread, holding a slot taken with _acquire_hedge_slot().
+    The slot is freed and the run's outcome reported to the hf breaker when it
+    ends, whether or not the request still waits for it.
+    """
+    def finished(future) -> None:
+        _hedge_slots.release()
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            breakers["hf"].record_failure()
+        else:
+            breakers["hf"].record_success()
+
+    future = _hedge_executor.submit(local, text)
+    future.add_done_callback(finished)
+    return asyncio.wrap_future(future)
+
+
+async def route_summary(
+    text: str,
+    deadline_ms: Optional[float] = None,
+    hedge_ms: float = SUMMARY_HEDGE_MS,
+    local: Callable[[str], str] = summarize_with_hf_cached,
+) -> Dict[str, Any]:
+    """
+    Summarize `text` within `deadline_ms`. `local` runs the local model in a
+    thread (e.g. through a micro-batcher). Returns {"summary", "backend",
+    "hedged", "elapsed_ms"}; backend is "openai", "hf", "cache" or "none"
+    (text too short). Raises DeadlineExceeded or SummaryUnavailable.
+    """
+    started = time.monotonic()
+    deadline = started + (deadline_ms if deadline_ms is not None else SUMMARY_DEADLINE_MS) / 1000
+
+    def result(summary: str, backend: str, hedged: bool = False) -> Dict[str, Any]:
+        return {"summary": summary, "backend": backend, "hedged": hedged,
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 1)}
+
+    if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+        return result(TOO_SHORT_MESSAGE, "none")
+
+    running: Dict[asyncio.Future, str] = {}
+    if not uses_local_model():
+        cached = cached_openai_summary(text)
+        if cached is not None:
+            return result(cached, "cache")
+        if breakers["openai"].allow():
+            running[asyncio.ensure_future(_openai(text))] = "openai"
+
+    hedged = False
+    try:
+        if running:
+            # Give the remote call until the hedge threshold before involving the local model
+            wait = deadline - time.monotonic()
+            if hedge_ms > 0:
+                wait = min(wait, hedge_ms / 1000)
+            done, _ = await asyncio.wait(running, timeout=max(0.0, wait))
+            for task in done:
+                summary = _outcome(task, running.pop(task))
+                if summary is not None:
+                    return result(summary, "openai")
+
+        # Remote call failed, skipped or past the hedge threshold: run the local model too
+        if time.monotonic() < deadline:
+            if running:
+                # Slot before breaker, so a skipped hedge never uses up a half-open trial
+                if not _acquire_hedge_slot():
+                    logger.info("No free hedge slot; waiting on OpenAI alone")
+                elif not breakers["hf"].allow():
+                    _hedge_slots.release()
+                else:
+                    hedged = True
+                    running[_start_hedge(text, local)] = "hf"
+            elif breakers["hf"].allow():
+                running[asyncio.ensure_future(_local(text, local))] = "hf"
+            else:
+                raise SummaryUnavailable("All summarization backends are failing; try again later")
+
+        while running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                backend = running.pop(task)
+                # A hedge reports to its breaker itself, since it may outlive the request
+                summary = _outcome(task, backend, record=not (hedged and backend == "hf"))
+                if summary is not None:
+                    if "openai" in running.values():
+                        # OpenAI lost the race to the hedge: too slow counts against it
+                        breakers["openai"].record_failure()
+                    return result(summary, backend, hedged)
+        if running or time.monotonic() >= deadline:
+            # Too slow counts against the backend; an abandoned local run still fills the cache
+            if "openai" in running.values():
+                breakers["openai"].record_failure()
+            raise DeadlineExceeded(f"No summary within {round((deadline - started) * 1000)} ms")
+        raise SummaryUnavailable("All summarization backends failed")
+    finally:
+        for task in running:
+            task.cancel()
+
+
+def _outcome(task: asyncio.Future, backend: str, record: bool = True) -> Optional[str]:
+    """The task's summary (recorded as a success), or None after recording its failure."""
+    try:
+        summary = task.result()
+    except Exception as e:
+        logger.warning(f"{backend} summarization failed: {e}")
+        if record:
+            breakers[backend].record_failure()
+        return None
+    if record:
+        breakers[backend].record_success()
+    return summary
@@ -0,0 +1,251 @@
+"""
+Fast keyword tier: TF-IDF over n-gram candidates with corpus-wide document
+frequencies that are persisted and updated incrementally as articles arrive.
+
+Rebuild the statistics from stored articles:
+    python -m utils.tfidf_keywords --rebuild [--db techscope.db] [--table articles]
+"""
+import os
+import sys
+import math
+import time
+import sqlite3
+import argparse
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Union
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from utils.document import AnalyzedDocument, as_document
+from utils.seen_index import normalize_key
+
+# === CONFIGURATION ===
+KEYWORD_DF_PATH = os.getenv("KEYWORD_DF_PATH", os.path.join(PROJECT_ROOT, "data", "keyword_df.db"))
+NGRAM_RANGE = (1, 2)
+MIN_TOKEN_LENGTH = 3
+FLUSH_EVERY = 500  # documents between automatic writes to SQLite
+# How often a process checks whether another one (e.g. the scheduler) has written new frequencies
+DF_REFRESH_SECONDS = float(os.getenv("KEYWORD_DF_REFRESH_SECONDS", "30"))
+
+
+def candidate_terms(doc: AnalyzedDocument) -> Counter:
+    """
+    Term frequencies of the document's candidate n-grams: runs of 1-2 tokens
+    from the cleaned text that neither start nor end with a stop word or a number.
+    """
+    tokens = doc.normalized.split()
+    usable = [len(t) >= MIN_TOKEN_LENGTH and t not in ENGLISH_STOP_WORDS and not t.isdigit() for t in tokens]
+    terms = Counter()
+    low, high = NGRAM_RANGE
+    for n in range(low, high + 1):
+        for i in range(len(tokens) - n + 1):
+            if usable[i] and usable[i + n - 1]:
+                terms[" ".join(tokens[i:i + n])] += 1
+    return terms
+
+
+class KeywordIndex:
+    """
+    Document frequencies for TF-IDF keyword scoring.
+
+    Counts live in memory and in SQLite; add_documents() updates memory at
+    once and writes the accumulated deltas every FLUSH_EVERY documents (or on
+    flush()). Documents passed with a key (URL/GUID) are only counted once.
+
+    Several processes can share the file: every write bumps a version
+    counter in keyword_meta, and keywords() reloads the counts (keeping
+    this process's unflushed deltas) when, checked at most every
+    `refresh_seconds`, another process has written since they were read.
+    """
+
+    def __init__(self, path: str = KEYWORD_DF_PATH, refresh_seconds: float = DF_REFRESH_SECONDS):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS keyword_df (term TEXT PRIMARY KEY, df INTEGER)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS keyword_docs (key TEXT PRIMARY KEY)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS keyword_meta (name TEXT PRIMARY KEY, value INTEGER)")
+        self._pending_df: Counter = Counter()
+        self._pending_docs = 0
+        self._pending_keys: List[str] = []
+        self._known_keys: set = set()
+        self._load()
+
+    def _meta(self, name: str) -> int:
+        row = self._conn.execute("SELECT value FROM keyword_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def _load(self) -> None:
+        # Version first: a write landing during the reads leaves it behind, so the next check reloads again
+        self._version = self._meta("version")
+        self.df: Dict[str, int] = dict(self._conn.execute("SELECT term, df FROM keyword_df"))
+        for term, count in self._pending_df.items():
+            self.df[term] = self.df.get(term, 0) + count
+        self.documents = self._meta("documents") + self._pending_docs
+        self._checked = time.monotonic()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the counts if another process has written since they were read; returns whether it did."""
+        with self._lock:
+            if not force and time.monotonic() - self._checked < self.refresh_seconds:
+                return False
+            self._checked = time.monotonic()
+            if self._meta("version") == self._version:
+                return False
+            self._load()
+            return True
+
+    def idf(self, term: str) -> float:
+        # Smoothed like scikit-learn: unseen terms get the highest weight
+        return math.log((1 + self.documents) / (1 + self.df.get(term, 0))) + 1
+
+    def add_documents(self, texts: Iterable[Union[str, AnalyzedDocument]], keys: Optional[Iterable[Optional[str]]] = None) -> int:
+        """Count documents into the frequencies; returns how many were new."""
+        texts = list(texts)
+        keys = list(keys) if keys is not None else [None] * len(texts)
+        added = 0
+        with self._lock:
+            for text, key in zip(texts, keys):
+                if key:
+                    key = normalize_key(key)
+                    if key in self._known_keys or self._conn.execute(
+                        "SELECT 1 FROM keyword_docs WHERE key = ?", (key,)
+                    ).fetchone():
+                        continue
+                    self._known_keys.add(key)
+                    self._pending_keys.append(key)
+                terms = candidate_terms(as_document(text)).keys()
+                for term in terms:
+                    self.df[term] = self.df.get(term, 0) + 1
+                self._pending_df.update(terms)
+                self.documents += 1
+                self._pending_docs += 1
+                added += 1
+            if self._pending_docs >= FLUSH_EVERY:
+                self._flush()
+        return added
+
+    def _flush(self) -> None:
+        if not self._pending_docs:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO keyword_df (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+                self._pending_df.items(),
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO keyword_docs (key) VALUES (?)", [(k,) for k in self._pending_keys])
+            # Deltas, not totals, so concurrent writers don't overwrite each other's counts
+            self._conn.execute(
+                "INSERT INTO keyword_meta (name, value) VALUES ('documents', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (self._pending_docs,),
+            )
+            version = self._bump_version()
+        if version == self._version + 1:
+            self._version = version  # nobody else wrote in between, so memory is current
+        self._pending_df.clear()
+        self._pending_keys.clear()
+        self._known_keys.clear()
+        self._pending_docs = 0
+
+    def _bump_version(self) -> int:
+        self._conn.execute(
+            "INSERT INTO keyword_meta (name, value) VALUES ('version', 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+        )
+        return self._meta("version")
+
+    def flush(self) -> None:
+        """Write pending frequency updates to SQLite."""
+        with self._lock:
+            self._flush()
+
+    def reset(self) -> None:
+        with self._lock:
+            with self._conn:
+                for table in ("keyword_df", "keyword_docs"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                self._conn.execute("DELETE FROM keyword_meta WHERE name != 'version'")
+                self._version = self._bump_version()
+            self.df, self.documents = {}, 0
+            self._pending_df.clear()
+            self._pending_keys.clear()
+            self._known_keys.clear()
+            self._pending_docs = 0
+
+    def keywords(self, text: Union[str, AnalyzedDocument], top_n: int = 10) -> List[str]:
+        """Top `top_n` candidate n-grams by TF-IDF."""
+        self.refresh()
+        terms = candidate_terms(as_document(text))
+        scored = sorted(terms.items(), key=lambda item: (-item[1] * self.idf(item[0]), item[0]))
+        return [term for term, _ in scored[:top_n]]
+
+    def keywords_batch(self, texts: Iterable[Union[str, AnalyzedDocument]], top_n: int = 10) -> List[List[str]]:
+        return [self.keywords(text, top_n) for text in texts]
+
+
+_index: Optional[KeywordIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Process-wide KeywordIndex, opened on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KeywordIndex()
+        return _index
+
+
+def rebuild(db_path: str, table: str = "articles", text_column: str = "summary", key_column: Optional[str] = "url") -> int:
+    """Recount document frequencies from a stored table. Returns documents counted."""
+    from utils.rescore_credibility import iter_chunks
+
+    index = get_keyword_index()
+    index.reset()
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+        use_keys = key_column in columns
+        for rows in iter_chunks(conn, table, text_column):
+            keys = None
+            if use_keys:
+                rowids = [rowid for rowid, _ in rows]
+                placeholders = ",".join("?" * len(rowids))
+                key_by_row = dict(conn.execute(
+                    f'SELECT rowid, "{key_column}" FROM "{table}" WHERE rowid IN ({placeholders})', rowids
+                ).fetchall())
+                keys = [key_by_row.get(rowid) for rowid in rowids]
+            index.add_documents([text or "" for _, text in rows], keys)
+    finally:
+        conn.close()
+    index.flush()
+    return index.documents
+
+
+if __name__ == "__main__":
+    from utils.save_data import DB_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recount frequencies from the stored articles")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--table", default="articles")
+    parser.add_argument("--text-column", default="summary")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        started = time.perf_counter()
+        count = rebuild(args.db, args.table, args.text_column)
+        print(f"Counted {count} documents, {len(get_keyword_index().df)} terms in {time.perf_counter() - started:.1f}s")
+    else:
+        index = get_keyword_index()
+        print(f"{index.documents} documents, {len(index.df)} terms in {index.path}")